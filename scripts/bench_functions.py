@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Measure cold and warm invocation latency of the serverless handlers
+- Each cold run is a fresh interpreter: module import, then the first invocation
+- Warm invocations repeat the same event in that interpreter
+- Without YDB_ENDPOINT the portal reads an in-memory database seeded with --seed episodes
+- The timer handler runs a real pipeline: point it at API keys or the LLM stand-in server
+
+Usage:
+  python scripts/bench_functions.py portal --cold 10 --warm 200
+  python scripts/bench_functions.py portal --event '{"httpMethod": "GET", "path": "/api/episodes/ep-2026-01-14/audio"}'
+  python scripts/bench_functions.py timer --event '{"target_date": "2026-01-14"}' --cold 1 --warm 0
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import statistics
+import subprocess
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FUNCTIONS = {"portal": "src.functions.portal", "timer": "src.functions.timer"}
+DEFAULT_EVENTS = {
+    "portal": {"httpMethod": "GET", "path": "/api/episodes", "headers": {"Save-Data": "on"}},
+    "timer": {},
+}
+
+
+def seed_episodes(count: int) -> None:
+    from src.db.episodes import get_episode_repository
+    from src.db.ydb_client import MemoryDB
+    from src.models.episode import AudioRendition, Episode
+
+    repository = get_episode_repository()
+    if not isinstance(repository.db, MemoryDB):
+        return
+    for i in range(count):
+        day = date(2026, 1, 1) + timedelta(days=i)
+        url = f"https://storage.example/audio/ep-{day}.mp3"
+        repository.save(Episode(
+            episode_id=f"ep-{day}", date=day, status="completed", audio_url=url, article_count=8,
+            audio_renditions=[AudioRendition(
+                name="standard", output_format="mp3_44100_128", bitrate_kbps=128,
+                url=url, size_bytes=4_800_000, duration_seconds=300.0
+            )]
+        ))
+
+
+def child(function: str, event: dict, warm: int, seed: int) -> None:
+    """One cold start: print import, first and warm call timings as JSON"""
+    started = time.perf_counter()
+    module = importlib.import_module(FUNCTIONS[function])
+    imported = time.perf_counter()
+    if function == "portal":
+        seed_episodes(seed)
+
+    first_started = time.perf_counter()
+    response = module.handler(event, None)
+    first = time.perf_counter() - first_started
+
+    warm_ms = []
+    for _ in range(warm):
+        call_started = time.perf_counter()
+        module.handler(event, None)
+        warm_ms.append((time.perf_counter() - call_started) * 1000)
+
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "first_ms": first * 1000,
+        "warm_ms": warm_ms,
+        "status": response.get("statusCode"),
+    }))
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("function", choices=sorted(FUNCTIONS))
+    parser.add_argument("--event", help="JSON event (default: a typical event for the function)")
+    parser.add_argument("--cold", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--warm", type=int, default=100, help="warm invocations per interpreter")
+    parser.add_argument("--seed", type=int, default=30, help="episodes in the in-memory database")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    event = json.loads(args.event) if args.event else DEFAULT_EVENTS[args.function]
+
+    if args.child:
+        child(args.function, event, args.warm, args.seed)
+        return
+
+    runs = []
+    for _ in range(args.cold):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), args.function, "--child", "--event", json.dumps(event),
+             "--warm", str(args.warm), "--seed", str(args.seed)],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            sys.exit(result.stderr)
+        run = json.loads(result.stdout.strip().splitlines()[-1])
+        run["process_ms"] = (time.perf_counter() - started) * 1000
+        runs.append(run)
+
+    warm = [ms for run in runs for ms in run["warm_ms"]]
+    report = {
+        "function": FUNCTIONS[args.function],
+        "status": runs[0]["status"],
+        "cold_import_ms": round(statistics.median(r["import_ms"] for r in runs), 1),
+        "cold_first_call_ms": round(statistics.median(r["first_ms"] for r in runs), 1),
+        "cold_process_ms": round(statistics.median(r["process_ms"] for r in runs), 1),
+        "warm_p50_ms": round(percentile(warm, 0.5), 3) if warm else None,
+        "warm_p95_ms": round(percentile(warm, 0.95), 3) if warm else None,
+    }
+    for key, value in report.items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pure-Python MP3 frame toolkit on an episode-sized stream
+- Builds synthetic 128 kbps CBR segments, each with a LAME/Info header
+- Times mp3.scan over the whole stream, mp3.concat of the segments and
+  Mp3Splicer fed in fixed-size pieces
+- Reports the best round in milliseconds and MB/s
+
+Usage:
+  python scripts/bench_mp3.py --minutes 60 --segment-seconds 8
+"""
+
+import os
+import sys
+import time
+import argparse
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio import mp3
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo, no CRC
+HEADER = bytes((0xFF, 0xFB, 0x90, 0x44))
+HEADER_PADDED = bytes((0xFF, 0xFB, 0x92, 0x44))
+FRAME_LENGTH = 417
+FRAME_SAMPLES = 1152
+SAMPLE_RATE = 44100
+
+
+def make_segment(frames: int) -> bytes:
+    """One synthesized segment: Info header plus CBR frames with padding"""
+    audio = b"".join(
+        (HEADER_PADDED + b"\x55" * (FRAME_LENGTH - 3)) if i % 3 == 2 else (HEADER + b"\x55" * (FRAME_LENGTH - 4))
+        for i in range(frames)
+    )
+    lengths = array("L", [FRAME_LENGTH] * frames)
+    return mp3.build_xing_frame(HEADER, lengths, FRAME_SAMPLES, 576, 1152) + audio
+
+
+def splice(segments, piece: int) -> int:
+    splicer = mp3.Mp3Splicer()
+    written = 0
+    for i, segment in enumerate(segments):
+        for start in range(0, len(segment), piece):
+            written += len(splicer.feed(segment[start:start + piece]))
+        written += len(splicer.end_segment(last=i == len(segments) - 1))
+    return written
+
+
+def best_ms(fn, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--segment-seconds", type=float, default=8)
+    parser.add_argument("--piece-kb", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    frames_per_segment = max(1, round(args.segment_seconds * SAMPLE_RATE / FRAME_SAMPLES))
+    segment_count = max(1, round(args.minutes * 60 / args.segment_seconds))
+    segment = make_segment(frames_per_segment)
+    segments = [segment] * segment_count
+    stream = mp3.concat(segments)
+    megabytes = len(stream) / 1e6
+
+    scan_ms = best_ms(lambda: mp3.scan(stream), args.rounds)
+    concat_ms = best_ms(lambda: mp3.concat(segments), args.rounds)
+    splice_ms = best_ms(lambda: splice(segments, args.piece_kb * 1024), args.rounds)
+
+    report = {
+        "audio_minutes": round(mp3.scan(stream).duration_seconds / 60, 1),
+        "segments": segment_count,
+        "stream_mb": round(megabytes, 1),
+        "scan_ms": round(scan_ms),
+        "scan_mb_per_s": round(megabytes / scan_ms * 1000, 1),
+        "concat_ms": round(concat_ms),
+        "concat_mb_per_s": round(megabytes / concat_ms * 1000, 1),
+        "splicer_ms": round(splice_ms),
+        "splicer_mb_per_s": round(megabytes / splice_ms * 1000, 1),
+    }
+    for key, value in report.items():
+        print(f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
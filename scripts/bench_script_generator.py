@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark ScriptGenerator.generate against the offline LLM stand-in server
+- Drives concurrent generate() calls
+- Reports throughput, tail latency and fallback rate
+- Reports any call site that blocked the event loop longer than --block-ms
+
+Usage:
+  python scripts/bench_script_generator.py --requests 50 --concurrency 10 \
+      --latency lognormal:1.0:0.5 --error-503 0.1
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+
+from src.models.episode import Article
+from src.common.watchdog import LoopWatchdog
+from src.script.generator import ScriptGenerator
+from tests.stubs.llm_server import (
+    CLAUDE_PATH, YAGPT_PATH, LatencyProfile, StubConfig, create_app
+)
+
+
+def start_server(config: StubConfig, port: int) -> uvicorn.Server:
+    """Run the stand-in server in a background thread"""
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(config), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def sample_articles(count: int = 7) -> list:
+    return [
+        Article(
+            article_id=str(i),
+            title=f"Новость об ИИ номер {i}",
+            description="Компания представила новую модель с улучшенными возможностями. " * 5,
+            url=f"https://example.com/{i}",
+            published_at=datetime.now(),
+            source="techcrunch"
+        )
+        for i in range(count)
+    ]
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def run(generator: ScriptGenerator, total: int, concurrency: int, block_ms: int) -> dict:
+    articles = sample_articles()
+    target_date = date.today()
+    template = generator._template_script(articles, target_date)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    fallbacks = 0
+
+    async def one():
+        nonlocal fallbacks
+        async with semaphore:
+            started = time.perf_counter()
+            script = await generator.generate(articles, target_date)
+            latencies.append(time.perf_counter() - started)
+            if script == template:
+                fallbacks += 1
+
+    # requests.post runs in worker threads; size the pool to the concurrency
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+
+    async with LoopWatchdog(threshold=block_ms / 1000, interval=min(block_ms / 4000, 0.05)) as watchdog:
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2),
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "p99_s": round(percentile(latencies, 99), 3),
+        "max_s": round(max(latencies), 3),
+        "template_fallbacks": fallbacks,
+        "loop_blocks": len(watchdog.reports),
+        "blocked_sites": sorted({r.site for r in watchdog.reports}) or "-",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="lognormal:0.5:0.3")
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-503", type=float, default=0.0)
+    parser.add_argument("--timeouts", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--block-ms", type=int, default=50, help="report loop stalls longer than this")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency=LatencyProfile.parse(args.latency),
+        error_429_rate=args.error_429,
+        error_503_rate=args.error_503,
+        timeout_rate=args.timeouts,
+        seed=args.seed
+    )
+    server = start_server(config, args.port)
+
+    generator = ScriptGenerator()
+    generator.yagpt_api_key = generator.yagpt_api_key or "stub"
+    generator.claude_api_key = generator.claude_api_key or "stub"
+    generator.yagpt_url = f"http://127.0.0.1:{args.port}{YAGPT_PATH}"
+    generator.claude_url = f"http://127.0.0.1:{args.port}{CLAUDE_PATH}"
+
+    try:
+        report = asyncio.run(run(generator, args.requests, args.concurrency, args.block_ms))
+    finally:
+        server.should_exit = True
+
+    for key, value in report.items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the YDB prepared query cache against the in-process YDB stand-in
+- Runs a repository workload (save + get per episode, as the pipeline and portal do)
+- Once with prepared queries cached per session, once preparing on every call
+- Reports server round trips and latency per operation, and the cache hit rate
+
+Usage:
+  python scripts/bench_ydb_prepared.py --operations 500 --rtt-ms 2 --compile-ms 3
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.stubs import ydb_sdk
+
+sys.modules["ydb"] = ydb_sdk  # the client imports ydb lazily; serve it the stand-in
+
+import src.db.ydb_client as ydb_client
+from src.db.episodes import EpisodeRepository
+from src.db.ydb_client import PreparedQueryCache, YDBClient
+from src.models.episode import Episode
+
+
+def run(operations: int, latency: ydb_sdk.Latency, cache_size: int) -> dict:
+    client = YDBClient()
+    client.pool = ydb_sdk.SessionPool(latency)
+    client.prepared = PreparedQueryCache(cache_size)
+    repository = EpisodeRepository(db=client)
+
+    started = time.perf_counter()
+    for i in range(operations):
+        day = date(2026, 1, 1) + timedelta(days=i % 30)
+        repository.save(Episode(episode_id=f"ep-{day}", date=day, status="completed"))
+        repository.get(f"ep-{day}")
+    elapsed = time.perf_counter() - started
+
+    calls = operations * 2
+    return {
+        "ms_per_call": elapsed / calls * 1000,
+        "round_trips_per_call": client.pool.round_trips / calls,
+        "prepares": client.pool.prepares,
+        "hit_rate": client.prepared.stats()["hit_rate"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operations", type=int, default=300, help="episodes saved and read back")
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="network round trip")
+    parser.add_argument("--compile-ms", type=float, default=3.0, help="server time to compile a query")
+    parser.add_argument("--cache-size", type=int, default=YDBClient.PREPARED_CACHE_SIZE)
+    args = parser.parse_args()
+
+    ydb_client.HAS_YDB = True
+    latency = ydb_sdk.Latency(args.rtt_ms / 1000, args.compile_ms / 1000)
+    uncached = run(args.operations, latency, 0)
+    cached = run(args.operations, latency, args.cache_size)
+
+    report = {
+        "calls": args.operations * 2,
+        "uncached_ms_per_call": round(uncached["ms_per_call"], 3),
+        "cached_ms_per_call": round(cached["ms_per_call"], 3),
+        "uncached_round_trips": round(uncached["round_trips_per_call"], 2),
+        "cached_round_trips": round(cached["round_trips_per_call"], 2),
+        "uncached_prepares": uncached["prepares"],
+        "cached_prepares": cached["prepares"],
+        "cached_hit_rate": cached["hit_rate"],
+    }
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
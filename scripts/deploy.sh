@@ -2,6 +2,7 @@
 # ═══════════════════════════════════════════════════════════
 # Deploy Script for Yandex Cloud
 # Supports: Serverless Containers, YDB, Object Storage
+# Requires: yc CLI, jq and python3 with requirements.txt installed (migrations)
 # ═══════════════════════════════════════════════════════════
 
 set -e
@@ -73,13 +74,14 @@ setup_ydb() {
     
     echo -e "${GREEN}✅ YDB ready: $YDB_DATABASE${NC}"
     
-    # Run migrations if exists
-    if [ -f "migrations/tables.yql" ]; then
-        echo "Running migrations..."
-        yc ydb scripting yql \
-            --database $YDB_DATABASE \
-            --script-file migrations/tables.yql 2>/dev/null || true
+    # Run migrations: baseline once, then each migrations/NNNN_*.yql not yet applied
+    # Migrations run locally and need the Python dependencies (ydb, pydantic-settings)
+    if ! python3 -c "import ydb, pydantic_settings" 2>/dev/null; then
+        echo -e "${RED}❌ Migrations need the Python dependencies: pip install -r requirements.txt${NC}"
+        exit 1
     fi
+    echo "Running migrations..."
+    YC_TOKEN=$(yc iam create-token) python3 -m src.db.migrate
 }
 
 # ─────────────────────────────────────────────────────────────
@@ -130,6 +132,11 @@ setup_storage() {
         echo "Bucket already exists"
     fi
     
+    # Expire the persistent TTS segment cache (cache/tts/) after 30 days
+    yc storage bucket update --name $BUCKET_NAME \
+        --lifecycle-rules-from-file scripts/storage_lifecycle.json >/dev/null \
+        || echo -e "${YELLOW}⚠️  Could not set bucket lifecycle rules; cache/tts/ will not expire${NC}"
+
     # Create access keys if needed
     if [ -z "$AWS_ACCESS_KEY_ID" ]; then
         echo "Creating access keys..."
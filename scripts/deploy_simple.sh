@@ -1,6 +1,7 @@
 #!/bin/bash
 # ═══════════════════════════════════════════════════════════
 # Simple Deploy Script for Yandex Cloud (no jq required)
+# Requires: yc CLI and python3 with requirements.txt installed (migrations)
 # ═══════════════════════════════════════════════════════════
 
 set -e
@@ -69,13 +70,14 @@ export YDB_DATABASE=$(yc ydb database get "$DB_NAME" --format json-rest | grep -
 
 echo -e "${GREEN}✅ YDB ready${NC}"
 
-# Run migrations if exists
-if [ -f "migrations/tables.yql" ]; then
-    echo "Running migrations..."
-    yc ydb scripting yql \
-        --database $YDB_DATABASE \
-        --script-file migrations/tables.yql 2>/dev/null || echo "Migrations already applied"
+# Run migrations: baseline once, then each migrations/NNNN_*.yql not yet applied
+# Migrations run locally and need the Python dependencies (ydb, pydantic-settings)
+if ! python3 -c "import ydb, pydantic_settings" 2>/dev/null; then
+    echo -e "${RED}❌ Migrations need the Python dependencies: pip install -r requirements.txt${NC}"
+    exit 1
 fi
+echo "Running migrations..."
+YC_TOKEN=$(yc iam create-token) python3 -m src.db.migrate
 
 # ═══════════════════════════════════════════════════════════
 # Step 3: Setup Object Storage
@@ -118,6 +120,11 @@ else
         --max-size 1073741824 2>/dev/null || echo "Bucket may already exist"
 fi
 
+# Expire the persistent TTS segment cache (cache/tts/) after 30 days
+yc storage bucket update --name $BUCKET_NAME \
+    --lifecycle-rules-from-file scripts/storage_lifecycle.json >/dev/null \
+    || echo -e "${YELLOW}⚠️  Could not set bucket lifecycle rules; cache/tts/ will not expire${NC}"
+
 # Use existing AWS keys from .env or create new ones
 if [ -z "$AWS_ACCESS_KEY_ID" ]; then
     echo "Creating access keys..."
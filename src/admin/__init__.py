@@ -0,0 +1 @@
+# Admin and diagnostics module
@@ -0,0 +1,79 @@
+"""
+Admin Routes
+Profiling and memory diagnostics, enabled by ADMIN_TOKEN
+"""
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from src.common import profiler
+from src.common.config import get_settings
+from src.storage.s3_client import get_storage
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Reject requests without the configured admin token"""
+    expected = get_settings().admin_token
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.post("/profile")
+async def profile_window(seconds: float = Query(30, gt=0, le=300), interval_ms: int = Query(10, ge=1, le=1000)):
+    """Sample all threads for a time window and upload the collapsed stacks"""
+    try:
+        return await profiler.profile_window(seconds, get_storage(), interval=interval_ms / 1000)
+    except profiler.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/profile/next-run")
+async def profile_next_run():
+    """Profile the next episode generation run"""
+    profiler.request_run_profile()
+    return {"status": "armed"}
+
+
+@router.post("/memory/snapshots")
+async def take_snapshot(limit: int = Query(20, ge=1, le=200)):
+    """Take a tracemalloc snapshot (tracing starts on the first call)"""
+    snapshot_id = await asyncio.to_thread(profiler.take_snapshot)
+    top = await asyncio.to_thread(profiler.top_allocations, snapshot_id, limit)
+    return {"snapshot_id": snapshot_id, "top": top}
+
+
+@router.get("/memory/snapshots")
+async def list_snapshots():
+    return {"snapshots": profiler.list_snapshots()}
+
+
+@router.get("/memory/snapshots/{snapshot_id}")
+async def snapshot_top(snapshot_id: str, limit: int = Query(20, ge=1, le=200)):
+    """Top allocators of a snapshot by file and line"""
+    try:
+        return {"top": await asyncio.to_thread(profiler.top_allocations, snapshot_id, limit)}
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+
+@router.get("/memory/diff")
+async def snapshot_diff(older: str, newer: str, limit: int = Query(20, ge=1, le=200)):
+    """Allocators that grew most between two snapshots"""
+    try:
+        return {"diff": await asyncio.to_thread(profiler.diff_snapshots, older, newer, limit)}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Snapshot not found: {e.args[0]}")
+
+
+@router.delete("/memory/snapshots")
+async def stop_tracing():
+    """Stop tracemalloc and discard snapshots"""
+    await asyncio.to_thread(profiler.stop_tracing)
+    return {"status": "stopped"}
@@ -0,0 +1,97 @@
+"""
+Script Chunking for TTS
+Splits long scripts at paragraph and sentence boundaries under the API text limit
+"""
+
+import re
+from typing import List
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"(?<=[.!?…])\s+")
+_CLAUSE = re.compile(r"(?<=[,;:—])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences (paragraph breaks also end a sentence)"""
+    sentences = []
+    for paragraph in _PARAGRAPH.split(text):
+        sentences.extend(s.strip() for s in _SENTENCE.split(paragraph) if s.strip())
+    return sentences
+
+
+def split_text(text: str, max_length: int) -> List[str]:
+    """Split text into chunks of at most max_length characters
+
+    Paragraphs are kept whole when they fit; otherwise they are split into
+    sentences, then clauses, then words. Chunks are packed greedily so the
+    number of API calls stays minimal.
+    """
+    if max_length <= 0:
+        raise ValueError("max_length must be positive")
+
+    chunks: List[str] = []
+    current = ""
+
+    def flush():
+        nonlocal current
+        if current:
+            chunks.append(current)
+            current = ""
+
+    def add(piece: str, separator: str):
+        nonlocal current
+        if not current:
+            current = piece
+        elif len(current) + len(separator) + len(piece) <= max_length:
+            current = current + separator + piece
+        else:
+            flush()
+            current = piece
+
+    for paragraph in _PARAGRAPH.split(text.strip()):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_length:
+            add(paragraph, "\n\n")
+            continue
+
+        # Oversized paragraph: start a fresh chunk and pack it by sentences
+        flush()
+        for sentence in _SENTENCE.split(paragraph):
+            for piece in _split_oversized(sentence.strip(), max_length):
+                add(piece, " ")
+        flush()
+
+    flush()
+    return chunks
+
+
+def _split_oversized(sentence: str, max_length: int) -> List[str]:
+    """Break a single sentence that exceeds max_length at clauses, then words"""
+    if len(sentence) <= max_length:
+        return [sentence] if sentence else []
+
+    pieces: List[str] = []
+    for clause in _CLAUSE.split(sentence):
+        if len(clause) <= max_length:
+            pieces.append(clause)
+            continue
+
+        current = ""
+        for word in clause.split():
+            while len(word) > max_length:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(word[:max_length])
+                word = word[max_length:]
+            if current and len(current) + 1 + len(word) > max_length:
+                pieces.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            pieces.append(current)
+
+    return pieces
@@ -0,0 +1,188 @@
+"""
+HLS Packaging
+Frame-aligned MP3 segments and playlists, without re-encoding
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.audio import mp3
+
+logger = logging.getLogger(__name__)
+
+TARGET_SEGMENT_SECONDS = 6.0
+TIMESTAMP_CLOCK = 90_000  # MPEG-TS clock used by the ID3 timestamp
+MP3_CODEC = "mp4a.40.34"
+IMMUTABLE = "public, max-age=31536000, immutable"
+PLAYLIST_TYPE = "application/vnd.apple.mpegurl"
+UPLOAD_CONCURRENCY = 8
+
+_PRIV_OWNER = b"com.apple.streaming.transportStreamTimestamp\x00"
+
+
+@dataclass
+class HlsSegment:
+    """A run of whole frames from the source file"""
+    index: int
+    start_seconds: float
+    duration_seconds: float
+    runs: List[Tuple[int, int]]
+    size_bytes: int
+
+    @property
+    def uri(self) -> str:
+        return f"seg-{self.index:05d}.mp3"
+
+
+@dataclass
+class HlsRendition:
+    """Segments and media playlist for one MP3 file"""
+    source: bytes
+    segments: List[HlsSegment] = field(default_factory=list)
+
+    def segment_bytes(self, segment: HlsSegment) -> bytes:
+        """Timestamp tag followed by the segment's frames, sliced from the source"""
+        mv = memoryview(self.source)
+        return timestamp_tag(segment.start_seconds) + b"".join(mv[o:o + n] for o, n in segment.runs)
+
+    @property
+    def peak_bandwidth(self) -> int:
+        """Highest segment bitrate in bits/s, as required for BANDWIDTH"""
+        return max(
+            (math.ceil(s.size_bytes * 8 / s.duration_seconds) for s in self.segments if s.duration_seconds),
+            default=0
+        )
+
+    def playlist(self) -> str:
+        """VOD media playlist"""
+        target = max((math.ceil(s.duration_seconds) for s in self.segments), default=0)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{target}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:VOD",
+        ]
+        for segment in self.segments:
+            lines.append(f"#EXTINF:{segment.duration_seconds:.3f},")
+            lines.append(segment.uri)
+        lines.append("#EXT-X-ENDLIST")
+        return "\n".join(lines) + "\n"
+
+
+def _syncsafe(value: int) -> bytes:
+    return bytes(((value >> 21) & 0x7F, (value >> 14) & 0x7F, (value >> 7) & 0x7F, value & 0x7F))
+
+
+def timestamp_tag(start_seconds: float) -> bytes:
+    """ID3v2.4 PRIV frame carrying the segment's 33-bit presentation timestamp
+
+    Packed-audio HLS requires it at the start of every segment.
+    """
+    timestamp = round(start_seconds * TIMESTAMP_CLOCK) & ((1 << 33) - 1)
+    body = _PRIV_OWNER + struct.pack(">Q", timestamp)
+    frame = b"PRIV" + _syncsafe(len(body)) + b"\x00\x00" + body
+    return b"ID3\x04\x00\x00" + _syncsafe(len(frame)) + frame
+
+
+def segment(data: bytes, target_seconds: float = TARGET_SEGMENT_SECONDS) -> HlsRendition:
+    """Split an MP3 into segments of whole frames close to target_seconds
+
+    This is one pass over the frame index plus byte slicing. Frames may
+    borrow bits from their predecessor (bit reservoir), which players
+    handle because packed-audio segments are fed to one continuous decoder.
+    """
+    info = mp3.scan(data)
+    rendition = HlsRendition(source=data)
+    if not info.frame_count:
+        return rendition
+
+    frame_seconds = info.samples_per_frame / info.sample_rate
+    per_segment = max(round(target_seconds / frame_seconds), 1)
+    for index, start in enumerate(range(0, info.frame_count, per_segment)):
+        stop = min(start + per_segment, info.frame_count)
+        runs = list(mp3.frame_runs(info, start, stop))
+        rendition.segments.append(HlsSegment(
+            index=index,
+            start_seconds=start * frame_seconds,
+            duration_seconds=(stop - start) * frame_seconds,
+            runs=runs,
+            size_bytes=sum(n for _, n in runs)
+        ))
+    return rendition
+
+
+def master_playlist(variants: List[Tuple[str, HlsRendition]]) -> str:
+    """Multivariant playlist, highest bandwidth first"""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for uri, rendition in sorted(variants, key=lambda v: v[1].peak_bandwidth, reverse=True):
+        lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={rendition.peak_bandwidth},CODECS="{MP3_CODEC}"')
+        lines.append(uri)
+    return "\n".join(lines) + "\n"
+
+
+def package(sources: Dict[str, bytes], target_seconds: float = TARGET_SEGMENT_SECONDS) -> Dict[str, bytes]:
+    """All HLS files for a set of renditions, keyed by relative path
+
+    Paths are <rendition>/index.m3u8, <rendition>/seg-NNNNN.mp3 and the
+    multivariant master.m3u8.
+    """
+    files: Dict[str, bytes] = {}
+    variants = []
+    for name, data in sources.items():
+        rendition = segment(data, target_seconds)
+        if not rendition.segments:
+            continue
+        for seg in rendition.segments:
+            files[f"{name}/{seg.uri}"] = rendition.segment_bytes(seg)
+        files[f"{name}/index.m3u8"] = rendition.playlist().encode()
+        variants.append((f"{name}/index.m3u8", rendition))
+    if variants:
+        files["master.m3u8"] = master_playlist(variants).encode()
+    return files
+
+
+def content_prefix(episode_id: str, sources: Dict[str, bytes]) -> str:
+    """Storage prefix unique to this audio, so every file can be cached forever"""
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(name.encode())
+        digest.update(sources[name])
+    return f"audio/hls/{episode_id}/{digest.hexdigest()[:12]}/"
+
+
+async def publish(episode_id: str, object_names: Dict[str, str], storage=None) -> Optional[str]:
+    """Package stored renditions as HLS and upload them; returns the master playlist URL
+
+    The master playlist is uploaded last, so it never points at missing files.
+    """
+    from src.storage.s3_client import get_storage
+
+    storage = storage or get_storage()
+    sources = {}
+    for name, object_name in object_names.items():
+        sources[name] = await asyncio.to_thread(storage.download_bytes, object_name)
+
+    files = await asyncio.to_thread(package, sources)
+    if not files:
+        return None
+    prefix = await asyncio.to_thread(content_prefix, episode_id, sources)
+
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    async def upload(path: str) -> str:
+        content_type = PLAYLIST_TYPE if path.endswith(".m3u8") else "audio/mpeg"
+        async with semaphore:
+            return await asyncio.to_thread(
+                storage.upload_bytes, files[path], prefix + path, content_type, IMMUTABLE
+            )
+
+    await asyncio.gather(*(upload(path) for path in files if path != "master.m3u8"))
+    url = await upload("master.m3u8")
+    logger.info(f"HLS: {len(files)} files under {prefix}")
+    return url
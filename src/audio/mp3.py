@@ -0,0 +1,529 @@
+"""
+MP3 Frame Toolkit
+Frame-level parsing, measurement and gapless concatenation without decoding
+"""
+
+import struct
+from array import array
+from itertools import accumulate
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+# Bitrates in kbps indexed by [table][bitrate_index]
+_BITRATES = {
+    "v1l1": (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    "v1l2": (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    "v1l3": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "v2l1": (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    "v2l23": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates indexed by [version_bits][sample_rate_index]
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG 1
+    2: (22050, 24000, 16000),  # MPEG 2
+    0: (11025, 12000, 8000),   # MPEG 2.5
+}
+
+ID3V2_HEADER_SIZE = 10
+ID3V1_SIZE = 128
+
+# (frame length without padding, padding size, samples per frame, sample rate, bitrate kbps)
+FrameSpec = Tuple[int, int, int, int, int]
+_SPECS: dict = {}
+
+
+def _frame_spec(b1: int, b2: int) -> Optional[FrameSpec]:
+    """Decode header bytes 1-2 (after the 0xFF sync byte); memoised"""
+    key = (b1 << 8) | b2
+    if key in _SPECS:
+        return _SPECS[key]
+
+    spec = None
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+
+    if (b1 & 0xE0) == 0xE0 and version != 1 and layer != 0 and 0 < bitrate_index < 15 and rate_index != 3:
+        sample_rate = _SAMPLE_RATES[version][rate_index]
+        if version == 3:
+            table = {3: "v1l1", 2: "v1l2", 1: "v1l3"}[layer]
+        else:
+            table = "v2l1" if layer == 3 else "v2l23"
+        bitrate = _BITRATES[table][bitrate_index]
+
+        if layer == 3:  # Layer I: 4-byte slots
+            samples = 384
+            length = (12 * bitrate * 1000 // sample_rate) * 4
+            padding = 4
+        else:
+            samples = 1152 if (layer == 2 or version == 3) else 576
+            length = (samples // 8) * bitrate * 1000 // sample_rate
+            padding = 1
+        spec = (length, padding, samples, sample_rate, bitrate)
+
+    _SPECS[key] = spec
+    return spec
+
+
+# Header bytes 1-2 -> (frame length including padding, samples), or () if invalid
+_FRAMES: dict = {}
+
+
+def _frame_info(key: int) -> tuple:
+    spec = _frame_spec(key >> 8, key & 0xFF)
+    frame = (spec[0] + (spec[1] if key & 0x02 else 0), spec[2]) if spec else ()
+    _FRAMES[key] = frame
+    return frame
+
+
+def _id3v2_size(mv: memoryview, pos: int) -> int:
+    """Total size of an ID3v2 tag starting at pos, or 0"""
+    if len(mv) - pos < ID3V2_HEADER_SIZE or bytes(mv[pos:pos + 3]) != b"ID3":
+        return 0
+    s = mv[pos + 6:pos + 10]
+    if any(b & 0x80 for b in s):
+        return 0
+    size = (s[0] << 21) | (s[1] << 14) | (s[2] << 7) | s[3]
+    footer = ID3V2_HEADER_SIZE if mv[pos + 5] & 0x10 else 0
+    return ID3V2_HEADER_SIZE + size + footer
+
+
+def _side_info_size(b1: int, b3: int) -> int:
+    """Layer III side information size in bytes"""
+    mono = (b3 >> 6) == 3
+    if (b1 >> 3) & 0x03 == 3:
+        return 17 if mono else 32
+    return 9 if mono else 17
+
+
+@dataclass
+class XingInfo:
+    """Contents of a Xing/Info (and optional LAME) header frame"""
+    frames: Optional[int] = None
+    bytes: Optional[int] = None
+    encoder_delay: int = 0
+    encoder_padding: int = 0
+
+
+def _parse_xing(mv: memoryview, pos: int, length: int) -> Optional[XingInfo]:
+    """Parse a Xing/Info header if the frame at pos carries one"""
+    if (mv[pos + 1] >> 1) & 0x03 != 1:  # Layer III only
+        return None
+    offset = pos + 4 + _side_info_size(mv[pos + 1], mv[pos + 3])
+    if offset + 8 > pos + length or bytes(mv[offset:offset + 4]) not in (b"Xing", b"Info"):
+        return None
+
+    info = XingInfo()
+    flags = struct.unpack_from(">I", mv, offset + 4)[0]
+    cursor = offset + 8
+    if flags & 0x01:
+        info.frames = struct.unpack_from(">I", mv, cursor)[0]
+        cursor += 4
+    if flags & 0x02:
+        info.bytes = struct.unpack_from(">I", mv, cursor)[0]
+        cursor += 4
+    if flags & 0x04:
+        cursor += 100
+    if flags & 0x08:
+        cursor += 4
+
+    # LAME extension: delay and padding are two 12-bit fields at +21
+    if cursor + 24 <= pos + length and bytes(mv[cursor:cursor + 4]) in (b"LAME", b"Lavc", b"Lavf"):
+        d = mv[cursor + 21:cursor + 24]
+        info.encoder_delay = (d[0] << 4) | (d[1] >> 4)
+        info.encoder_padding = ((d[1] & 0x0F) << 8) | d[2]
+    return info
+
+
+@dataclass
+class Mp3Info:
+    """Frame index of an MP3 buffer"""
+    offsets: array = field(default_factory=lambda: array("L"))
+    lengths: array = field(default_factory=lambda: array("L"))
+    sample_rate: int = 0
+    samples_per_frame: int = 0
+    total_samples: int = 0
+    audio_bytes: int = 0
+    xing: Optional[XingInfo] = None
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def duration_seconds(self) -> float:
+        """Exact playback duration, net of encoder delay and padding"""
+        if not self.sample_rate:
+            return 0.0
+        samples = self.total_samples
+        if self.xing:
+            samples -= self.xing.encoder_delay + self.xing.encoder_padding
+        return max(samples, 0) / self.sample_rate
+
+    @property
+    def bitrate_kbps(self) -> float:
+        """Average bitrate of the audio frames"""
+        if not self.total_samples:
+            return 0.0
+        return self.audio_bytes * 8 * self.sample_rate / self.total_samples / 1000
+
+
+def scan(data) -> Mp3Info:
+    """Index every audio frame, skipping ID3 tags, Xing/Info frames and junk"""
+    mv = memoryview(data).cast("B")
+    end = len(mv)
+    if end >= ID3V1_SIZE and bytes(mv[end - ID3V1_SIZE:end - ID3V1_SIZE + 3]) == b"TAG":
+        end -= ID3V1_SIZE
+
+    info = Mp3Info()
+    offsets = info.offsets
+    lengths = info.lengths
+    frames = _FRAMES
+    total_samples = 0
+    audio_bytes = 0
+    pos = 0
+
+    while pos + 4 <= end:
+        if mv[pos] == 0xFF:
+            key = (mv[pos + 1] << 8) | mv[pos + 2]
+            frame = frames.get(key)
+            if frame is None:
+                frame = _frame_info(key)
+            if frame:
+                length, samples = frame
+                if pos + length > end:
+                    break
+
+                if not offsets:
+                    if info.xing is None:
+                        xing = _parse_xing(mv, pos, length)
+                        if xing is not None:
+                            info.xing = xing
+                            pos += length
+                            continue
+                    info.samples_per_frame = samples
+                    info.sample_rate = _frame_spec(mv[pos + 1], mv[pos + 2])[3]
+
+                offsets.append(pos)
+                lengths.append(length)
+                total_samples += samples
+                audio_bytes += length
+                pos += length
+                continue
+
+        tag = _id3v2_size(mv, pos)
+        pos += tag if tag else 1
+
+    info.total_samples = total_samples
+    info.audio_bytes = audio_bytes
+    return info
+
+
+def strip_tags(data) -> bytes:
+    """Return only the audio frames (no ID3 tags or Xing/Info frame)"""
+    mv = memoryview(data).cast("B")
+    info = scan(mv)
+    return b"".join(mv[o:o + n] for o, n in frame_runs(info))
+
+
+def frame_runs(info: Mp3Info, start: int = 0, stop: Optional[int] = None) -> Iterable[Tuple[int, int]]:
+    """Merge adjacent frames in [start, stop) into (offset, length) byte runs"""
+    stop = info.frame_count if stop is None else stop
+    if start >= stop:
+        return
+
+    # Fast path: no junk between frames, so the whole range is one run
+    first = info.offsets[start]
+    span = info.offsets[stop - 1] + info.lengths[stop - 1] - first
+    if span == sum(info.lengths[start:stop]):
+        yield first, span
+        return
+
+    run_start = run_end = None
+    for i in range(start, stop):
+        offset = info.offsets[i]
+        if offset != run_end:
+            if run_start is not None:
+                yield run_start, run_end - run_start
+            run_start = offset
+        run_end = offset + info.lengths[i]
+    yield run_start, run_end - run_start
+
+
+def concat(chunks: List[bytes]) -> bytes:
+    """Join separately encoded MP3 chunks into one gapless file
+
+    ID3 tags and per-chunk Xing/Info frames are dropped, trailing frames
+    that consist entirely of encoder padding are removed, and a fresh
+    Xing/LAME header with a seek TOC is written for the result. Sub-frame
+    padding cannot be trimmed without decoding; it is declared in the LAME
+    header instead. Chunks without recognisable frames are passed through.
+    """
+    pieces: List[memoryview] = []
+    frame_lengths = array("L")
+    frame_samples = 0
+    first_spec = None
+    delay = padding = 0
+
+    for n, chunk in enumerate(chunks):
+        mv = memoryview(chunk).cast("B")
+        info = scan(mv)
+        if not info.frame_count:
+            pieces.append(mv)
+            continue
+
+        stop = info.frame_count
+        chunk_padding = info.xing.encoder_padding if info.xing else 0
+        if n < len(chunks) - 1 and info.samples_per_frame:
+            dropped = min(chunk_padding // info.samples_per_frame, stop - 1)
+            stop -= dropped
+            chunk_padding -= dropped * info.samples_per_frame
+
+        if first_spec is None:
+            first = info.offsets[0]
+            first_spec = bytes(mv[first:first + 4])
+            frame_samples = info.samples_per_frame
+            delay = info.xing.encoder_delay if info.xing else 0
+        padding = chunk_padding
+
+        for offset, length in frame_runs(info, 0, stop):
+            pieces.append(mv[offset:offset + length])
+        frame_lengths.extend(info.lengths[:stop])
+
+    if first_spec is None:
+        return b"".join(pieces)
+
+    header = build_xing_frame(first_spec, frame_lengths, frame_samples, delay, padding)
+    return header + b"".join(pieces)
+
+
+class Mp3Splicer:
+    """Streaming counterpart of concat(), fed segment by segment in arbitrary pieces
+
+    ID3 tags, junk and each segment's Xing/Info frame are dropped, and
+    trailing frames that are entirely encoder padding are held back and
+    dropped from every segment but the last. No Xing header is written for
+    the whole stream, since its totals are only known at the end. Segments
+    without recognisable frames are passed through.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        self._carry = b""
+        self._skip = 0
+        self._raw: Optional[bytearray] = bytearray()  # segment bytes until its first frame
+        self._held: deque = deque()
+        self._hold = 0
+        self._frames = 0
+        self._xing_checked = False
+
+    def feed(self, data: bytes) -> bytes:
+        """Add bytes of the current segment; returns audio ready to be written"""
+        if self._raw is not None:
+            self._raw.extend(data)
+        if self._skip >= len(data):
+            self._skip -= len(data)
+            return b""
+        buffer = self._carry + bytes(memoryview(data)[self._skip:])
+        self._skip = 0
+
+        out = bytearray()
+        mv = memoryview(buffer)
+        pos = 0
+        end = len(mv)
+        while pos + 4 <= end:
+            if mv[pos] == 0xFF:
+                key = (mv[pos + 1] << 8) | mv[pos + 2]
+                frame = _FRAMES.get(key)
+                if frame is None:
+                    frame = _frame_info(key)
+                if frame:
+                    length, samples = frame
+                    if pos + length > end:
+                        break
+                    if not self._xing_checked:
+                        self._xing_checked = True
+                        xing = _parse_xing(mv, pos, length)
+                        if xing is not None:
+                            self._hold = xing.encoder_padding // samples
+                            pos += length
+                            continue
+                    self._raw = None
+                    self._frames += 1
+                    self._held.append(bytes(mv[pos:pos + length]))
+                    while len(self._held) > self._hold:
+                        out += self._held.popleft()
+                    pos += length
+                    continue
+            elif end - pos < ID3V2_HEADER_SIZE:
+                break
+
+            tag = _id3v2_size(mv, pos)
+            if tag:
+                if pos + tag > end:
+                    self._skip = pos + tag - end
+                    pos = end
+                    break
+                pos += tag
+            else:
+                pos += 1
+
+        self._carry = bytes(mv[pos:])
+        return bytes(out)
+
+    def end_segment(self, last: bool = False) -> bytes:
+        """Finish the current segment; returns the rest of its audio"""
+        if self._raw is not None:
+            out = bytes(self._raw)
+        else:
+            held = list(self._held)
+            if not last:
+                # Padding frames go, but every segment keeps at least one frame
+                held = held[:1] if self._frames == len(held) else []
+            out = b"".join(held)
+        self._reset()
+        return out
+
+
+def build_xing_frame(
+    template_header: bytes,
+    frame_lengths: array,
+    samples_per_frame: int,
+    encoder_delay: int = 0,
+    encoder_padding: int = 0
+) -> bytes:
+    """Build a silent Layer III frame carrying Xing, TOC and LAME headers"""
+    b1, b2, b3 = template_header[1], template_header[2], template_header[3]
+    side_info = _side_info_size(b1, b3)
+    needed = 4 + side_info + 120 + 36
+
+    # Smallest bitrate whose frame is large enough to hold the headers
+    frame = None
+    for bitrate_index in range(1, 15):
+        candidate_b2 = (bitrate_index << 4) | (b2 & 0x0C)
+        spec = _frame_spec(b1 | 0x01, candidate_b2)
+        if spec and spec[0] >= needed:
+            frame = bytearray(spec[0])
+            frame[0:4] = bytes((0xFF, b1 | 0x01, candidate_b2, b3))
+            break
+    if frame is None:
+        raise ValueError("Frame format too small for a Xing header")
+
+    total_frames = len(frame_lengths)
+    total_bytes = sum(frame_lengths) + len(frame)
+    vbr = len(set(frame_lengths)) > 2
+
+    offset = 4 + side_info
+    frame[offset:offset + 4] = b"Xing" if vbr else b"Info"
+    struct.pack_into(">III", frame, offset + 4, 0x0F, total_frames, total_bytes)
+    struct.pack_into(">I", frame, offset + 116, 0)  # quality
+    frame[offset + 16:offset + 116] = _toc(frame_lengths, len(frame), total_bytes)
+
+    lame = offset + 120
+    frame[lame:lame + 9] = b"LAME3.100"
+    delay = min(encoder_delay, 0xFFF)
+    pad = min(encoder_padding, 0xFFF)
+    frame[lame + 21:lame + 24] = bytes((delay >> 4, ((delay & 0x0F) << 4) | (pad >> 8), pad & 0xFF))
+    struct.pack_into(">I", frame, lame + 28, total_bytes)
+    struct.pack_into(">H", frame, lame + 34, crc16(bytes(frame[:lame + 34])))
+    return bytes(frame)
+
+
+def _toc(frame_lengths: array, header_length: int, total_bytes: int) -> bytes:
+    """100-entry seek table: byte position (/256) at each percent of duration"""
+    count = len(frame_lengths)
+    if not count or not total_bytes:
+        return bytes(100)
+
+    positions = list(accumulate(frame_lengths, initial=header_length))
+    return bytes(
+        min(positions[percent * count // 100] * 256 // total_bytes, 255)
+        for percent in range(100)
+    )
+
+
+def _crc16_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC16 = _crc16_table()
+
+
+def crc16(data: bytes) -> int:
+    """CRC-16/ARC as used by the LAME tag"""
+    crc = 0
+    for byte in data:
+        crc = (crc >> 8) ^ _CRC16[(crc ^ byte) & 0xFF]
+    return crc
+
+
+class Mp3StreamMeter:
+    """Count frames, samples and bytes of an MP3 stream fed in arbitrary pieces"""
+
+    def __init__(self):
+        self.size_bytes = 0
+        self.total_samples = 0
+        self.sample_rate = 0
+        self.frame_count = 0
+        self._carry = b""
+        self._skip = 0
+
+    def feed(self, data: bytes) -> None:
+        self.size_bytes += len(data)
+        if self._skip >= len(data):
+            self._skip -= len(data)
+            return
+        buffer = self._carry + bytes(memoryview(data)[self._skip:])
+        self._skip = 0
+
+        mv = memoryview(buffer)
+        pos = 0
+        end = len(mv)
+        while pos + ID3V2_HEADER_SIZE <= end:
+            if mv[pos] == 0xFF:
+                key = (mv[pos + 1] << 8) | mv[pos + 2]
+                frame = _FRAMES.get(key)
+                if frame is None:
+                    frame = _frame_info(key)
+                if frame:
+                    length, samples = frame
+                    if pos + length > end:
+                        break
+                    # Cheap pre-check before parsing a possible Xing/Info frame
+                    marker = pos + 4 + _side_info_size(mv[pos + 1], mv[pos + 3])
+                    if marker < end and mv[marker] in (0x58, 0x49) and _parse_xing(mv, pos, length):
+                        pos += length
+                        continue
+                    self.frame_count += 1
+                    self.total_samples += samples
+                    if not self.sample_rate:
+                        self.sample_rate = _frame_spec(mv[pos + 1], mv[pos + 2])[3]
+                    pos += length
+                    continue
+
+            tag = _id3v2_size(mv, pos)
+            if tag:
+                if pos + tag > end:
+                    self._skip = pos + tag - end
+                    pos = end
+                    break
+                pos += tag
+            else:
+                pos += 1
+
+        self._carry = bytes(mv[pos:])
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.total_samples / self.sample_rate if self.sample_rate else 0.0
@@ -0,0 +1,100 @@
+"""
+Audio Renditions
+Output formats produced per episode and client-hint based selection
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.models.episode import AudioRendition
+
+# Network Information client hints that indicate a slow connection
+LOW_BANDWIDTH_ECT = {"slow-2g", "2g", "3g"}
+LOW_BANDWIDTH_DOWNLINK_MBPS = 1.5
+CLIENT_HINTS = "Save-Data, ECT, Downlink"
+
+
+@dataclass(frozen=True)
+class RenditionSpec:
+    """A named provider output format, e.g. mobile → mp3_22050_32"""
+    name: str
+    output_format: str
+
+    @property
+    def bitrate_kbps(self) -> int:
+        return bitrate_of(self.output_format)
+
+
+def bitrate_of(output_format: str) -> int:
+    """Bitrate of an ElevenLabs mp3_<rate>_<kbps> format"""
+    try:
+        return int(output_format.rsplit("_", 1)[1])
+    except (IndexError, ValueError):
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+
+def parse_renditions(value: str) -> List[RenditionSpec]:
+    """Parse "name:format,name:format"; the first entry is the primary rendition"""
+    specs = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, output_format = item.partition(":")
+        if not output_format or not output_format.startswith("mp3_"):
+            raise ValueError(f"Invalid rendition: {item}")
+        bitrate_of(output_format)
+        specs.append(RenditionSpec(name.strip(), output_format.strip()))
+    if not specs:
+        raise ValueError("At least one rendition is required")
+    return specs
+
+
+def rendition_object_name(episode_id: str, spec: RenditionSpec, primary: bool) -> str:
+    """Storage key; the primary rendition keeps the canonical episode path"""
+    if primary:
+        return f"audio/{episode_id}.mp3"
+    return f"audio/{episode_id}-{spec.name}.mp3"
+
+
+def prefers_low_bitrate(
+    save_data: Optional[str] = None,
+    ect: Optional[str] = None,
+    downlink: Optional[str] = None
+) -> bool:
+    """Whether client hints ask for the lightest rendition"""
+    if save_data and save_data.strip().lower() == "on":
+        return True
+    if ect and ect.strip().lower() in LOW_BANDWIDTH_ECT:
+        return True
+    if downlink:
+        try:
+            return float(downlink) < LOW_BANDWIDTH_DOWNLINK_MBPS
+        except ValueError:
+            return False
+    return False
+
+
+def choose_rendition(
+    renditions: List[AudioRendition],
+    save_data: Optional[str] = None,
+    ect: Optional[str] = None,
+    downlink: Optional[str] = None,
+    quality: Optional[str] = None
+) -> Optional[AudioRendition]:
+    """Pick a rendition: explicit quality name first, then client hints
+
+    Without hints the highest bitrate is served; constrained clients get
+    the lowest.
+    """
+    if not renditions:
+        return None
+    if quality:
+        for rendition in renditions:
+            if rendition.name == quality:
+                return rendition
+
+    by_bitrate = sorted(renditions, key=lambda r: r.bitrate_kbps)
+    if prefers_low_bitrate(save_data, ect, downlink):
+        return by_bitrate[0]
+    return by_bitrate[-1]
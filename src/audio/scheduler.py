@@ -0,0 +1,347 @@
+"""
+TTS Job Scheduler
+Admits synthesis jobs against the ElevenLabs character quota
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first
+PRIORITY_TODAY = 0
+PRIORITY_BACKFILL = 10
+
+CHARACTER_COST_HEADERS = ("character-cost", "x-character-count")
+
+
+class QuotaExceededError(Exception):
+    """ElevenLabs refused a request for lack of character quota"""
+
+    def __init__(self, message: str, reset_at: Optional[float] = None):
+        super().__init__(message)
+        self.reset_at = reset_at
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Unix time from an X-RateLimit-Reset value (epoch seconds or ISO 8601)"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_character_cost(headers) -> Optional[int]:
+    """Characters billed for a response, if the API reported them"""
+    for name in CHARACTER_COST_HEADERS:
+        try:
+            value = headers.get(name)
+            if value is not None:
+                return int(value)
+        except (AttributeError, TypeError, ValueError):
+            return None
+    return None
+
+
+class QuotaTracker:
+    """Characters used and left in the current billing period
+
+    Fed by response headers after each request and by the subscription
+    endpoint. Characters of admitted jobs are reserved until the job ends,
+    so concurrent jobs cannot over-commit the remaining quota. While the
+    limit is unknown, jobs are admitted optimistically.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.character_limit: Optional[int] = None
+        self.character_count = 0
+        self.reset_at: Optional[float] = None
+        self.blocked_until: Optional[float] = None
+        self.reserved = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Characters left after reservations, None while unknown"""
+        if self.character_limit is None:
+            return None
+        return max(self.character_limit - self.character_count - self.reserved, 0)
+
+    def update_from_subscription(self, data: dict) -> None:
+        """Apply an ElevenLabs /v1/user/subscription response"""
+        with self._lock:
+            if data.get("character_limit") is not None:
+                self.character_limit = int(data["character_limit"])
+            if data.get("character_count") is not None:
+                self.character_count = int(data["character_count"])
+            if data.get("next_character_count_reset_unix"):
+                self.reset_at = float(data["next_character_count_reset_unix"])
+            if self.remaining:
+                self.blocked_until = None
+
+    def record_usage(self, characters: int) -> None:
+        """Count characters billed by a completed request"""
+        with self._lock:
+            self.character_count += characters
+
+    def exhaust(self, reset_at: Optional[float] = None) -> None:
+        """Block admissions after the API reported the quota as spent"""
+        with self._lock:
+            self.blocked_until = reset_at or self.reset_at
+            if reset_at:
+                self.reset_at = reset_at
+            if self.character_limit is not None:
+                self.character_count = self.character_limit
+
+    def available(self, characters: int) -> bool:
+        """Whether characters fit the quota right now"""
+        with self._lock:
+            return self._fits(characters)
+
+    def reserve(self, characters: int) -> bool:
+        """Reserve quota for a job, False if it does not fit now"""
+        with self._lock:
+            if not self._fits(characters):
+                return False
+            self.reserved += characters
+            return True
+
+    def release(self, characters: int) -> None:
+        """Return a job's reservation; its real usage arrives via headers"""
+        with self._lock:
+            self.reserved = max(self.reserved - characters, 0)
+
+    def fits_plan(self, characters: int) -> bool:
+        """Whether a job could ever run within one billing period"""
+        return self.character_limit is None or characters <= self.character_limit
+
+    def wait_seconds(self, default: float) -> float:
+        """Seconds until admissions may succeed again"""
+        until = self.blocked_until or self.reset_at
+        if until is None:
+            return default
+        return max(until - self.clock(), 1.0)
+
+    def _fits(self, characters: int) -> bool:
+        self._roll_over()
+        if self.blocked_until is not None:
+            return False
+        remaining = self.remaining
+        return remaining is None or remaining >= characters
+
+    def _roll_over(self) -> None:
+        now = self.clock()
+        if self.blocked_until is not None and now >= self.blocked_until:
+            self.blocked_until = None
+        if self.reset_at is not None and now >= self.reset_at:
+            # New billing period; the next subscription refresh has the details
+            self.character_count = 0
+            self.reset_at = None
+
+
+class TTSJob:
+    """Handle for a scheduled synthesis job; await it for the job's result"""
+
+    def __init__(self, name: str, priority: int, characters: int, run: Callable[[], Awaitable]):
+        self.name = name
+        self.priority = priority
+        self.characters = characters
+        self.run = run
+        self.status = "queued"
+        self.attempts = 0
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.started = asyncio.Event()  # set while admitted and running
+        # Run in the submitter's context so deadlines and tracing carry over
+        self.context = contextvars.copy_context()
+
+    def __await__(self):
+        return self.future.__await__()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self) -> None:
+        """Drop the job, stopping it if it is already running"""
+        self.future.cancel()
+
+    async def admitted(self, timeout: Optional[float]) -> bool:
+        """Wait until the job starts running (or ends); False if still queued or parked after timeout"""
+        started = asyncio.ensure_future(self.started.wait())
+        try:
+            done, _ = await asyncio.wait({started, self.future}, timeout=timeout)
+        finally:
+            started.cancel()
+        return bool(done)
+
+
+class TTSScheduler:
+    """Priority queue of TTS jobs admitted against the character quota
+
+    Jobs that do not fit the remaining quota are parked until the reset
+    time rather than failed. A job refused by the API for lack of quota is
+    re-queued at its original position; rate limits are retried by the
+    TTS service itself. The queue drains strictly in
+    priority order (then submission order), so a large episode for today
+    is never starved by smaller backfills.
+    """
+
+    DEFAULT_PARK_SECONDS = 300.0
+
+    def __init__(
+        self,
+        quota: Optional[QuotaTracker] = None,
+        refresh: Optional[Callable[[], Awaitable]] = None,
+        max_running: int = 1
+    ):
+        self.quota = quota or QuotaTracker()
+        self.refresh = refresh
+        self.max_running = max_running
+        self._counter = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # State is per event loop; a new loop starts with an empty queue
+            self._loop = loop
+            self._queue: List[Tuple[int, int, TTSJob]] = []
+            self._running: Dict[TTSJob, asyncio.Task] = {}
+            self._wakeup = asyncio.Event()
+            self._drainer: Optional[asyncio.Task] = None
+
+    def submit(
+        self,
+        run: Callable[[], Awaitable],
+        characters: int,
+        priority: int = PRIORITY_TODAY,
+        name: str = ""
+    ) -> TTSJob:
+        """Queue a job; run is called once the job is admitted"""
+        self._bind_loop()
+        job = TTSJob(name, priority, characters, run)
+        job.future.add_done_callback(lambda _: self._on_job_done(job))
+        self._push(job, next(self._counter))
+        logger.info(f"TTS job {name or '?'} queued: {characters} characters, priority {priority}")
+        return job
+
+    def pending(self) -> List[TTSJob]:
+        """Queued and parked jobs in the order they will run"""
+        self._bind_loop()
+        return [job for _, _, job in sorted(self._queue) if not job.done()]
+
+    def _push(self, job: TTSJob, seq: int) -> None:
+        heapq.heappush(self._queue, (job.priority, seq, job))
+        self._wakeup.set()
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while True:
+            self._wakeup.clear()
+            while self._queue and self._queue[0][2].done():
+                heapq.heappop(self._queue)
+            if not self._queue:
+                return
+
+            priority, seq, job = self._queue[0]
+            if len(self._running) >= self.max_running:
+                await self._wait(None)
+                continue
+
+            if not self.quota.fits_plan(job.characters):
+                heapq.heappop(self._queue)
+                job.future.set_exception(QuotaExceededError(
+                    f"Job needs {job.characters} characters, plan allows {self.quota.character_limit}"
+                ))
+                continue
+
+            if not self.quota.reserve(job.characters):
+                delay = self.quota.wait_seconds(self.DEFAULT_PARK_SECONDS)
+                if job.status != "parked":
+                    job.status = "parked"
+                    logger.warning(
+                        f"TTS job {job.name or '?'} parked for {delay:.0f}s: "
+                        f"{job.characters} characters needed, {self.quota.remaining} remaining"
+                    )
+                await self._wait(delay)
+                await self._refresh()
+                continue
+
+            heapq.heappop(self._queue)
+            job.status = "running"
+            job.started.set()
+            job.attempts += 1
+            self._running[job] = job.context.run(asyncio.create_task, self._run(job, seq))
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _refresh(self) -> None:
+        if self.refresh is None:
+            return
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Quota refresh failed: {e}")
+
+    async def _run(self, job: TTSJob, seq: int) -> None:
+        try:
+            result = await job.run()
+        except QuotaExceededError as e:
+            self.quota.exhaust(e.reset_at)
+            if not job.done():
+                job.status = "parked"
+                job.started.clear()
+                self._push(job, seq)
+        except asyncio.CancelledError:
+            job.cancel()
+        except Exception as e:
+            job.status = "failed"
+            if not job.done():
+                job.future.set_exception(e)
+        else:
+            job.status = "done"
+            if not job.done():
+                job.future.set_result(result)
+        finally:
+            self.quota.release(job.characters)
+            self._running.pop(job, None)
+            self._wakeup.set()
+
+    def _on_job_done(self, job: TTSJob) -> None:
+        if job.future.cancelled():
+            job.status = "cancelled"
+            task = self._running.get(job)
+            if task is not None:
+                task.cancel()
+        self._wakeup.set()
+
+
+_scheduler: Optional[TTSScheduler] = None
+
+
+def get_tts_scheduler() -> TTSScheduler:
+    """Process-wide scheduler sharing one view of the quota"""
+    global _scheduler
+    if _scheduler is None:
+        from src.audio.tts import TTSService
+        quota = QuotaTracker()
+        _scheduler = TTSScheduler(quota, refresh=TTSService(quota_tracker=quota).refresh_quota)
+    return _scheduler
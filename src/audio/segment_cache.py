@@ -0,0 +1,149 @@
+"""
+TTS Segment Cache
+Content-addressed cache of synthesized sentence audio
+"""
+
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+_WHITESPACE = re.compile(r"\s+")
+_QUOTES = str.maketrans({"«": '"', "»": '"', "“": '"', "”": '"', "„": '"', "’": "'", "–": "—"})
+
+
+def normalize_sentence(text: str) -> str:
+    """Normalise text that would be voiced identically"""
+    text = unicodedata.normalize("NFC", text).translate(_QUOTES)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def segment_key(text: str, voice_id: str, model_id: str, voice_settings: dict, output_format: str) -> str:
+    """Content address of a synthesized segment"""
+    material = json.dumps(
+        [normalize_sentence(text), voice_id, model_id, voice_settings, output_format],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class SegmentCache:
+    """LRU cache of segment audio bounded by total bytes
+
+    Entries live in memory; when persistent, they are also written to the
+    storage backend under PREFIX so they survive restarts. max_bytes bounds
+    memory only: stored entries expire through the bucket lifecycle rule in
+    scripts/storage_lifecycle.json. Thread-safe, since storage access
+    happens in worker threads.
+    """
+
+    PREFIX = "cache/tts/"
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, persistent: bool = False):
+        self.max_bytes = max_bytes
+        self.persistent = persistent
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._storage = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.characters_saved = 0
+        self.characters_synthesized = 0
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from src.storage.s3_client import get_storage
+            self._storage = get_storage()
+        return self._storage
+
+    def get(self, key: str, characters: int = 0) -> Optional[bytes]:
+        """Return cached audio, counting a hit or miss"""
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+
+        if audio is None and self.persistent:
+            audio = self._load(key)
+            if audio is not None:
+                self._remember(key, audio)
+
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.characters_saved += characters
+        return audio
+
+    def put(self, key: str, audio: bytes, characters: int = 0) -> None:
+        """Store freshly synthesized audio"""
+        self._remember(key, audio)
+        with self._lock:
+            self.characters_synthesized += characters
+        if self.persistent:
+            self.storage.upload_bytes(audio, f"{self.PREFIX}{key}.mp3", "audio/mpeg")
+
+    def _load(self, key: str) -> Optional[bytes]:
+        try:
+            return self.storage.download_bytes(f"{self.PREFIX}{key}.mp3")
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A broken backing store only costs a re-synthesis
+            return None
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = audio
+            self._size += len(audio)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """Cache statistics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hit_ratio, 4),
+                "evictions": self.evictions,
+                "characters_saved": self.characters_saved,
+                "characters_synthesized": self.characters_synthesized,
+            }
+
+
+_segment_cache: Optional[SegmentCache] = None
+
+
+def get_segment_cache() -> SegmentCache:
+    """Process-wide segment cache, persisted through the storage layer unless disabled"""
+    global _segment_cache
+    if _segment_cache is None:
+        from src.common.config import get_settings
+        settings = get_settings()
+        _segment_cache = SegmentCache(settings.tts_cache_max_bytes, persistent=settings.tts_cache_persistent)
+    return _segment_cache
@@ -4,11 +4,34 @@ Integrates with ElevenLabs API
 """
 
 import asyncio
+import copy
+import logging
+import math
+import os
+import httpx
 import requests
-from typing import Optional
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from src.audio import mp3
+from src.audio.scheduler import QuotaExceededError, QuotaTracker, parse_character_cost, parse_reset
+from src.audio.chunking import split_sentences, split_text
+from src.audio.renditions import RenditionSpec, bitrate_of, rendition_object_name
+from src.audio.segment_cache import SegmentCache, segment_key
 from src.common.config import get_settings
+from src.common.ratelimit import get_rate_limiter
+from src.common.retry import RETRYABLE_STATUS, RetryableError, RetryPolicy, parse_retry_after, remaining_timeout
+from src.common.tracing import span
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AudioUpload:
+    """Audio streamed into storage, measured on the fly"""
+    url: str
+    size_bytes: int
+    duration_seconds: float
 
 
 class TTSService:
@@ -16,12 +39,42 @@ class TTSService:
 
     # ElevenLabs API configuration
     API_URL = "https://api.elevenlabs.io/v1/text-to-speech"
+    SUBSCRIPTION_URL = "https://api.elevenlabs.io/v1/user/subscription"
     RUSSIAN_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice (multilingual)
+    MODEL_ID = "eleven_multilingual_v2"
+    VOICE_SETTINGS = {
+        "stability": 0.7,
+        "similarity_boost": 0.8,
+        "style": 0.5,
+        "use_speaker_boost": True
+    }
     MAX_TEXT_LENGTH = 5000
+    MIN_CHUNK_LENGTH = 500
+    CONTEXT_LENGTH = 300  # chars of neighbouring text sent for prosody
     MAX_RETRIES = 3
+    REQUEST_TIMEOUT = 30
+    OUTPUT_FORMAT = "mp3_44100_128"
+    STREAM_BLOCK_SIZE = 64 * 1024
+    STREAM_QUEUE_BLOCKS = 4
 
-    def __init__(self):
+    def __init__(
+        self,
+        segment_cache: Optional[SegmentCache] = None,
+        quota_tracker: Optional[QuotaTracker] = None
+    ):
+        settings = get_settings()
         self.api_key = settings.elevenlabs_api_key
+        self.max_concurrency = settings.elevenlabs_max_concurrency
+        self.segment_cache = segment_cache
+        self.quota_tracker = quota_tracker
+        self.output_format = self.OUTPUT_FORMAT
+        self.retry_policy = RetryPolicy(
+            "elevenlabs",
+            max_attempts=self.MAX_RETRIES,
+            base_delay=1.0,
+            max_delay=8.0,
+            attempt_timeout=self.REQUEST_TIMEOUT * 2
+        )
 
     async def synthesize(self, text: str) -> bytes:
         """Generate audio from text using ElevenLabs API"""
@@ -35,27 +88,152 @@ class TTSService:
         # Make API request with retry logic
         return await self._synthesize_with_retry(text)
 
-    async def _synthesize_with_retry(self, text: str, attempt: int = 0) -> bytes:
-        """Execute synthesis with exponential backoff retry"""
-        try:
-            return await self._make_api_call(text)
-        except (requests.exceptions.RequestException, Exception) as e:
-            # Check if we should retry
-            error_msg = str(e)
-            is_503 = "503" in error_msg or "Service unavailable" in error_msg
-
-            if is_503 and attempt < self.MAX_RETRIES - 1:
-                # Exponential backoff: 1s, 2s, 4s
-                delay = 2 ** attempt
-                await asyncio.sleep(delay)
-                return await self._synthesize_with_retry(text, attempt + 1)
-            elif attempt >= self.MAX_RETRIES - 1:
-                raise Exception(f"Max retries exceeded: {error_msg}")
-            else:
-                raise
+    async def synthesize_script(self, text: str) -> bytes:
+        """Generate audio for a script of any length
+
+        The script is split at paragraph/sentence boundaries and chunks are
+        synthesized concurrently, bounded by the API concurrency quota.
+        Chunks are sized so that there is work for every allowed worker.
+        With a segment cache, only sentences not already cached are sent.
+        """
+        if not text or len(text.strip()) == 0:
+            raise ValueError("Text cannot be empty")
+
+        segments = self.plan_segments(text)
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+
+        parts = await asyncio.gather(*(
+            self._segment_audio(segments, i, semaphore) for i in range(len(segments))
+        ))
+        self._log_cache_stats()
+        return mp3.concat(parts)
+
+    def plan_segments(self, text: str) -> List[str]:
+        """Sentences when caching (the unit of re-use), otherwise sized chunks
+
+        Sentence segments mean one API request per uncached sentence rather
+        than one per concurrency-sized chunk. Requests still run
+        max_concurrency at a time, so throughput is kept; the cost is more,
+        smaller requests on a cold cache in exchange for re-using every
+        sentence that repeats across episodes and re-runs.
+        """
+        if self.segment_cache is None:
+            return self.plan_chunks(text)
+
+        segments = []
+        for sentence in split_sentences(text):
+            segments.extend(split_text(sentence, self.MAX_TEXT_LENGTH))
+        return segments
+
+    async def _segment_audio(self, segments: List[str], index: int, semaphore: asyncio.Semaphore) -> bytes:
+        """Audio for one segment, from the cache when possible"""
+        text = segments[index]
+        key = None
+        if self.segment_cache is not None:
+            key = segment_key(text, self.RUSSIAN_VOICE_ID, self.MODEL_ID, self.VOICE_SETTINGS, self.output_format)
+            audio = await asyncio.to_thread(self.segment_cache.get, key, len(text))
+            if audio is not None:
+                return audio
+
+        previous_text = segments[index - 1][-self.CONTEXT_LENGTH:] if index > 0 else None
+        next_text = segments[index + 1][:self.CONTEXT_LENGTH] if index + 1 < len(segments) else None
+        async with semaphore:
+            audio = await self._synthesize_with_retry(text, previous_text=previous_text, next_text=next_text)
+
+        if key is not None:
+            await asyncio.to_thread(self.segment_cache.put, key, audio, len(text))
+        return audio
+
+    def _log_cache_stats(self):
+        if self.segment_cache is not None:
+            stats = self.segment_cache.stats()
+            logger.info(
+                f"TTS cache: hit ratio {stats['hit_ratio']:.0%}, "
+                f"{stats['characters_saved']} characters saved"
+            )
+
+    def plan_chunks(self, text: str) -> List[str]:
+        """Split text into chunks sized for the allowed concurrency"""
+        workers = max(self.max_concurrency, 1)
+        target = math.ceil(len(text) / workers)
+        max_length = min(self.MAX_TEXT_LENGTH, max(target, self.MIN_CHUNK_LENGTH))
+        return split_text(text, max_length)
 
-    async def _make_api_call(self, text: str) -> bytes:
+    async def _synthesize_with_retry(
+        self,
+        text: str,
+        previous_text: Optional[str] = None,
+        next_text: Optional[str] = None
+    ) -> bytes:
+        """Execute synthesis under the retry policy (transient errors only)"""
+        return await self.retry_policy.call(
+            self._make_api_call, text, previous_text=previous_text, next_text=next_text
+        )
+
+    async def _make_api_call(
+        self,
+        text: str,
+        previous_text: Optional[str] = None,
+        next_text: Optional[str] = None
+    ) -> bytes:
         """Make the actual API call to ElevenLabs"""
+        url, headers, payload = self._build_request(text, previous_text, next_text)
+        await get_rate_limiter("tts_characters").acquire(len(text))
+
+        with span("tts.chunk") as log:
+            # Make synchronous request (will run in executor)
+            response = await asyncio.to_thread(
+                requests.post, url, json=payload, headers=headers,
+                params={"output_format": self.output_format}, timeout=remaining_timeout(self.REQUEST_TIMEOUT)
+            )
+
+            # Handle specific error codes
+            self._check_status(response)
+            response.raise_for_status()
+            log.bytes = len(response.content)
+        self._record_usage(response.headers)
+        return response.content
+
+    def _check_status(self, response):
+        """Raise typed errors for quota exhaustion and transient failures
+
+        ElevenLabs also answers 429 for concurrency and rate limits
+        (too_many_concurrent_requests, system_busy); only quota_exceeded
+        means the characters are used up, the rest are retried.
+        """
+        if response.status_code == 429 and self._error_code(response) == "quota_exceeded":
+            quota_reset = response.headers.get('X-RateLimit-Reset', 'unknown')
+            raise QuotaExceededError(f"Quota exceeded. Reset at: {quota_reset}", reset_at=parse_reset(quota_reset))
+
+        if response.status_code in RETRYABLE_STATUS:
+            reason = self._error_code(response) if response.status_code == 429 else None
+            raise RetryableError(
+                f"Service unavailable: {response.status_code}" + (f" ({reason})" if reason else ""),
+                retry_after=parse_retry_after(response.headers.get('Retry-After'))
+            )
+
+    @staticmethod
+    def _error_code(response) -> Optional[str]:
+        """detail.status of an ElevenLabs error body, if any"""
+        try:
+            detail = response.json().get("detail")
+        except Exception:
+            return None
+        return detail.get("status") if isinstance(detail, dict) else None
+
+    def _record_usage(self, headers):
+        if self.quota_tracker is not None:
+            characters = parse_character_cost(headers)
+            if characters is not None:
+                self.quota_tracker.record_usage(characters)
+
+    def _build_request(
+        self,
+        text: str,
+        previous_text: Optional[str] = None,
+        next_text: Optional[str] = None
+    ) -> Tuple[str, dict, dict]:
+        """Build URL, headers and JSON payload for a synthesis request"""
         url = f"{self.API_URL}/{self.RUSSIAN_VOICE_ID}"
 
         headers = {
@@ -66,34 +244,255 @@ class TTSService:
 
         payload = {
             "text": text,
-            "model_id": "eleven_multilingual_v2",
-            "voice_settings": {
-                "stability": 0.7,
-                "similarity_boost": 0.8,
-                "style": 0.5,
-                "use_speaker_boost": True
-            }
+            "model_id": self.MODEL_ID,
+            "voice_settings": dict(self.VOICE_SETTINGS)
         }
 
-        # Make synchronous request (will run in executor)
-        response = await asyncio.to_thread(
-            requests.post, url, json=payload, headers=headers, timeout=30
+        # Neighbouring text keeps intonation continuous across chunk boundaries
+        if previous_text:
+            payload["previous_text"] = previous_text
+        if next_text:
+            payload["next_text"] = next_text
+
+        return url, headers, payload
+
+    async def stream_audio(self, text: str) -> AsyncIterator[bytes]:
+        """Stream audio for a script of any length
+
+        Segments are resolved through an ordered look-ahead window bounded
+        by the API concurrency: the segment being written streams straight
+        through, and only the segments ahead of it are buffered. With a
+        segment cache, cached sentences are spliced in without API calls.
+        Segments are spliced gaplessly (see mp3.Mp3Splicer).
+        """
+        if not text or len(text.strip()) == 0:
+            raise ValueError("Text cannot be empty")
+
+        segments = self.plan_segments(text)
+        splicer = mp3.Mp3Splicer()
+        async for index, audio in self._stream_segments(segments):
+            if audio is None:
+                audio = splicer.end_segment(last=index == len(segments) - 1)
+            else:
+                audio = splicer.feed(audio)
+            if audio:
+                yield audio
+        self._log_cache_stats()
+
+    async def _stream_segments(self, segments: List[str]) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+        """Yield (index, audio) in segment order, then (index, None) at each segment's end"""
+        workers = max(self.max_concurrency, 1)
+        semaphore = asyncio.Semaphore(workers)
+        # Cached sentences are small, so look further ahead for cache hits
+        window = workers * 2 if self.segment_cache is not None else workers
+        pending: deque = deque()
+        next_index = 0
+        try:
+            while pending or next_index < len(segments):
+                while next_index < len(segments) and len(pending) < window:
+                    queue: asyncio.Queue = asyncio.Queue()
+                    task = asyncio.create_task(self._produce_segment(segments, next_index, semaphore, queue))
+                    pending.append((next_index, task, queue))
+                    next_index += 1
+
+                index, task, queue = pending[0]
+                while True:
+                    item = await queue.get()
+                    if isinstance(item, BaseException):
+                        raise item
+                    yield index, item
+                    if item is None:
+                        break
+                pending.popleft()
+        finally:
+            for _, task, _ in pending:
+                task.cancel()
+
+    async def _produce_segment(
+        self,
+        segments: List[str],
+        index: int,
+        semaphore: asyncio.Semaphore,
+        queue: asyncio.Queue
+    ) -> None:
+        """Put one segment's audio on the queue as it arrives, then None (or the error)"""
+        try:
+            if self.segment_cache is not None:
+                queue.put_nowait(await self._segment_audio(segments, index, semaphore))
+            else:
+                previous_text = segments[index - 1][-self.CONTEXT_LENGTH:] if index > 0 else None
+                next_text = segments[index + 1][:self.CONTEXT_LENGTH] if index + 1 < len(segments) else None
+                async with semaphore:
+                    async for data in self._stream_api_call(segments[index], previous_text, next_text):
+                        queue.put_nowait(data)
+            queue.put_nowait(None)
+        except Exception as e:
+            queue.put_nowait(e)
+
+    async def _stream_api_call(
+        self,
+        text: str,
+        previous_text: Optional[str] = None,
+        next_text: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Call the ElevenLabs streaming endpoint
+
+        Retries are only safe before the first audio byte has been yielded.
+        """
+        url, headers, payload = self._build_request(text, previous_text, next_text)
+        url = f"{url}/stream"
+
+        deadline = self.retry_policy.start()
+        async with httpx.AsyncClient(timeout=remaining_timeout(self.REQUEST_TIMEOUT)) as client:
+            attempt = 0
+            while True:
+                started = False
+                try:
+                    await get_rate_limiter("tts_characters").acquire(len(text))
+                    with span("tts.chunk") as log:
+                        log.bytes = 0
+                        async with client.stream(
+                            "POST", url, json=payload, headers=headers,
+                            params={"output_format": self.output_format}
+                        ) as response:
+                            if response.status_code == 429:
+                                await response.aread()  # the error body tells quota from rate limits
+                            self._check_status(response)
+                            response.raise_for_status()
+                            self._record_usage(response.headers)
+                            async for data in response.aiter_bytes(self.STREAM_BLOCK_SIZE):
+                                started = True
+                                log.bytes += len(data)
+                                yield data
+                    return
+                except Exception as e:
+                    if started:
+                        raise
+                    await self.retry_policy.pause(e, attempt, deadline)
+                    attempt += 1
+
+    async def stream_to_storage(self, text: str, object_name: str, storage=None) -> AudioUpload:
+        """Stream synthesized audio straight into storage
+
+        Memory is bounded by a small queue of blocks plus the storage
+        writer's own buffer (one multipart part on S3). Size and duration
+        are measured frame by frame while the bytes pass through.
+        """
+        from src.storage.s3_client import get_storage
+
+        storage = storage or get_storage()
+        writer = await asyncio.to_thread(storage.open_writer, object_name, "audio/mpeg")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.STREAM_QUEUE_BLOCKS)
+        write_errors: List[Exception] = []
+
+        async def consume():
+            # Keep draining after a failure so the producer never blocks
+            while True:
+                block = await queue.get()
+                if block is None:
+                    return
+                if not write_errors:
+                    try:
+                        await asyncio.to_thread(writer.write, block)
+                    except Exception as e:
+                        write_errors.append(e)
+
+        consumer = asyncio.create_task(consume())
+        meter = mp3.Mp3StreamMeter()
+        try:
+            buffer = bytearray()
+            async for data in self.stream_audio(text):
+                buffer.extend(data)
+                meter.feed(data)
+                if len(buffer) >= self.STREAM_BLOCK_SIZE:
+                    await queue.put(bytes(buffer))
+                    buffer.clear()
+                if write_errors:
+                    raise write_errors[0]
+
+            if buffer:
+                await queue.put(bytes(buffer))
+            await queue.put(None)
+            await consumer
+            if write_errors:
+                raise write_errors[0]
+
+            url = await asyncio.to_thread(writer.close)
+        except BaseException:
+            # Let an in-flight write finish before aborting the upload
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+            await asyncio.gather(consumer, return_exceptions=True)
+            await asyncio.to_thread(writer.abort)
+            raise
+
+        duration = meter.duration_seconds
+        if not meter.frame_count:
+            # Not parseable as MP3 frames: fall back to the nominal CBR bitrate
+            duration = meter.size_bytes * 8 / (bitrate_of(self.output_format) * 1000)
+        return AudioUpload(url=url, size_bytes=meter.size_bytes, duration_seconds=duration)
+
+    def with_output_format(self, output_format: str) -> "TTSService":
+        """Same voice and cache, different encoding"""
+        service = copy.copy(self)
+        service.output_format = output_format
+        return service
+
+    async def stream_renditions(
+        self,
+        text: str,
+        episode_id: str,
+        renditions: List[RenditionSpec],
+        storage=None
+    ) -> Dict[str, AudioUpload]:
+        """Stream every rendition into storage concurrently
+
+        The first rendition is primary: if it fails, the whole call fails.
+        Other renditions are best effort and missing ones are only logged.
+        Each rendition is billed separately by the provider, so the API
+        concurrency is split between them.
+        """
+        workers = max(self.max_concurrency // len(renditions), 1)
+
+        async def stream(spec: RenditionSpec, primary: bool) -> AudioUpload:
+            service = self.with_output_format(spec.output_format)
+            service.max_concurrency = workers
+            return await service.stream_to_storage(
+                text, rendition_object_name(episode_id, spec, primary), storage=storage
+            )
+
+        results = await asyncio.gather(
+            *(stream(spec, i == 0) for i, spec in enumerate(renditions)),
+            return_exceptions=True
         )
+        if isinstance(results[0], BaseException):
+            raise results[0]
 
-        # Handle specific error codes
-        if response.status_code == 429:
-            quota_reset = response.headers.get('X-RateLimit-Reset', 'unknown')
-            raise Exception(f"Quota exceeded. Reset at: {quota_reset}")
+        uploads = {}
+        for spec, result in zip(renditions, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Rendition {spec.name} ({spec.output_format}) failed: {result}")
+            else:
+                uploads[spec.name] = result
+        return uploads
 
-        if response.status_code == 503:
-            raise requests.exceptions.RequestException(f"Service unavailable: {response.status_code}")
+    def check_quota(self, characters: int = 0) -> bool:
+        """Check if API quota is available for the given number of characters"""
+        if self.quota_tracker is None:
+            return True
+        return self.quota_tracker.available(characters)
 
+    async def refresh_quota(self) -> dict:
+        """Fetch subscription usage and update the quota tracker"""
+        response = await asyncio.to_thread(
+            requests.get, self.SUBSCRIPTION_URL, headers={"xi-api-key": self.api_key}, timeout=10
+        )
         response.raise_for_status()
-        return response.content
-
-    def check_quota(self) -> bool:
-        """Check if API quota is available (placeholder)"""
-        return True
+        data = response.json()
+        if self.quota_tracker is not None:
+            self.quota_tracker.update_from_subscription(data)
+        return data
 
     async def save_audio(self, audio_bytes: bytes, filename: str) -> str:
         """Save audio to file and upload to S3"""
@@ -102,11 +501,13 @@ class TTSService:
         storage = get_storage()
         audio_path = f"audio/{filename}"
 
-        # Save locally first
         local_path = f"data/audio/{filename}"
-        with open(local_path, 'wb') as f:
-            f.write(audio_bytes)
 
-        # Upload to S3
-        url = await storage.upload_file(local_path, audio_path)
-        return url
+        def save_and_upload() -> str:
+            # Save locally first, then upload (file and storage I/O are synchronous)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, 'wb') as f:
+                f.write(audio_bytes)
+            return storage.upload_file(local_path, audio_path)
+
+        return await asyncio.to_thread(save_and_upload)
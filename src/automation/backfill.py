@@ -0,0 +1,150 @@
+"""
+Episode Backfill
+Generates episodes for a range of dates concurrently, with progress and a throughput report
+
+Usage:
+  python -m src.automation.backfill --from 2026-01-01 --to 2026-01-07 --concurrency 3
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import AsyncIterator, List, Optional
+
+from src.common.ratelimit import rate_limit_metrics
+from src.common.retry import retry_metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillResult:
+    """Outcome of one date"""
+    target_date: date
+    status: str  # completed|script_only|failed
+    seconds: float
+    audio_seconds: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class BackfillReport:
+    """Throughput of a backfill run"""
+    results: List[BackfillResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    @property
+    def episodes_per_hour(self) -> float:
+        done = len(self.results) - self.count("failed")
+        return done * 3600 / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        audio_minutes = sum(r.audio_seconds for r in self.results) / 60
+        lines = [
+            f"Dates: {len(self.results)} ({self.count('completed')} completed, "
+            f"{self.count('script_only')} script only, {self.count('failed')} failed)",
+            f"Elapsed: {self.elapsed:.1f}s, {self.episodes_per_hour:.1f} episodes/hour, "
+            f"{audio_minutes:.1f} min of audio",
+        ]
+        if self.results:
+            slowest = max(self.results, key=lambda r: r.seconds)
+            lines.append(f"Slowest: {slowest.target_date} in {slowest.seconds:.1f}s")
+        for name, stats in rate_limit_metrics().items():
+            lines.append(f"Rate limit {name}: {stats['acquired']:.0f} used, {stats['waited_seconds']:.1f}s waited")
+        for name, stats in retry_metrics().items():
+            lines.append(f"Retries {name}: {stats['retries']} retries over {stats['calls']} calls, {stats['failures']} failed")
+        return "\n".join(lines)
+
+
+def date_range(start: date, end: date) -> List[date]:
+    """Dates from start to end inclusive, newest first so recent gaps are filled first"""
+    if end < start:
+        raise ValueError("End date is before start date")
+    return [end - timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class Backfill:
+    """Runs one shared pipeline over many dates
+
+    Sharing the pipeline shares its news page cache, TTS segment cache and
+    quota scheduler between dates; provider rate limits are process-wide.
+    Backfilled dates are queued for TTS behind today's episode.
+    """
+
+    def __init__(self, start: date, end: date, concurrency: int = 3, resume: bool = True, pipeline=None):
+        self.dates = date_range(start, end)
+        self.concurrency = max(concurrency, 1)
+        self.resume = resume
+        if pipeline is None:
+            from src.automation.pipeline import EpisodePipeline
+            pipeline = EpisodePipeline()
+        self.pipeline = pipeline
+
+    async def stream(self) -> AsyncIterator[BackfillResult]:
+        """Yield each date's result as soon as it finishes"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(target_date: date) -> BackfillResult:
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    episode = await self.pipeline.generate_episode(target_date, resume=self.resume)
+                except Exception as e:
+                    return BackfillResult(target_date, "failed", time.monotonic() - started, error=str(e))
+                return BackfillResult(
+                    target_date, episode.status, time.monotonic() - started,
+                    audio_seconds=episode.audio_duration_seconds or 0
+                )
+
+        tasks = [asyncio.create_task(run(d)) for d in self.dates]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run(self, on_result=None) -> BackfillReport:
+        """Run every date, calling on_result(result, done, total) as each finishes"""
+        report = BackfillReport()
+        started = time.monotonic()
+        async for result in self.stream():
+            report.results.append(result)
+            if on_result is not None:
+                on_result(result, len(report.results), len(self.dates))
+        report.elapsed = time.monotonic() - started
+        return report
+
+
+def print_progress(result: BackfillResult, done: int, total: int) -> None:
+    line = f"[{done}/{total}] {result.target_date} {result.status} in {result.seconds:.1f}s"
+    if result.error:
+        line += f": {result.error}"
+    print(line, flush=True)
+
+
+# CLI
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate episodes for a range of dates")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, default=date.today() - timedelta(days=1))
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--fresh", action="store_true", help="ignore checkpoints of earlier runs")
+    args = parser.parse_args()
+
+    from src.common.config import get_settings
+    from src.common.logs import configure_logging, shutdown_logging
+
+    configure_logging("WARNING", get_settings().log_dir, get_settings().log_json)
+    backfill = Backfill(args.start, args.end, args.concurrency, resume=not args.fresh)
+    try:
+        print(asyncio.run(backfill.run(print_progress)).summary())
+    finally:
+        shutdown_logging()
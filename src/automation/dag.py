@@ -0,0 +1,246 @@
+"""
+Pipeline DAG Executor
+Runs stage nodes as soon as their inputs are ready and reports the critical path
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+from src.common.retry import deadline_scope
+from src.common.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimeoutError(asyncio.TimeoutError):
+    """A node ran past its own deadline or the run's"""
+    pass
+
+
+@dataclass
+class NodeStats:
+    """Counters for one node name across runs"""
+    runs: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+_stats: Dict[str, NodeStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name: str, timing: "NodeTiming") -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(name, NodeStats())
+        stats.runs += 1
+        setattr(stats, timing.status, getattr(stats, timing.status) + 1)
+        stats.seconds += timing.duration
+        stats.max_seconds = max(stats.max_seconds, timing.duration)
+
+
+def node_metrics() -> Dict[str, dict]:
+    """Snapshot of run, failure and timeout counters per node"""
+    with _stats_lock:
+        return {name: dict(vars(stats)) for name, stats in _stats.items()}
+
+
+class Channel:
+    """Stream of items from a streaming node to its consumers
+
+    Every consumer sees every item from the start, so a consumer that starts
+    late does not miss anything.
+    """
+
+    def __init__(self):
+        self._items: List[Any] = []
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._condition = asyncio.Condition()
+
+    async def put(self, item: Any) -> None:
+        async with self._condition:
+            self._items.append(item)
+            self._condition.notify_all()
+
+    async def close(self, error: Optional[BaseException] = None) -> None:
+        """End the stream; consumers re-raise error after the last item"""
+        async with self._condition:
+            self._closed = True
+            self._error = error
+            self._condition.notify_all()
+
+    async def __aiter__(self):
+        index = 0
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: index < len(self._items) or self._closed)
+                if index < len(self._items):
+                    item = self._items[index]
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            index += 1
+            yield item
+
+
+@dataclass
+class Node:
+    """A stage with named inputs; run receives each input's result as a keyword argument
+
+    A streaming node also receives a Channel as its first argument, and its
+    consumers start as soon as it starts, reading the channel. An optional
+    node's failure is logged and passed on as a None result. A node with a
+    timeout runs inside a deadline_scope of that many seconds and is
+    cancelled when it (or the enclosing deadline) runs out.
+    """
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    inputs: Sequence[str] = ()
+    optional: bool = False
+    streaming: bool = False
+    timeout: Optional[float] = None
+
+
+@dataclass
+class NodeTiming:
+    """Start and finish of a node, in seconds from the start of the run"""
+    started: float
+    finished: float
+    status: str = "completed"  # completed|failed|timed_out|cancelled
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+@dataclass
+class DagRun:
+    """Results and timings of one execution"""
+    dag: "Dag"
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, NodeTiming] = field(default_factory=dict)
+
+    @property
+    def elapsed(self) -> float:
+        return max((t.finished for t in self.timings.values()), default=0.0)
+
+    def critical_path(self) -> List[str]:
+        """Chain of nodes that determined the run's duration, first to last
+
+        Starting from the node that finished last, each step goes back to the
+        input that finished last, i.e. the one the node was waiting on.
+        """
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n].finished)
+        path = [name]
+        while True:
+            inputs = [i for i in self.dag.nodes[name].inputs if i in self.timings]
+            if not inputs:
+                break
+            name = max(inputs, key=lambda n: self.timings[n].finished)
+            path.append(name)
+        return path[::-1]
+
+    def describe_critical_path(self) -> str:
+        steps = " → ".join(f"{n} {self.timings[n].duration:.1f}s" for n in self.critical_path())
+        return f"{steps} (total {self.elapsed:.1f}s)"
+
+
+class Dag:
+    """A validated set of nodes, executable any number of times"""
+
+    def __init__(self, nodes: Iterable[Node]):
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate node: {node.name}")
+            self.nodes[node.name] = node
+        for node in self.nodes.values():
+            for name in node.inputs:
+                if name not in self.nodes:
+                    raise ValueError(f"Node {node.name} depends on unknown node {name}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        pending = {name: set(node.inputs) for name, node in self.nodes.items()}
+        order = []
+        while pending:
+            ready = [name for name, inputs in pending.items() if not inputs]
+            if not ready:
+                raise ValueError(f"Cycle between nodes: {', '.join(sorted(pending))}")
+            for name in ready:
+                del pending[name]
+                order.append(name)
+            for inputs in pending.values():
+                inputs.difference_update(ready)
+        return order
+
+    async def run(self) -> DagRun:
+        """Run every node once its inputs are available
+
+        The first failure of a required node cancels the rest and is raised.
+        """
+        loop = asyncio.get_running_loop()
+        ready = {name: loop.create_future() for name in self.nodes}
+        result = DagRun(self)
+        origin = time.monotonic()
+
+        async def execute(node: Node) -> None:
+            kwargs = {name: await ready[name] for name in node.inputs}
+            started = time.monotonic() - origin
+            status = "cancelled"
+            channel = Channel() if node.streaming else None
+            try:
+                with span(node.name, kind="stage"), deadline_scope(node.timeout) as deadline:
+                    if channel is not None:
+                        ready[node.name].set_result(channel)
+                        await self._bounded(node, node.run(channel, **kwargs), deadline)
+                        await channel.close()
+                        value = channel
+                    else:
+                        value = await self._bounded(node, node.run(**kwargs), deadline)
+                status = "completed"
+            except Exception as e:
+                status = "timed_out" if isinstance(e, StageTimeoutError) else "failed"
+                if channel is not None:
+                    await channel.close(e)
+                if not node.optional:
+                    raise
+                logger.warning(f"Optional stage {node.name} failed: {e}")
+                value = None
+            finally:
+                result.timings[node.name] = NodeTiming(started, time.monotonic() - origin, status)
+                _record(node.name, result.timings[node.name])
+            result.results[node.name] = value
+            if not ready[node.name].done():
+                ready[node.name].set_result(value)
+
+        tasks = [asyncio.create_task(execute(self.nodes[name])) for name in self.order]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return result
+
+    @staticmethod
+    async def _bounded(node: Node, coro: Awaitable[Any], deadline) -> Any:
+        """Await coro, cancelling it when the deadline passes"""
+        try:
+            return await asyncio.wait_for(coro, timeout=deadline.remaining())
+        except asyncio.TimeoutError as e:
+            if deadline.expired:
+                raise StageTimeoutError(f"Stage {node.name} ran out of time") from e
+            raise
@@ -0,0 +1,240 @@
+"""
+Generation Job Queue
+In-process queue and worker pool behind POST /api/automation/generate
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from src.automation.singleflight import PROCESS_ID
+from src.common.config import get_settings
+from src.db.jobs import get_job_repository
+from src.models.episode import Episode, GenerationJob
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = ("queued", "running")
+HISTORY = 100  # finished jobs kept in memory; older ones are read back from the DB
+
+
+class JobOwnedElsewhereError(Exception):
+    """The job is queued or running on another live replica"""
+    pass
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class JobQueue:
+    """Runs generation jobs on a fixed number of workers
+
+    submit() only touches memory, so enqueueing takes microseconds however
+    long the pipeline runs; job records are written to the DB in the
+    background, in order per job.
+
+    Each replica stamps its jobs with its owner id and refreshes their
+    heartbeat_at every heartbeat_seconds. A queued or running job whose
+    heartbeat is older than three intervals belongs to a replica that
+    stopped, and is failed by whichever replica notices first.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[date, bool], Awaitable[Episode]],
+        repository=None,
+        workers: int = 1,
+        heartbeat_seconds: float = 10.0
+    ):
+        self.run = run
+        self.repository = repository or get_job_repository()
+        self.workers = max(workers, 1)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.owner = f"{PROCESS_ID}:{uuid.uuid4().hex[:8]}"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._jobs: Dict[str, GenerationJob] = {}
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Queue and workers are per event loop; jobs of a previous loop are abandoned
+            self._loop = loop
+            self._queue: asyncio.Queue = asyncio.Queue()
+            self._running: Dict[str, asyncio.Task] = {}
+            self._writes: Dict[str, asyncio.Task] = {}
+            self._background: Set[asyncio.Task] = set()
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            for job in self._jobs.values():
+                if job.status in ACTIVE:
+                    job.status = "failed"
+                    job.error_message = "Abandoned"
+                    self._persist(job)
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def _heartbeat(self) -> None:
+        """Refresh our active jobs, then fail other replicas' jobs whose heartbeat expired"""
+        while True:
+            now = datetime.now(timezone.utc)
+            for job in self._jobs.values():
+                if job.status in ACTIVE:
+                    job.heartbeat_at = now
+                    self._persist(job)
+            try:
+                jobs = await asyncio.to_thread(self.repository.list_active)
+            except Exception as e:
+                logger.error(f"Failed to load unfinished jobs: {e}")
+                jobs = []
+            for job in jobs:
+                if job.job_id not in self._jobs and self._expired(job):
+                    logger.warning(f"Job {job.job_id} of {job.owner or 'unknown owner'} stopped heartbeating")
+                    self._finish(job, "failed", "Abandoned")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    def _expired(self, job: GenerationJob) -> bool:
+        """Whether the replica that owns a job stopped refreshing it"""
+        last_seen = _utc(job.heartbeat_at or job.started_at or job.created_at)
+        return datetime.now(timezone.utc) - last_seen > timedelta(seconds=self.heartbeat_seconds * 3)
+
+    def submit(self, target_date: date, resume: bool = True) -> GenerationJob:
+        """Queue generation for a date; an identical queued or running job is returned instead"""
+        self._bind_loop()
+        for job in self._jobs.values():
+            if job.target_date == target_date and job.resume == resume and job.status in ACTIVE:
+                logger.info(f"Generation for {target_date} already {job.status} as job {job.job_id}")
+                return job
+
+        job = GenerationJob(
+            job_id=uuid.uuid4().hex, target_date=target_date, resume=resume,
+            owner=self.owner, heartbeat_at=datetime.now(timezone.utc)
+        )
+        self._jobs[job.job_id] = job
+        self._queue.put_nowait(job.job_id)
+        self._persist(job)
+        self._trim()
+        logger.info(f"Job {job.job_id} queued: generate {target_date}")
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """A job from memory, or from the DB if this process no longer holds it"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        try:
+            return self.repository.get(job_id)
+        except Exception as e:
+            logger.error(f"Failed to load job {job_id}: {e}")
+            return None
+
+    def cancel(self, job_id: str) -> Optional[GenerationJob]:
+        """Cancel a queued or running job; finished jobs are returned unchanged
+
+        A job of a replica that stopped heartbeating is marked cancelled in
+        the DB; one still owned by a live replica raises
+        JobOwnedElsewhereError. Unknown jobs return None.
+        """
+        self._bind_loop()
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self.get(job_id)
+            if job is None or job.status not in ACTIVE:
+                return job
+            if not self._expired(job):
+                raise JobOwnedElsewhereError(f"Job {job_id} is {job.status} on {job.owner}")
+            self._jobs[job_id] = job
+        if job.status not in ACTIVE:
+            return job
+        task = self._running.get(job_id)
+        if task is not None:
+            # The worker records the outcome once the pipeline has unwound
+            task.cancel()
+        else:
+            self._finish(job, "cancelled")
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job = self._jobs.get(await self._queue.get())
+            if job is None or job.status != "queued":
+                continue
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            self._persist(job)
+
+            task = asyncio.create_task(self.run(job.target_date, job.resume))
+            self._running[job.job_id] = task
+            try:
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                self._running.pop(job.job_id, None)
+
+            if task.cancelled():
+                self._finish(job, "cancelled")
+            elif task.exception() is not None:
+                self._finish(job, "failed", str(task.exception()))
+            else:
+                job.episode_status = task.result().status
+                self._finish(job, "done")
+
+    def _finish(self, job: GenerationJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error_message = error
+        job.finished_at = datetime.now(timezone.utc)
+        self._persist(job)
+        logger.info(f"Job {job.job_id} {status}" + (f": {error}" if error else ""))
+
+    def _persist(self, job: GenerationJob) -> None:
+        """Write a snapshot of the job after any earlier write of the same job"""
+        previous = self._writes.get(job.job_id)
+        task = asyncio.create_task(self._write(job.model_copy(), previous))
+        self._writes[job.job_id] = task
+        self._background.add(task)
+        task.add_done_callback(lambda t: self._written(job.job_id, t))
+
+    async def _write(self, snapshot: GenerationJob, previous: Optional[asyncio.Task]) -> None:
+        if previous is not None:
+            await asyncio.wait({previous})
+        try:
+            await asyncio.to_thread(self.repository.save, snapshot)
+        except Exception as e:
+            logger.error(f"Failed to save job {snapshot.job_id}: {e}")
+
+    def _written(self, job_id: str, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if self._writes.get(job_id) is task:
+            del self._writes[job_id]
+
+    def _trim(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ACTIVE]
+        for job_id in finished[:max(len(finished) - HISTORY, 0)]:
+            del self._jobs[job_id]
+
+    async def drain(self) -> None:
+        """Wait until every queued job has finished and its record is written"""
+        self._bind_loop()
+        while any(job.status in ACTIVE for job in self._jobs.values()) or self._writes:
+            await asyncio.sleep(0.01)
+
+
+_queue: Optional[JobQueue] = None
+
+
+async def _generate(target_date: date, resume: bool) -> Episode:
+    from src.automation.pipeline import EpisodePipeline
+
+    return await EpisodePipeline().generate_episode(target_date, resume=resume)
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide queue sized by AUTOMATION_WORKERS"""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue(_generate, workers=get_settings().automation_workers)
+    return _queue
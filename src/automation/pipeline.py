@@ -1,72 +1,426 @@
 """
 Episode Generation Pipeline
-Orchestrates news → script → audio → publish workflow
+Orchestrates news → script → audio → publish as a graph of stages
 """
 
+import asyncio
 import logging
-from datetime import date
-from typing import Optional
+import time
+from dataclasses import asdict
+from datetime import date, datetime, time as clock_time, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from src.news.service import NewsService
 from src.script.generator import ScriptGenerator
-from src.audio.tts import TTSService
-from src.models.episode import Episode, PipelineState
+from src.audio.tts import AudioUpload, TTSService
+from src.audio import hls
+from src.audio.renditions import parse_renditions, rendition_object_name
+from src.audio.segment_cache import get_segment_cache
+from src.audio.scheduler import PRIORITY_BACKFILL, PRIORITY_TODAY, get_tts_scheduler
+from src.common.config import get_settings
+from src.common.metrics import counter
+from src.common.profiler import ProfilerBusyError, SamplingProfiler, save_profile, take_run_profile_request
+from src.common.retry import DeadlineExceededError, current_deadline, deadline_scope, remaining_timeout
+from src.common.tracing import trace_scope
+from src.db.episodes import get_episode_repository
+from src.db.generation_logs import get_generation_log_repository
+from src.db.pipeline_states import get_pipeline_state_repository
+from src.automation.dag import Dag, Node
+from src.automation.singleflight import LeaseLostError, SingleFlight
+from src.portal import rss
+from src.portal.cache import get_episode_cache
+from src.storage.s3_client import get_storage
+from src.models.episode import Article, AudioRendition, Episode, PipelineState
 
 logger = logging.getLogger(__name__)
 
+EPISODES = counter("pipeline_episodes_total", "Episodes generated by outcome", ("status",))
+
+NEWS_CUTOFF = clock_time(7, 0)  # daily run time (UTC); a backfilled date gets news up to this
+
+# Seconds each stage may run before it is cancelled; all stages also share the run deadline
+STAGE_DEADLINES = {
+    "news": 180,
+    "script": 420,  # both LLM providers with retries, then the template
+    "transcript": 60,
+    "audio": 2700,  # TTS quota wait (tts_quota_max_wait_seconds) + synthesis (tts_synthesis_timeout_seconds)
+    "hls": 300,
+    "episode": 60,
+    "rss": 60,
+}
+
+
 class EpisodePipeline:
     """Main pipeline for generating daily episodes"""
 
     def __init__(self):
         self.news_service = NewsService()
         self.script_generator = ScriptGenerator()
-        self.tts_service = TTSService()
+        segment_cache = get_segment_cache() if get_settings().tts_cache_enabled else None
+        self.tts_scheduler = get_tts_scheduler()
+        self.tts_service = TTSService(segment_cache=segment_cache, quota_tracker=self.tts_scheduler.quota)
+        self.renditions = parse_renditions(get_settings().tts_renditions)
+        self.episodes = get_episode_repository()
+        self.states = get_pipeline_state_repository()
+        self.logs = get_generation_log_repository()
+        self.storage = get_storage()
+        self.single_flight = SingleFlight(ttl_seconds=get_settings().pipeline_lease_seconds)
+
+    async def generate_episode(
+        self, target_date: Optional[date] = None, resume: bool = True, profile: bool = False
+    ) -> Episode:
+        """Generate complete episode for given date
+
+        Stages completed by an earlier run for the same episode are not
+        repeated: their checkpointed outputs are reused. Pass resume=False
+        to start from scratch.
+
+        Only one worker across all replicas generates an episode at a time;
+        a concurrent call waits and returns the episode that worker produced.
 
-    async def generate_episode(self, target_date: Optional[date] = None) -> Episode:
-        """Generate complete episode for given date"""
+        With profile=True (or after POST /api/admin/profile/next-run) the run
+        is sampled and its collapsed stacks are uploaded under profiles/.
+        """
         if target_date is None:
             target_date = date.today()
 
         episode_id = f"ep-{target_date.isoformat()}"
         logger.info(f"Starting episode generation: {episode_id}")
+        requested_at = time.time()
+        profile = take_run_profile_request() or profile
 
+        async def work() -> Episode:
+            if not resume:
+                await asyncio.to_thread(self.states.clear, episode_id)
+            profiler = self._start_profiler() if profile else None
+            # Stage and call timings go to generation_logs
+            try:
+                async with trace_scope(episode_id, sink=self.logs.save_many):
+                    try:
+                        episode = await self._run_stages(episode_id, target_date)
+                    except Exception:
+                        EPISODES.labels("failed").inc()
+                        raise
+            finally:
+                if profiler is not None:
+                    await self._save_profile(profiler.stop(), episode_id)
+            EPISODES.labels(episode.status).inc()
+            return episode
+
+        settings = get_settings()
+        warning = asyncio.get_running_loop().call_later(
+            settings.pipeline_warning_seconds, logger.warning,
+            f"Episode {episode_id} still running after {settings.pipeline_warning_seconds}s"
+        )
+        # Every stage, outbound call and retry below shares this time budget
+        # and is cancelled when it runs out
+        with deadline_scope(settings.pipeline_deadline_seconds):
+            try:
+                return await asyncio.wait_for(
+                    self.single_flight.run(episode_id, work, lambda: self._finished_episode(episode_id, requested_at)),
+                    timeout=settings.pipeline_deadline_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Pipeline terminated after {settings.pipeline_deadline_seconds}s")
+                raise PipelineError(f"Episode generation exceeded {settings.pipeline_deadline_seconds}s")
+            except (LeaseLostError, DeadlineExceededError) as e:
+                logger.error(f"Pipeline failed: {e}")
+                raise PipelineError(f"Episode generation failed: {e}")
+            finally:
+                warning.cancel()
+
+    @staticmethod
+    def _start_profiler() -> Optional[SamplingProfiler]:
+        profiler = SamplingProfiler()
         try:
-            # Stage 1: Collect news
-            logger.info("Stage 1: Collecting news...")
-            articles = await self.news_service.collect_latest(hours=24)
-            logger.info(f"Collected {len(articles)} articles")
-
-            if len(articles) == 0:
-                raise PipelineError("No articles found")
-
-            # Stage 2: Generate script
-            logger.info("Stage 2: Generating script...")
-            script = await self.script_generator.generate(articles, target_date)
-            word_count = len(script.split())
-            logger.info(f"Generated script: {word_count} words")
-
-            # Stage 3: Generate audio (placeholder)
-            logger.info("Stage 3: Audio generation (skipped for demo)")
-            audio_url = None  # Would be from TTS service
-
-            # Stage 4: Create episode record
-            episode = Episode(
-                episode_id=episode_id,
-                date=target_date,
-                status="completed" if audio_url else "script_only",
-                article_count=len(articles),
-                script_text=script,
-                script_word_count=word_count,
-                audio_url=audio_url
-            )
+            profiler.start()
+        except ProfilerBusyError:
+            logger.warning("Another profile is running; this run is not profiled")
+            return None
+        return profiler
 
-            logger.info(f"Episode {episode_id} generation complete!")
-            return episode
+    async def _save_profile(self, profiler: SamplingProfiler, episode_id: str) -> None:
+        try:
+            await save_profile(profiler, episode_id, self.storage)
+        except Exception as e:
+            logger.error(f"Failed to upload profile of {episode_id}: {e}")
+
+    async def _finished_episode(self, episode_id: str, since: float) -> Optional[Episode]:
+        """The episode saved by another worker after since (epoch seconds), if any"""
+        episode = await asyncio.to_thread(self.episodes.get, episode_id)
+        if episode is None or episode.created_at.timestamp() < since:
+            return None
+        logger.info(f"Attached to {episode_id} generated by another worker")
+        return episode
 
+    async def _run_stages(self, episode_id: str, target_date: date) -> Episode:
+        """Run the stage graph for one episode, checkpointing each stage
+
+        news → script → audio → hls → episode → rss, with the transcript
+        uploaded alongside audio and the feed rebuilt once the episode is saved.
+        """
+        states = await asyncio.to_thread(self._load_states, episode_id)
+        dag = Dag(self._bounded_stages([
+            Node("news", lambda: self._collect_articles(states, episode_id, target_date)),
+            Node("script", lambda news: self._write_script(states, episode_id, target_date, news), inputs=("news",)),
+            Node("transcript", lambda script: self._upload_transcript(episode_id, script),
+                 inputs=("script",), optional=True),
+            Node("audio", lambda script: self._produce_audio(states, episode_id, target_date, script),
+                 inputs=("script",), optional=True),
+            Node("hls", lambda audio: self._produce_hls(states, episode_id, audio), inputs=("audio",)),
+            Node("episode", lambda news, script, audio, hls: self._build_episode(
+                episode_id, target_date, news, script, audio, hls
+            ), inputs=("news", "script", "audio", "hls")),
+            Node("rss", lambda episode: self._publish_rss(), inputs=("episode",), optional=True),
+        ]))
+        try:
+            run = await dag.run()
         except Exception as e:
             logger.error(f"Pipeline failed: {e}")
             raise PipelineError(f"Episode generation failed: {e}")
 
+        logger.info(f"Episode {episode_id} generation complete! Critical path: {run.describe_critical_path()}")
+        return run.results["episode"]
+
+    @staticmethod
+    def _bounded_stages(nodes: List[Node]) -> List[Node]:
+        for node in nodes:
+            node.timeout = STAGE_DEADLINES.get(node.name)
+        return nodes
+
+    async def _collect_articles(
+        self, states: Dict[str, PipelineState], episode_id: str, target_date: date
+    ) -> List[Article]:
+        # Stage 1: Collect news (a past date gets the 24 hours before its morning run)
+        logger.info("Stage 1: Collecting news...")
+        until = datetime.combine(target_date, NEWS_CUTOFF) if target_date < date.today() else None
+        inputs = {"hours": 24, "until": until.isoformat() if until else None}
+        news = await self._stage(states, episode_id, "news", inputs, lambda: self._collect_news(until))
+        articles = [Article(**a) for a in news["articles"]]
+        logger.info(f"Collected {len(articles)} articles")
+        return articles
+
+    async def _write_script(
+        self, states: Dict[str, PipelineState], episode_id: str, target_date: date, articles: List[Article]
+    ) -> str:
+        # Stage 2: Generate script (validated as a whole, so TTS waits for all of it)
+        logger.info("Stage 2: Generating script...")
+        inputs = {"article_ids": [a.article_id for a in articles], "date": target_date.isoformat()}
+        generated = await self._stage(
+            states, episode_id, "script", inputs, lambda: self._generate_script(articles, target_date)
+        )
+        script = generated["script"]
+        logger.info(f"Generated script: {len(script.split())} words")
+        return script
+
+    async def _produce_audio(
+        self, states: Dict[str, PipelineState], episode_id: str, target_date: date, script: str
+    ) -> Optional[Dict[str, AudioUpload]]:
+        # Stage 3: Stream audio renditions into storage (degrades to a script-only episode on failure)
+        logger.info("Stage 3: Generating audio...")
+        uploads = await self._optional_stage(
+            states, episode_id, "audio", {"renditions": [spec.name for spec in self.renditions]},
+            lambda: self._generate_audio(script, episode_id, target_date)
+        )
+        if not uploads or self.renditions[0].name not in uploads:
+            return None
+        return {name: AudioUpload(**u) for name, u in uploads.items()}
+
+    async def _produce_hls(
+        self, states: Dict[str, PipelineState], episode_id: str, uploads: Optional[Dict[str, AudioUpload]]
+    ) -> Optional[str]:
+        # Stage 4: Package HLS segments for fast playback start (optional)
+        if not uploads:
+            return None
+        packaged = await self._optional_stage(
+            states, episode_id, "hls", {"renditions": sorted(uploads)},
+            lambda: self._package_hls(episode_id, uploads)
+        )
+        return packaged["hls_url"] if packaged else None
+
+    async def _build_episode(
+        self,
+        episode_id: str,
+        target_date: date,
+        articles: List[Article],
+        script: str,
+        uploads: Optional[Dict[str, AudioUpload]],
+        hls_url: Optional[str]
+    ) -> Episode:
+        # Stage 5: Create episode record
+        audio = uploads[self.renditions[0].name] if uploads else None
+        episode = Episode(
+            episode_id=episode_id,
+            date=target_date,
+            status="completed" if audio else "script_only",
+            article_count=len(articles),
+            script_text=script,
+            script_word_count=len(script.split()),
+            audio_url=audio.url if audio else None,
+            audio_duration_seconds=round(audio.duration_seconds) if audio else None,
+            audio_file_size_bytes=audio.size_bytes if audio else None,
+            audio_renditions=[
+                AudioRendition(
+                    name=spec.name,
+                    output_format=spec.output_format,
+                    bitrate_kbps=spec.bitrate_kbps,
+                    url=uploads[spec.name].url,
+                    size_bytes=uploads[spec.name].size_bytes,
+                    duration_seconds=round(uploads[spec.name].duration_seconds, 3)
+                )
+                for spec in self.renditions if uploads and spec.name in uploads
+            ],
+            hls_url=hls_url
+        )
+        await asyncio.to_thread(self._save_episode, episode)
+        return episode
+
+    async def _upload_transcript(self, episode_id: str, script: str) -> str:
+        """Publish the script as a plain-text transcript"""
+        return await asyncio.to_thread(
+            self.storage.upload_bytes, script.encode(), f"transcripts/{episode_id}.txt", "text/plain; charset=utf-8"
+        )
+
+    async def _publish_rss(self) -> str:
+        """Rebuild the podcast feed from the stored episodes"""
+        episodes = await asyncio.to_thread(self.episodes.list_recent)
+        return await rss.publish_feed(episodes, self.storage)
+
+    async def _stage(
+        self,
+        states: Dict[str, PipelineState],
+        episode_id: str,
+        stage: str,
+        inputs: Dict[str, Any],
+        run: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Run one stage, or reuse its outputs if an earlier run completed it
+
+        A checkpoint with inputs, outputs, timings and retry count is written
+        when the stage starts and when it finishes or fails.
+        """
+        previous = states.get(stage)
+        if previous and previous.status == "completed":
+            logger.info(f"Stage {stage}: resuming from checkpoint ({previous.completed_at})")
+            return previous.outputs
+
+        state = PipelineState(
+            episode_id=episode_id,
+            stage=stage,
+            status="running",
+            started_at=datetime.now(timezone.utc),
+            retry_count=previous.retry_count if previous else 0,
+            inputs=inputs
+        )
+        await asyncio.to_thread(self._checkpoint, state)
+        started = time.monotonic()
+        try:
+            state.outputs = await run()
+            state.status = "completed"
+            return state.outputs
+        except BaseException as e:
+            state.status = "failed"
+            if isinstance(e, asyncio.CancelledError):
+                deadline = current_deadline()
+                state.status = "timed_out" if deadline and deadline.expired else "cancelled"
+            state.error_message = str(e) or type(e).__name__
+            state.retry_count += 1
+            raise
+        finally:
+            state.completed_at = datetime.now(timezone.utc)
+            state.duration_ms = round((time.monotonic() - started) * 1000)
+            states[stage] = state
+            await asyncio.to_thread(self._checkpoint, state)
+
+    async def _optional_stage(self, states, episode_id, stage, inputs, run) -> Optional[Dict[str, Any]]:
+        """Run a stage whose failure is recorded but does not fail the episode"""
+        try:
+            return await self._stage(states, episode_id, stage, inputs, run)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return None
+
+    async def _collect_news(self, until: Optional[datetime] = None) -> Dict[str, Any]:
+        articles = await self.news_service.collect_latest(hours=24, until=until)
+        if len(articles) == 0:
+            raise PipelineError("No articles found")
+        return {"articles": [a.model_dump(mode="json") for a in articles]}
+
+    async def _generate_script(self, articles: List[Article], target_date: date) -> Dict[str, Any]:
+        return {"script": await self.script_generator.generate(articles, target_date)}
+
+    async def _generate_audio(self, script: str, episode_id: str, target_date: date) -> Dict[str, Any]:
+        """Stream all audio renditions into storage
+
+        Synthesis goes through the quota scheduler: today's episode is served
+        before backfills, and a job still queued or parked when the quota
+        wait runs out is dropped so the episode is published as script only.
+        Once admitted, synthesis and upload have their own deadline.
+        """
+        priority = PRIORITY_TODAY if target_date >= date.today() else PRIORITY_BACKFILL
+        job = self.tts_scheduler.submit(
+            lambda: self.tts_service.stream_renditions(script, episode_id, self.renditions, self.storage),
+            characters=len(script) * len(self.renditions),
+            priority=priority,
+            name=episode_id
+        )
+        settings = get_settings()
+        if not await job.admitted(remaining_timeout(settings.tts_quota_max_wait_seconds)):
+            job.cancel()
+            logger.warning("Audio still waiting for TTS quota, publishing script only")
+            raise asyncio.TimeoutError(f"TTS quota not available within {settings.tts_quota_max_wait_seconds}s")
+        try:
+            uploads = await asyncio.wait_for(job, timeout=remaining_timeout(settings.tts_synthesis_timeout_seconds))
+        except asyncio.TimeoutError:
+            job.cancel()
+            logger.warning(
+                f"Audio synthesis did not finish within {settings.tts_synthesis_timeout_seconds}s, "
+                "publishing script only"
+            )
+            raise
+        except Exception as e:
+            logger.warning(f"Audio generation failed, publishing script only: {e}")
+            raise
+        for name, audio in uploads.items():
+            logger.info(f"Generated {name} audio: {audio.size_bytes} bytes, {audio.duration_seconds:.0f}s")
+        return {name: asdict(audio) for name, audio in uploads.items()}
+
+    async def _package_hls(self, episode_id: str, uploads: Dict[str, AudioUpload]) -> Dict[str, Any]:
+        """Segment the stored renditions for HLS"""
+        object_names = {
+            spec.name: rendition_object_name(episode_id, spec, i == 0)
+            for i, spec in enumerate(self.renditions) if spec.name in uploads
+        }
+        try:
+            return {"hls_url": await hls.publish(episode_id, object_names, self.storage)}
+        except Exception as e:
+            logger.warning(f"HLS packaging failed, serving progressive MP3 only: {e}")
+            raise
+
+    def _load_states(self, episode_id: str) -> Dict[str, PipelineState]:
+        """Checkpoints of earlier runs; an unreadable store means starting over"""
+        try:
+            return self.states.load(episode_id)
+        except Exception as e:
+            logger.error(f"Failed to load checkpoints for {episode_id}: {e}")
+            return {}
+
+    def _checkpoint(self, state: PipelineState) -> None:
+        """Persist a stage checkpoint; a failed write only costs the ability to resume"""
+        try:
+            self.states.save(state)
+        except Exception as e:
+            logger.error(f"Failed to checkpoint {state.episode_id}/{state.stage}: {e}")
+
+    def _save_episode(self, episode: Episode) -> None:
+        """Persist the episode for the portal; the returned episode is the source of truth"""
+        try:
+            self.episodes.save(episode)
+        except Exception as e:
+            logger.error(f"Failed to save episode {episode.episode_id}: {e}")
+        get_episode_cache().invalidate()
+
 
 class PipelineError(Exception):
     """Pipeline execution error"""
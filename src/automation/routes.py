@@ -1,12 +1,60 @@
 """
-Automation Routes (placeholder)
+Automation Routes
 """
-from fastapi import APIRouter
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Body, HTTPException, Query
+from pydantic import BaseModel
+
+from src.automation.jobs import ACTIVE, JobOwnedElsewhereError, get_job_queue
+from src.db.generation_logs import get_generation_log_repository
 
 router = APIRouter()
 
 
+class GenerateRequest(BaseModel):
+    """Body of POST /generate; an empty body generates today's episode"""
+    target_date: Optional[date] = None
+    resume: bool = True
+
+
 @router.post("/generate")
-async def trigger_generation():
-    """Trigger episode generation"""
-    return {"status": "queued"}
+async def trigger_generation(request: Optional[GenerateRequest] = Body(None)):
+    """Queue episode generation and return the job to poll"""
+    request = request or GenerateRequest()
+    job = get_job_queue().submit(request.target_date or date.today(), resume=request.resume)
+    return job.model_dump(mode="json")
+
+
+@router.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status of a generation job"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.model_dump(mode="json")
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running generation job"""
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in ACTIVE:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    try:
+        job = queue.cancel(job_id)
+    except JobOwnedElsewhereError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.model_dump(mode="json")
+
+
+@router.get("/stats/stages")
+async def stage_stats(runs: int = Query(20, ge=1, le=500)):
+    """p50/p95 duration of each pipeline stage over the last runs"""
+    return get_generation_log_repository().stage_percentiles(runs)
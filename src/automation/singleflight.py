@@ -0,0 +1,107 @@
+"""
+Single-Flight Execution
+At most one worker across all replicas runs the work for a key
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from src.common.retry import DeadlineExceededError, current_deadline
+from src.db.leases import Lease, LeaseRepository, get_lease_repository
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseLostError(Exception):
+    """The lease expired or was taken over while the work was running"""
+    pass
+
+
+class SingleFlight:
+    """Runs work under a database lease, renewed by a heartbeat
+
+    Workers that find the lease held wait for it to be released or to
+    expire, then attach to the holder's result; if there is none (the
+    holder failed or crashed) they compete for the lease themselves. A
+    crashed holder stops renewing, so its lease is taken over within
+    ttl_seconds + poll_seconds.
+    """
+
+    def __init__(self, leases: LeaseRepository = None, ttl_seconds: float = 30.0, poll_seconds: float = 2.0):
+        self.leases = leases or get_lease_repository()
+        self.ttl_seconds = ttl_seconds
+        self.poll_seconds = poll_seconds
+
+    async def run(
+        self,
+        name: str,
+        work: Callable[[], Awaitable[T]],
+        attach: Callable[[], Awaitable[Optional[T]]]
+    ) -> T:
+        """Run work if we win the lease, otherwise return attach() once the holder is done"""
+        owner = f"{PROCESS_ID}:{uuid.uuid4().hex[:8]}"
+        while True:
+            try:
+                lease = await asyncio.to_thread(self.leases.acquire, name, owner, self.ttl_seconds)
+            except Exception as e:
+                # E.g. the leases migration has not been applied yet; a
+                # duplicate run is better than no run
+                logger.error(f"Lease {name} unavailable, running without a lease: {e}")
+                return await work()
+            if lease is not None:
+                logger.info(f"Lease {name} acquired (token {lease.token})")
+                return await self._hold(lease, work)
+
+            logger.info(f"{name} is running on another worker, waiting for its result")
+            await self._wait(name)
+            result = await attach()
+            if result is not None:
+                return result
+
+    async def _wait(self, name: str) -> None:
+        while await asyncio.to_thread(self.leases.holder, name) is not None:
+            deadline = current_deadline()
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceededError(f"Gave up waiting for {name}")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _hold(self, lease: Lease, work: Callable[[], Awaitable[T]]) -> T:
+        task = asyncio.create_task(work())
+        heartbeat = asyncio.create_task(self._heartbeat(lease, task))
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if heartbeat.done() and heartbeat.result() is False:
+                raise LeaseLostError(f"Lease {lease.name} lost, work stopped")
+            raise
+        finally:
+            heartbeat.cancel()
+            try:
+                await asyncio.to_thread(self.leases.release, lease)
+            except Exception as e:
+                logger.error(f"Failed to release lease {lease.name}: {e}")
+
+    async def _heartbeat(self, lease: Lease, task: asyncio.Task) -> bool:
+        """Renew until cancelled; cancels the work and returns False if the lease is lost"""
+        while True:
+            await asyncio.sleep(self.ttl_seconds / 3)
+            try:
+                if await asyncio.to_thread(self.leases.renew, lease, self.ttl_seconds):
+                    continue
+                logger.error(f"Lease {lease.name} was taken over")
+            except Exception as e:
+                # A failed renewal is retried while the lease has not yet expired
+                if lease.expires_at > self.leases.clock():
+                    logger.warning(f"Lease {lease.name} renewal failed, retrying: {e}")
+                    continue
+                logger.error(f"Lease {lease.name} expired while renewals were failing: {e}")
+            task.cancel()
+            return False
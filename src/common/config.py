@@ -41,10 +41,48 @@ class Settings(BaseSettings):
 
     # ElevenLabs TTS
     elevenlabs_api_key: str
+    elevenlabs_max_concurrency: int = 2
+    tts_cache_enabled: bool = True
+    tts_cache_max_bytes: int = 256 * 1024 * 1024  # in-memory tier
+    tts_cache_persistent: bool = True  # also keep segments in storage (cache/tts/, expired by lifecycle rule)
+    tts_quota_max_wait_seconds: int = 1800  # queued or parked for quota
+    tts_synthesis_timeout_seconds: int = 900  # once admitted: synthesis and upload
+    tts_renditions: str = "standard:mp3_44100_128,mobile:mp3_22050_32"  # first is primary
+
+    # Pipeline
+    pipeline_deadline_seconds: int = 3600  # run is terminated after this
+    pipeline_warning_seconds: int = 1800
+    automation_workers: int = 1
+    pipeline_lease_seconds: int = 30  # a crashed worker's episode is taken over after this
+
+    # Logging: JSON lines to stderr and to {log_dir}/pipeline-YYYY-MM-DD.log (empty disables files)
+    log_level: str = "INFO"
+    log_dir: str = "logs"
+    log_json: bool = True
+
+    # Warm-up at startup (DB session pool, storage client, portal cache); /ready reports 503 until done
+    warmup_enabled: bool = True
+    warmup_timeout_seconds: int = 30  # per step
+
+    # Admin endpoints (/api/admin) are disabled while this is empty
+    admin_token: str = ""
+
+    # Event loop watchdog (opt-in): logs callbacks that block the loop longer than the threshold
+    loop_watchdog_enabled: bool = False
+    loop_watchdog_threshold_ms: int = 100
+
+    # Provider rate limits shared by all concurrent episodes (e.g. backfill)
+    news_requests_per_minute: int = 30
+    llm_requests_per_minute: int = 20
+    tts_characters_per_minute: int = 50000
 
     # Optional: LLM APIs
     yagpt_api_key: str = ""
     claude_api_key: str = ""
+    yagpt_api_url: str = "https://llm.api.cloud.yandex.net/foundationModels/v1/completion"
+    claude_api_url: str = "https://api.anthropic.com/v1/messages"
+    llm_max_input_tokens: int = 3000
+    llm_max_output_tokens: int = 2000
 
     # Optional: Additional Yandex Cloud fields
     yc_sa_key_file: str = ""
@@ -54,7 +92,6 @@ class Settings(BaseSettings):
 
     # Automation
     auto_commit: bool = True
-    log_level: str = "INFO"
 
     class Config:
         env_file = ".env"
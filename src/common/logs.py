@@ -0,0 +1,221 @@
+"""
+Structured Logging
+JSON log records handed to a background thread for formatting and file I/O
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+import traceback
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 10000  # records waiting for the writer thread; more are dropped, not waited on
+
+# LogRecord attributes that are not user-supplied extra fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, correlation IDs, extras, exc"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class CorrelationFilter(logging.Filter):
+    """Tag records with the run and episode of the enclosing pipeline trace"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        from src.common.tracing import current_trace
+
+        trace = current_trace()
+        if trace is not None:
+            record.run_id = trace.run_id
+            record.episode_id = trace.episode_id
+        return True
+
+
+class RepeatFilter(logging.Filter):
+    """Let through at most burst records per call site and period
+
+    The first record after a suppressed stretch carries the number of
+    records dropped in a "suppressed" field. Keyed by the logging call's
+    file and line, so an f-string message counts as one message however
+    its values vary.
+    """
+
+    def __init__(self, burst: int = 10, period: float = 60.0, clock=time.monotonic):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.clock = clock
+        self._windows: Dict[Tuple[str, int, int], list] = {}  # key → [window start, count, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.pathname, record.lineno, record.levelno)
+        now = self.clock()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.period:
+            suppressed = window[2] if window else 0
+            window = self._windows[key] = [now, 0, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            if len(self._windows) > 10000:
+                self._windows.clear()
+                self._windows[key] = window
+        window[1] += 1
+        if window[1] > self.burst:
+            window[2] += 1
+            return False
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue without formatting; drop (and count) records if the writer falls behind"""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge args now (they may change later); JSON and tracebacks are built by the writer
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+class DailyFileHandler(logging.Handler):
+    """Writes to {directory}/{prefix}-YYYY-MM-DD.log, switching files at midnight UTC
+
+    Files older than keep_days are deleted when a new day's file is opened.
+    """
+
+    def __init__(self, directory: str, prefix: str = "pipeline", keep_days: int = 14):
+        super().__init__()
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.keep_days = keep_days
+        self._day: Optional[date] = None
+        self._stream = None
+
+    def path_for(self, day: date) -> Path:
+        return self.directory / f"{self.prefix}-{day.isoformat()}.log"
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            day = datetime.fromtimestamp(record.created, tz=timezone.utc).date()
+            if day != self._day:
+                self._open(day)
+            self._stream.write(self.format(record) + "\n")
+            self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def _open(self, day: date) -> None:
+        if self._stream is not None:
+            self._stream.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stream = open(self.path_for(day), "a", encoding="utf-8")
+        self._day = day
+        oldest = day - timedelta(days=self.keep_days)
+        for path in self.directory.glob(f"{self.prefix}-*.log"):
+            try:
+                if date.fromisoformat(path.stem[len(self.prefix) + 1:]) < oldest:
+                    path.unlink()
+            except (ValueError, OSError):
+                continue
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        super().close()
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[NonBlockingQueueHandler] = None
+_lock = threading.Lock()
+
+
+def configure_logging(level: str = "INFO", log_dir: Optional[str] = "logs", json_stderr: bool = True) -> None:
+    """Route the root logger through a queue to stderr and daily files
+
+    Callers only pay for building the record and a put_nowait; formatting
+    and I/O happen on the listener thread. Safe to call more than once.
+    """
+    global _listener, _handler
+    with _lock:
+        if _listener is not None:
+            return
+        stderr = logging.StreamHandler(sys.stderr)
+        stderr.setFormatter(JsonFormatter() if json_stderr else logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s: %(message)s"
+        ))
+        handlers = [stderr]
+        if log_dir:
+            files = DailyFileHandler(log_dir)
+            files.setFormatter(JsonFormatter())
+            handlers.append(files)
+
+        _handler = NonBlockingQueueHandler(queue.Queue(QUEUE_SIZE))
+        _handler.addFilter(CorrelationFilter())
+        _handler.addFilter(RepeatFilter())
+        _listener = logging.handlers.QueueListener(_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+        root = logging.getLogger()
+        root.addHandler(_handler)
+        root.setLevel(level.upper())
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener, _handler
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = _handler = None
+
+
+def flush_logging(timeout: float = 2.0) -> None:
+    """Wait until queued records are written, e.g. before a function invocation returns
+
+    A serverless container can be frozen as soon as its handler returns,
+    which would hold back records still waiting for the writer thread.
+    """
+    handler = _handler
+    if handler is None:
+        return
+    deadline = time.monotonic() + timeout
+    while handler.queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.005)
@@ -0,0 +1,356 @@
+"""
+Metrics Registry
+Counters, gauges and histograms rendered in the Prometheus text format
+"""
+
+import bisect
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-millisecond DB reads up to a 45-minute TTS stage
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 2700)
+
+Sample = Tuple[str, Dict[str, str], float]  # suffix, labels, value
+
+
+class _Cells:
+    """One accumulator per thread, summed when scraped
+
+    Each thread only ever writes its own cell, so updates need no lock and
+    never contend; the event loop thread keeps a single cell.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._cells: Dict[int, List[float]] = {}
+
+    def cell(self) -> List[float]:
+        ident = threading.get_ident()
+        cell = self._cells.get(ident)
+        if cell is None:
+            cell = self._cells.setdefault(ident, [0.0] * self.size)
+        return cell
+
+    def total(self) -> List[float]:
+        totals = [0.0] * self.size
+        for cell in list(self._cells.values()):
+            for i, value in enumerate(cell):
+                totals[i] += value
+        return totals
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values) -> "_Metric":
+        """Child for one combination of label values"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children.setdefault(key, self._child())
+        return child
+
+    def _child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        return self.labels()
+
+    def samples(self) -> Iterable[Sample]:
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key))
+            for suffix, extra, value in child.samples():
+                yield suffix, {**labels, **extra}, value
+
+
+class _CounterChild:
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.total()[0]
+
+    def samples(self) -> Iterable[Sample]:
+        yield "", {}, self.value
+
+
+class Counter(_Metric):
+    """Monotonically increasing value; by convention its name ends in _total"""
+    type = "counter"
+
+    def _child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def samples(self) -> Iterable[Sample]:
+        yield "", {}, self.value
+
+
+class Gauge(_Metric):
+    """Value that goes up and down"""
+    type = "gauge"
+
+    def _child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        # Per-bucket counts, then +Inf, sum and count
+        self._cells = _Cells(len(buckets) + 3)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def samples(self) -> Iterable[Sample]:
+        totals = self._cells.total()
+        cumulative = 0.0
+        for bound, count in zip(self.buckets, totals):
+            cumulative += count
+            yield "_bucket", {"le": _format(bound)}, cumulative
+        yield "_bucket", {"le": "+Inf"}, totals[-1]
+        yield "_sum", {}, totals[-2]
+        yield "_count", {}, totals[-1]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self) -> "_Timer":
+        """Context manager observing the duration of the block"""
+        return _Timer(self._default())
+
+
+class _Timer:
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+# Collector: returns (name, type, help, [(labels, value)]) for values kept elsewhere
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+class Registry:
+    """Named metrics and collectors of one process"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        if not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} already registered differently")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Collector) -> None:
+        """Add a callable sampled at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines += _header(metric.name, metric.type, metric.help)
+            for suffix, labels, value in metric.samples():
+                lines.append(_line(metric.name + suffix, labels, value))
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {e}")
+                continue
+            for name, type_, help, samples in families:
+                lines += _header(name, type_, help)
+                lines += [_line(name, labels, value) for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+def _header(name: str, type_: str, help: str) -> List[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} {type_}"]
+
+
+def _line(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        return f"{name}{{{pairs}}} {_format(value)}"
+    return f"{name} {_format(value)}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Process-wide counter, created on first use"""
+    return REGISTRY.counter(name, help, labelnames)
+
+
+def gauge(name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """Process-wide gauge, created on first use"""
+    return REGISTRY.gauge(name, help, labelnames)
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Process-wide histogram, created on first use"""
+    return REGISTRY.histogram(name, help, labelnames, buckets)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by route template, method and status
+
+    Requests that match no route share the "unmatched" label, so scanners
+    cannot blow up label cardinality.
+    """
+
+    def __init__(self, app, registry: Registry = REGISTRY):
+        self.app = app
+        self.latency = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency", ("route", "method", "status")
+        )
+        self.in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being served")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            route = scope.get("route")
+            label = getattr(route, "path", None) or "unmatched"
+            self.latency.labels(label, scope["method"], status).observe(time.perf_counter() - started)
+
+
+def _retry_collector():
+    from src.common.retry import retry_metrics
+
+    stats = retry_metrics()
+    for field in ("calls", "retries", "failures", "deadline_exceeded"):
+        yield (f"outbound_retry_{field}_total", "counter", f"Retry policy {field}", [
+            ({"policy": name}, values[field]) for name, values in stats.items()
+        ])
+
+
+def _rate_limit_collector():
+    from src.common.ratelimit import rate_limit_metrics
+
+    stats = rate_limit_metrics()
+    yield ("rate_limit_acquired_total", "counter", "Units acquired from provider rate limits", [
+        ({"limiter": name}, values["acquired"]) for name, values in stats.items()
+    ])
+    yield ("rate_limit_waited_seconds_total", "counter", "Seconds spent waiting on provider rate limits", [
+        ({"limiter": name}, values["waited_seconds"]) for name, values in stats.items()
+    ])
+
+
+for _collector in (_retry_collector, _rate_limit_collector):
+    REGISTRY.register_collector(_collector)
@@ -0,0 +1,219 @@
+"""
+Sampling Profiler
+Low-overhead stack sampling in collapsed-stack format, plus tracemalloc snapshots and diffs
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter as Tally, OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_STACK_DEPTH = 128
+MAX_SNAPSHOTS = 5  # tracemalloc snapshots kept in memory
+
+
+class ProfilerBusyError(Exception):
+    """A profile is already being recorded"""
+    pass
+
+
+class SamplingProfiler:
+    """Samples every thread's stack from a background thread
+
+    Nothing is hooked into the profiled code: each sample walks the frames
+    returned by sys._current_frames(), so the cost is proportional to the
+    sampling rate, not to how much code runs. Output is collapsed stacks
+    ("thread;outer;inner count" per line), which speedscope and
+    flamegraph.pl open directly.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples = Tally()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.elapsed = 0.0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        global _active
+        with _active_lock:
+            if _active is not None:
+                raise ProfilerBusyError("A profile is already running")
+            _active = self
+        self.started_at = time.monotonic()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> "SamplingProfiler":
+        global _active
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.monotonic() - self.started_at
+        with _active_lock:
+            if _active is self:
+                _active = None
+        return self
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stopped.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self.samples[_collapse(names.get(ident, str(ident)), frame)] += 1
+            self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """Samples as collapsed stacks, most frequent first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _collapse(thread_name: str, frame) -> str:
+    frames = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({_short(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    frames.append(thread_name.replace(";", ":"))
+    return ";".join(reversed(frames))
+
+
+def _short(filename: str) -> str:
+    for marker in ("site-packages/", "/src/", "/lib/python"):
+        index = filename.rfind(marker)
+        if index >= 0:
+            return filename[index + 1:] if marker == "/src/" else filename[index + len(marker):]
+    return filename
+
+
+_active: Optional[SamplingProfiler] = None
+_active_lock = threading.Lock()
+
+
+def profile_object_name(label: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"profiles/{label}-{stamp}.collapsed"
+
+
+async def save_profile(profiler: SamplingProfiler, label: str, storage) -> str:
+    """Upload a stopped profile; returns the storage URL"""
+    object_name = profile_object_name(label)
+    url = await asyncio.to_thread(
+        storage.upload_bytes, profiler.collapsed().encode(), object_name, "text/plain; charset=utf-8"
+    )
+    logger.info(
+        f"Profile {object_name}: {profiler.sample_count} samples over {profiler.elapsed:.1f}s"
+    )
+    return url
+
+
+async def profile_window(seconds: float, storage, label: str = "window", interval: float = 0.01) -> dict:
+    """Profile the whole process for seconds and upload the result"""
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+    url = await save_profile(profiler, label, storage)
+    return {"url": url, "samples": profiler.sample_count, "seconds": round(profiler.elapsed, 3)}
+
+
+# One-shot request to profile the next pipeline run
+_profile_next_run = threading.Event()
+
+
+def request_run_profile() -> None:
+    _profile_next_run.set()
+
+
+def take_run_profile_request() -> bool:
+    """Whether the next run should be profiled; consumes the request"""
+    if _profile_next_run.is_set():
+        _profile_next_run.clear()
+        return True
+    return False
+
+
+# tracemalloc snapshots
+
+_snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+
+def take_snapshot(frames: int = 1) -> str:
+    """Snapshot traced allocations (starting tracemalloc if needed); returns its id"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        logger.warning("tracemalloc started; allocations before this point are not traced")
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    snapshot_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    with _snapshots_lock:
+        _snapshots[snapshot_id] = snapshot
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return snapshot_id
+
+
+def list_snapshots() -> List[str]:
+    with _snapshots_lock:
+        return list(_snapshots)
+
+
+def stop_tracing() -> None:
+    """Stop tracemalloc and drop snapshots, releasing its memory"""
+    tracemalloc.stop()
+    with _snapshots_lock:
+        _snapshots.clear()
+
+
+def _get(snapshot_id: str) -> tracemalloc.Snapshot:
+    with _snapshots_lock:
+        snapshot = _snapshots.get(snapshot_id)
+    if snapshot is None:
+        raise KeyError(snapshot_id)
+    return snapshot
+
+
+def top_allocations(snapshot_id: str, limit: int = 20) -> List[Dict]:
+    """Largest allocators of a snapshot by file and line"""
+    stats = _get(snapshot_id).statistics("lineno")[:limit]
+    return [
+        {"location": _location(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+        for stat in stats
+    ]
+
+
+def diff_snapshots(older_id: str, newer_id: str, limit: int = 20) -> List[Dict]:
+    """Allocators that grew most between two snapshots, by file and line"""
+    stats = _get(newer_id).compare_to(_get(older_id), "lineno")[:limit]
+    return [
+        {
+            "location": _location(stat.traceback),
+            "size_bytes": stat.size,
+            "size_diff_bytes": stat.size_diff,
+            "count_diff": stat.count_diff,
+        }
+        for stat in stats
+    ]
+
+
+def _location(trace: tracemalloc.Traceback) -> str:
+    frame = trace[0]
+    return f"{_short(frame.filename)}:{frame.lineno}"
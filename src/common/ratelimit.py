@@ -0,0 +1,93 @@
+"""
+Provider Rate Limits
+Process-wide token buckets for calls to external providers
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+from src.common.config import get_settings
+from src.common.retry import DeadlineExceededError, current_deadline
+
+logger = logging.getLogger(__name__)
+
+# Limiter name → Settings field holding its per-minute rate
+PROVIDER_LIMITS = {
+    "news": "news_requests_per_minute",
+    "llm": "llm_requests_per_minute",
+    "tts_characters": "tts_characters_per_minute",
+}
+
+
+class RateLimiter:
+    """Token bucket refilled at rate_per_minute, holding at most one minute's worth
+
+    acquire() reserves tokens immediately and sleeps off any debt, so
+    callers are served in arrival order without a lock and a burst of
+    concurrent episodes cannot exceed the provider's limit.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.waited_seconds = 0.0
+        self.acquired = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take amount tokens now and return the seconds to wait before using them"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            self.acquired += amount
+            return max(-self.tokens / self.rate, 0.0)
+
+    def refund(self, amount: float) -> None:
+        with self._lock:
+            amount = min(amount, self.capacity)
+            self.tokens += amount
+            self.acquired -= amount
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until amount tokens are available; fails fast if the deadline is nearer"""
+        delay = self.reserve(amount)
+        if not delay:
+            return
+        deadline = current_deadline()
+        remaining = deadline.remaining() if deadline else None
+        if remaining is not None and delay > remaining:
+            self.refund(amount)
+            raise DeadlineExceededError(f"{self.name}: rate limit wait {delay:.1f}s exceeds deadline")
+        logger.debug(f"{self.name}: rate limited for {delay:.2f}s")
+        self.waited_seconds += delay
+        await asyncio.sleep(delay)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(name: str) -> RateLimiter:
+    """Process-wide limiter for a provider listed in PROVIDER_LIMITS"""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        rate = getattr(get_settings(), PROVIDER_LIMITS[name])
+        limiter = _limiters.setdefault(name, RateLimiter(name, rate))
+    return limiter
+
+
+def rate_limit_metrics() -> Dict[str, Dict[str, float]]:
+    """Units acquired and seconds spent waiting, per limiter"""
+    return {
+        name: {"acquired": limiter.acquired, "waited_seconds": round(limiter.waited_seconds, 3)}
+        for name, limiter in _limiters.items()
+    }
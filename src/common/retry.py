@@ -0,0 +1,251 @@
+"""
+Retry Policy
+Typed retry classification, full-jitter backoff and deadline budgets for outbound calls
+"""
+
+import asyncio
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+import httpx
+import requests
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class RetryableError(Exception):
+    """Transient failure worth retrying, optionally with a server-requested delay"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RetryExhaustedError(Exception):
+    """All attempts failed with retryable errors"""
+    pass
+
+
+class DeadlineExceededError(Exception):
+    """The deadline budget ran out before the call could succeed"""
+    pass
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Seconds to wait from a Retry-After value (delta seconds or HTTP date)"""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def classify(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """Whether an error is transient, and the delay the server asked for"""
+    if isinstance(error, RetryableError):
+        return True, error.retry_after
+
+    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+        return True, None
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        return response.status_code in RETRYABLE_STATUS, parse_retry_after(response.headers.get("Retry-After"))
+
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True, None
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        response = error.response
+        return response.status_code in RETRYABLE_STATUS, parse_retry_after(response.headers.get("Retry-After"))
+
+    if isinstance(error, asyncio.TimeoutError):
+        return True, None
+    return False, None
+
+
+class Deadline:
+    """Absolute point in (monotonic) time by which work must finish"""
+
+    def __init__(self, seconds: Optional[float]):
+        self.at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, None when unbounded"""
+        if self.at is None:
+            return None
+        return max(self.at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.at is not None and time.monotonic() >= self.at
+
+    def earliest(self, other: Optional["Deadline"]) -> "Deadline":
+        if other is None or other.at is None:
+            return self
+        if self.at is None or other.at < self.at:
+            return other
+        return self
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "current_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the enclosing deadline_scope, if any"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Deadline]:
+    """Bound everything inside (including spawned tasks) by a time budget
+
+    Scopes nest: an inner scope can only tighten the enclosing deadline.
+    """
+    deadline = Deadline(seconds).earliest(_current_deadline.get())
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining_timeout(default: float) -> float:
+    """Timeout for a single request: the default, capped by the current deadline"""
+    deadline = _current_deadline.get()
+    remaining = deadline.remaining() if deadline else None
+    if remaining is None:
+        return default
+    return max(min(default, remaining), 0.001)
+
+
+@dataclass
+class RetryStats:
+    """Counters for one retry policy"""
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    successes: int = 0
+    failures: int = 0
+    exhausted: int = 0
+    deadline_exceeded: int = 0
+    sleep_seconds: float = 0.0
+
+
+_stats: Dict[str, RetryStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name: str, **increments) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(name, RetryStats())
+        for key, value in increments.items():
+            setattr(stats, key, getattr(stats, key) + value)
+
+
+def retry_metrics() -> Dict[str, dict]:
+    """Snapshot of retry counters per policy"""
+    with _stats_lock:
+        return {name: dict(vars(stats)) for name, stats in _stats.items()}
+
+
+@dataclass
+class RetryPolicy:
+    """How an outbound call is retried
+
+    Delays use full jitter: a uniform draw between zero and the capped
+    exponential backoff, so clients that failed together do not retry
+    together. A server-sent Retry-After is a floor on the delay. Each
+    attempt is bounded by attempt_timeout, and the whole call (retries
+    and sleeps included) by the earliest of the policy's own deadline
+    and the enclosing deadline_scope.
+    """
+
+    name: str
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 10.0
+    attempt_timeout: Optional[float] = None
+    deadline: Optional[float] = None
+    classifier: Callable[[BaseException], Tuple[bool, Optional[float]]] = field(default=classify, repr=False)
+
+    def start(self) -> Deadline:
+        """Deadline for a new call"""
+        return Deadline(self.deadline).earliest(_current_deadline.get())
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number attempt + 1"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def call(self, func: Callable[..., Awaitable], *args, **kwargs):
+        """Await func(*args, **kwargs) under this policy"""
+        deadline = self.start()
+        attempt = 0
+        while True:
+            try:
+                result = await self._attempt(func, args, kwargs, deadline)
+            except Exception as e:
+                await self.pause(e, attempt, deadline)
+                attempt += 1
+                continue
+            _record(self.name, calls=1, attempts=attempt + 1, successes=1)
+            return result
+
+    async def _attempt(self, func, args, kwargs, deadline: Deadline):
+        timeout = self.attempt_timeout
+        remaining = deadline.remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceededError(f"{self.name}: deadline exceeded")
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        if timeout is None:
+            return await func(*args, **kwargs)
+        return await asyncio.wait_for(func(*args, **kwargs), timeout)
+
+    async def pause(self, error: Exception, attempt: int, deadline: Deadline) -> None:
+        """Sleep before the next attempt, or raise if the call should stop
+
+        Non-retryable errors are re-raised as is. Running out of attempts
+        raises RetryExhaustedError, and a delay that would overrun the
+        deadline raises DeadlineExceededError, both chained to the error.
+        """
+        retryable, retry_after = self.classifier(error)
+        if isinstance(error, DeadlineExceededError):
+            retryable = False
+
+        if not retryable:
+            _record(self.name, calls=1, attempts=attempt + 1, failures=1)
+            raise error
+
+        if attempt + 1 >= self.max_attempts:
+            _record(self.name, calls=1, attempts=attempt + 1, failures=1, exhausted=1)
+            raise RetryExhaustedError(f"Max retries exceeded: {error}") from error
+
+        delay = self.backoff(attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        remaining = deadline.remaining()
+        if remaining is not None and delay >= remaining:
+            _record(self.name, calls=1, attempts=attempt + 1, failures=1, deadline_exceeded=1)
+            raise DeadlineExceededError(
+                f"{self.name}: no time left to retry ({remaining:.1f}s remaining): {error}"
+            ) from error
+
+        logger.info(f"{self.name}: attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s")
+        _record(self.name, retries=1, sleep_seconds=delay)
+        await asyncio.sleep(delay)
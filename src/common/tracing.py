@@ -0,0 +1,141 @@
+"""
+Pipeline Tracing
+Monotonic-timed spans for pipeline stages and outbound calls, batch-written to generation_logs
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+
+from src.common.metrics import counter, histogram
+from src.models.episode import GenerationLog
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50  # spans buffered before a write
+
+STAGE_SECONDS = histogram("pipeline_stage_seconds", "Pipeline stage duration", ("stage", "status"))
+CALL_SECONDS = histogram("outbound_call_seconds", "Outbound call latency", ("call", "status"))
+CALL_BYTES = counter("outbound_call_bytes_total", "Bytes transferred by outbound calls", ("call",))
+
+
+class Trace:
+    """Spans of one pipeline run, written to the sink in batches
+
+    Spans may finish on worker threads (storage, DB), so the buffer is
+    locked. Writes happen off the event loop; a failing sink loses the
+    batch but never the run.
+    """
+
+    def __init__(self, episode_id: str, sink: Callable[[List[GenerationLog]], None], batch_size: int = BATCH_SIZE):
+        self.run_id = uuid.uuid4().hex
+        self.episode_id = episode_id
+        self.sink = sink
+        self.batch_size = batch_size
+        self._pending: List[GenerationLog] = []
+        self._lock = threading.Lock()
+
+    def add(self, log: GenerationLog) -> None:
+        with self._lock:
+            self._pending.append(log)
+            full = len(self._pending) >= self.batch_size
+        if not full:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()  # already on a worker thread
+        else:
+            loop.run_in_executor(None, self.flush)
+
+    def flush(self) -> None:
+        """Write buffered spans"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        # The write's own DB spans must not be traced back into this trace
+        token = _current_trace.set(None)
+        try:
+            self.sink(batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} generation logs: {e}")
+        finally:
+            _current_trace.reset(token)
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+_current_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_stage", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    """Trace of the enclosing trace_scope, if any"""
+    return _current_trace.get()
+
+
+@asynccontextmanager
+async def trace_scope(episode_id: str, sink: Callable[[List[GenerationLog]], None] = None) -> AsyncIterator[Trace]:
+    """Record every span inside (including spawned tasks and threads) for one run"""
+    if sink is None:
+        from src.db.generation_logs import get_generation_log_repository
+        sink = get_generation_log_repository().save_many
+    trace = Trace(episode_id, sink)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        await asyncio.to_thread(trace.flush)
+
+
+def _status(error: BaseException) -> str:
+    if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+        return "cancelled"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timed_out"
+    return "failed"
+
+
+@contextmanager
+def span(name: str, kind: str = "call") -> Iterator[GenerationLog]:
+    """Time the block as a span; set .bytes on the yielded record to log a size
+
+    Every span is observed in the stage or call latency histogram; inside
+    a trace_scope it is also logged. A stage span becomes the stage of
+    every span opened inside it.
+    """
+    trace = _current_trace.get()
+    stage = name if kind == "stage" else _current_stage.get()
+    log = GenerationLog(
+        log_id=uuid.uuid4().hex,
+        run_id=trace.run_id if trace else "",
+        episode_id=trace.episode_id if trace else "",
+        stage=stage,
+        name=name,
+        kind=kind
+    )
+    token = _current_stage.set(stage) if kind == "stage" else None
+    started = time.monotonic()
+    try:
+        yield log
+    except BaseException as e:
+        log.status = _status(e)
+        log.error_message = str(e) or type(e).__name__
+        raise
+    finally:
+        seconds = time.monotonic() - started
+        log.duration_ms = int(seconds * 1000)
+        if token is not None:
+            _current_stage.reset(token)
+            STAGE_SECONDS.labels(name, log.status).observe(seconds)
+        else:
+            CALL_SECONDS.labels(name, log.status).observe(seconds)
+            if log.bytes:
+                CALL_BYTES.labels(name).inc(log.bytes)
+        if trace is not None:
+            trace.add(log)
@@ -0,0 +1,105 @@
+"""
+Warm-up
+Connections and caches prepared at startup, and the readiness they gate
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+from src.common.metrics import gauge
+
+logger = logging.getLogger(__name__)
+
+STEP_SECONDS = gauge("warmup_step_seconds", "Duration of the last run of each warm-up step", ("step",))
+
+
+class Warmup:
+    """Runs named blocking steps concurrently in worker threads
+
+    The instance is ready once every step has succeeded. Running again
+    only repeats failed steps, so a dependency that was down at startup
+    does not keep the instance unready for good.
+    """
+
+    def __init__(self, steps: Dict[str, Callable[[], None]], timeout: float = 30.0):
+        self.steps = steps
+        self.timeout = timeout
+        self.status: Dict[str, str] = {name: "pending" for name in steps}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return all(status == "ok" for status in self.status.values())
+
+    def start(self) -> asyncio.Task:
+        """Run unfinished steps in the background; no-op while a run is in progress"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    async def run(self) -> bool:
+        started = time.monotonic()
+        pending = [name for name, status in self.status.items() if status != "ok"]
+        await asyncio.gather(*(self._run_step(name) for name in pending))
+        logger.info(f"Warm-up {'done' if self.ready else 'incomplete'} in {time.monotonic() - started:.2f}s: {self.status}")
+        return self.ready
+
+    async def _run_step(self, name: str) -> None:
+        self.status[name] = "running"
+        started = time.monotonic()
+        try:
+            # A step that times out keeps its thread; the next run retries it
+            await asyncio.wait_for(asyncio.to_thread(self.steps[name]), timeout=self.timeout)
+        except Exception as e:
+            self.status[name] = f"failed: {e or type(e).__name__}"
+            logger.warning(f"Warm-up step {name} failed: {e!r}")
+        else:
+            self.status[name] = "ok"
+        STEP_SECONDS.labels(name).set(time.monotonic() - started)
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+def _warm_db() -> None:
+    from src.db.episodes import get_episode_repository
+
+    # Repositories share one YDB client, so warming one warms them all
+    get_episode_repository().db.warm_up()
+
+
+def _warm_storage() -> None:
+    from src.storage.s3_client import get_storage
+
+    get_storage().warm_up()
+
+
+def _warm_portal() -> None:
+    from src.portal.cache import get_episode_cache
+
+    get_episode_cache().warm_up()
+
+
+def default_steps() -> Dict[str, Callable[[], None]]:
+    """DB driver and session pool, storage client, then the portal cache"""
+    return {"db": _warm_db, "storage": _warm_storage, "portal_cache": _warm_portal}
+
+
+_warmup: Optional[Warmup] = None
+
+
+def get_warmup() -> Optional[Warmup]:
+    """The warm-up started by start_warmup(), if any"""
+    return _warmup
+
+
+def start_warmup(timeout: float, steps: Dict[str, Callable[[], None]] = None) -> Warmup:
+    """Start the process-wide warm-up on the running loop"""
+    global _warmup
+    _warmup = Warmup(steps or default_steps(), timeout=timeout)
+    _warmup.start()
+    return _warmup
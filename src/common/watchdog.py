@@ -0,0 +1,155 @@
+"""
+Event Loop Watchdog
+Measures event-loop lag and reports the call sites of callbacks that block the loop
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter as Tally, deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional
+
+from src.common.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+LAG_SECONDS = histogram(
+    "event_loop_lag_seconds", "Delay of a scheduled wake-up on the event loop",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+LAG_LATEST = gauge("event_loop_lag_latest_seconds", "Most recent event loop lag")
+BLOCKED = counter("event_loop_blocked_total", "Callbacks that blocked the event loop", ("site",))
+BLOCKED_SECONDS = counter("event_loop_blocked_seconds_total", "Time the event loop was blocked", ("site",))
+
+# Frames from these paths are skipped when naming the site of a block
+_LIBRARY_MARKERS = ("site-packages", "dist-packages", f"{sys.prefix}/lib/python", "asyncio")
+
+
+@dataclass
+class BlockReport:
+    """One stretch during which the loop did not run its heartbeat"""
+    seconds: float
+    site: str  # innermost application frame, file:line in function
+    stack: List[str] = field(default_factory=list)  # formatted frames, outermost first
+
+
+def _site(frames: List[traceback.FrameSummary]) -> str:
+    if not frames:
+        return "unknown"
+    application = [f for f in frames if not any(marker in f.filename for marker in _LIBRARY_MARKERS)]
+    frame = (application or frames)[-1]
+    filename = frame.filename
+    if filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f"{filename}:{frame.lineno} in {frame.name}"
+
+
+class LoopWatchdog:
+    """Heartbeat on the loop plus a sampling thread that watches it
+
+    The heartbeat wakes every interval and records how late it woke (the
+    loop lag). When the heartbeat has not run for threshold seconds, the
+    thread samples the loop thread's stack; when the loop comes back, the
+    most frequent sample names the blocking call site in the log and in
+    event_loop_blocked_total. Sampling reads one frame stack per interval,
+    so the overhead stays small while the loop is healthy.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.02, history: int = 100):
+        self.threshold = threshold
+        self.interval = interval
+        self.reports: Deque[BlockReport] = deque(maxlen=history)
+        self._beat = time.monotonic()
+        self._samples: List[List[traceback.FrameSummary]] = []
+        self._blocked_since: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start watching the running loop"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat = self._loop.create_task(self._run_heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Loop watchdog started (threshold {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+        if self._blocked_since is not None:
+            self._report(time.monotonic() - self._blocked_since)
+
+    async def __aenter__(self) -> "LoopWatchdog":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _run_heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - expected, 0.0)
+            LAG_SECONDS.observe(lag)
+            LAG_LATEST.set(lag)
+            self._beat = now
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            stalled = time.monotonic() - self._beat
+            if stalled >= self.threshold:
+                if self._blocked_since is None:
+                    self._blocked_since = self._beat
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._samples.append(traceback.extract_stack(frame))
+            elif self._blocked_since is not None:
+                self._report(max(self._beat - self._blocked_since - self.interval, 0.0))
+
+    def _report(self, seconds: float) -> None:
+        samples, self._samples, self._blocked_since = self._samples, [], None
+        if not samples:
+            return
+        sites = Tally(_site(frames) for frames in samples)
+        site = sites.most_common(1)[0][0]
+        stack = next(frames for frames in samples if _site(frames) == site)
+        report = BlockReport(seconds, site, [line.rstrip() for line in traceback.format_list(stack)])
+        self.reports.append(report)
+        BLOCKED.labels(site).inc()
+        BLOCKED_SECONDS.labels(site).inc(seconds)
+        logger.warning(
+            f"Event loop blocked for {seconds * 1000:.0f}ms at {site}\n" + "\n".join(report.stack[-8:])
+        )
+
+
+_watchdog: Optional[LoopWatchdog] = None
+
+
+def get_watchdog() -> Optional[LoopWatchdog]:
+    """The watchdog started by start_watchdog(), if any"""
+    return _watchdog
+
+
+def start_watchdog(threshold: float) -> LoopWatchdog:
+    """Start the process-wide watchdog on the running loop"""
+    global _watchdog
+    _watchdog = LoopWatchdog(threshold=threshold, interval=min(threshold / 4, 0.05))
+    _watchdog.start()
+    return _watchdog
@@ -0,0 +1,80 @@
+"""
+Episode Repository
+Stores and loads episodes through the database client
+"""
+
+import json
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from src.db.ydb_client import get_db
+from src.models.episode import Episode
+
+logger = logging.getLogger(__name__)
+
+EPISODE_COLUMNS = {
+    "episode_id": "Utf8",
+    "date": "Date",
+    "status": "Utf8",
+    "article_count": "Int32",
+    "script_text": "Utf8",
+    "script_word_count": "Int32",
+    "audio_url": "Utf8",
+    "audio_duration_seconds": "Int32",
+    "audio_file_size_bytes": "Int64",
+    "audio_renditions": "Json",
+    "hls_url": "Utf8",
+    "published_at": "Timestamp",
+    "created_at": "Timestamp",
+}
+
+
+class EpisodeRepository:
+    """Episodes table access"""
+
+    TABLE = "episodes"
+
+    def __init__(self, db=None):
+        self.db = db or get_db()
+
+    def save(self, episode: Episode) -> None:
+        """Insert or replace an episode"""
+        row = episode.model_dump(mode="python")
+        row["audio_renditions"] = [r.model_dump() for r in episode.audio_renditions]
+        self.db.insert(self.TABLE, {k: row.get(k) for k in EPISODE_COLUMNS}, types=EPISODE_COLUMNS)
+
+    def get(self, episode_id: str) -> Optional[Episode]:
+        """Load one episode"""
+        rows = self.db.select(self.TABLE, {"episode_id": episode_id}, limit=1)
+        return _from_row(rows[0]) if rows else None
+
+    def list_recent(self, limit: int = 30) -> List[Episode]:
+        """Episodes newest first"""
+        episodes = [_from_row(row) for row in self.db.select(self.TABLE, limit=1000)]
+        episodes.sort(key=lambda e: e.date, reverse=True)
+        return episodes[:limit]
+
+
+def _from_row(row: dict) -> Episode:
+    """Episode from a row as returned by YDB (ints/JSON text) or MemoryDB (Python values)"""
+    data = {k: v for k, v in row.items() if k in EPISODE_COLUMNS and v is not None}
+    if isinstance(data.get("date"), int):
+        data["date"] = date(1970, 1, 1) + timedelta(days=data["date"])
+    for key in ("published_at", "created_at"):
+        if isinstance(data.get(key), int):
+            data[key] = datetime.fromtimestamp(data[key] / 1_000_000, tz=timezone.utc)
+    if isinstance(data.get("audio_renditions"), (str, bytes)):
+        data["audio_renditions"] = json.loads(data["audio_renditions"])
+    return Episode(**data)
+
+
+_repository: Optional[EpisodeRepository] = None
+
+
+def get_episode_repository() -> EpisodeRepository:
+    """Process-wide repository (keeps one in-memory database in development)"""
+    global _repository
+    if _repository is None:
+        _repository = EpisodeRepository()
+    return _repository
@@ -0,0 +1,112 @@
+"""
+Generation Log Repository
+Stage and call spans of pipeline runs, and latency percentiles over them
+"""
+
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.db.ydb_client import get_db
+from src.models.episode import GenerationLog
+
+logger = logging.getLogger(__name__)
+
+LOG_COLUMNS = {
+    "log_id": "Utf8",
+    "run_id": "Utf8",
+    "episode_id": "Utf8",
+    "stage": "Utf8",
+    "name": "Utf8",
+    "kind": "Utf8",
+    "status": "Utf8",
+    "error_message": "Utf8",
+    "duration_ms": "Int32",
+    "bytes": "Int64",
+    "timestamp": "Timestamp",
+}
+
+# Upper bound on stage spans one run writes, for sizing index reads
+MAX_STAGES_PER_RUN = 20
+
+
+def percentile(values: List[int], fraction: float) -> int:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)), 1) - 1]
+
+
+class GenerationLogRepository:
+    """generation_logs table access"""
+
+    TABLE = "generation_logs"
+
+    def __init__(self, db=None):
+        self.db = db or get_db()
+
+    def save_many(self, logs: List[GenerationLog]) -> None:
+        """Write a batch of spans in one query"""
+        rows = [log.model_dump(mode="python") for log in logs]
+        self.db.insert_many(self.TABLE, rows, types=LOG_COLUMNS)
+
+    def list_run(self, run_id: str) -> List[GenerationLog]:
+        """Spans of one run in start order"""
+        rows = self.db.select(self.TABLE, {"run_id": run_id}, limit=1000, index="idx_run_id")
+        logs = [_from_row(row) for row in rows]
+        return sorted(logs, key=lambda log: log.timestamp)
+
+    def recent_run_ids(self, runs: int = 20) -> List[str]:
+        """The last runs, newest first, read backwards from idx_kind_timestamp"""
+        rows = self.db.select(
+            self.TABLE, {"kind": "stage"}, limit=runs * MAX_STAGES_PER_RUN,
+            order_by="timestamp DESC", index="idx_kind_timestamp"
+        )
+        run_ids = list(dict.fromkeys(row["run_id"] for row in rows))
+        return run_ids[:runs]
+
+    def stage_percentiles(self, runs: int = 20) -> Dict[str, Dict[str, int]]:
+        """p50/p95 duration per stage over the last runs
+
+        Only completed stages count, so failures and timeouts do not skew
+        the latency of the work that succeeded.
+        """
+        run_ids = self.recent_run_ids(runs)
+        if not run_ids:
+            return {}
+        rows = self.db.select(
+            self.TABLE, {"run_id": run_ids, "kind": "stage"},
+            limit=len(run_ids) * MAX_STAGES_PER_RUN, index="idx_run_id"
+        )
+        by_stage: Dict[str, List[int]] = {}
+        for log in map(_from_row, rows):
+            if log.status == "completed":
+                by_stage.setdefault(log.name, []).append(log.duration_ms)
+
+        return {
+            stage: {
+                "runs": len(durations),
+                "p50_ms": percentile(durations, 0.50),
+                "p95_ms": percentile(durations, 0.95),
+            }
+            for stage, durations in by_stage.items()
+        }
+
+
+def _from_row(row: dict) -> GenerationLog:
+    """GenerationLog from a YDB row (microseconds) or a MemoryDB row"""
+    data = {k: v for k, v in row.items() if k in LOG_COLUMNS and v is not None}
+    if isinstance(data.get("timestamp"), int):
+        data["timestamp"] = datetime.fromtimestamp(data["timestamp"] / 1_000_000, tz=timezone.utc)
+    return GenerationLog(**data)
+
+
+_repository: Optional[GenerationLogRepository] = None
+
+
+def get_generation_log_repository() -> GenerationLogRepository:
+    """Process-wide repository (keeps one in-memory database in development)"""
+    global _repository
+    if _repository is None:
+        _repository = GenerationLogRepository()
+    return _repository
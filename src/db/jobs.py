@@ -0,0 +1,75 @@
+"""
+Generation Job Repository
+Stores job records of the automation queue
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from src.db.ydb_client import get_db
+from src.models.episode import GenerationJob
+
+logger = logging.getLogger(__name__)
+
+JOB_COLUMNS = {
+    "job_id": "Utf8",
+    "target_date": "Date",
+    "resume": "Bool",
+    "status": "Utf8",
+    "created_at": "Timestamp",
+    "started_at": "Timestamp",
+    "finished_at": "Timestamp",
+    "error_message": "Utf8",
+    "episode_status": "Utf8",
+    "owner": "Utf8",
+    "heartbeat_at": "Timestamp",
+}
+
+
+class JobRepository:
+    """generation_jobs table access"""
+
+    TABLE = "generation_jobs"
+
+    def __init__(self, db=None):
+        self.db = db or get_db()
+
+    def save(self, job: GenerationJob) -> None:
+        """Insert or replace a job record"""
+        row = job.model_dump(mode="python")
+        self.db.insert(self.TABLE, {k: row.get(k) for k in JOB_COLUMNS}, types=JOB_COLUMNS)
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Load one job"""
+        rows = self.db.select(self.TABLE, {"job_id": job_id}, limit=1)
+        return _from_row(rows[0]) if rows else None
+
+    def list_active(self) -> List[GenerationJob]:
+        """Jobs recorded as queued or running"""
+        rows = []
+        for status in ("queued", "running"):
+            rows.extend(self.db.select(self.TABLE, {"status": status}, limit=1000))
+        return [_from_row(row) for row in rows]
+
+
+def _from_row(row: dict) -> GenerationJob:
+    """GenerationJob from a YDB row (days/microseconds) or a MemoryDB row"""
+    data = {k: v for k, v in row.items() if k in JOB_COLUMNS and v is not None}
+    if isinstance(data.get("target_date"), int):
+        data["target_date"] = date(1970, 1, 1) + timedelta(days=data["target_date"])
+    for key in ("created_at", "started_at", "finished_at", "heartbeat_at"):
+        if isinstance(data.get(key), int):
+            data[key] = datetime.fromtimestamp(data[key] / 1_000_000, tz=timezone.utc)
+    return GenerationJob(**data)
+
+
+_repository: Optional[JobRepository] = None
+
+
+def get_job_repository() -> JobRepository:
+    """Process-wide repository (keeps one in-memory database in development)"""
+    global _repository
+    if _repository is None:
+        _repository = JobRepository()
+    return _repository
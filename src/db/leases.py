@@ -0,0 +1,114 @@
+"""
+Lease Repository
+Expiring, fenced leases stored in the database
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from src.db.ydb_client import get_db
+
+logger = logging.getLogger(__name__)
+
+LEASE_COLUMNS = {
+    "name": "Utf8",
+    "owner": "Utf8",
+    "token": "Int64",
+    "expires_at": "Timestamp",
+}
+
+
+@dataclass
+class Lease:
+    """A held lease; token increases with every new holder (fencing token)"""
+    name: str
+    owner: str
+    token: int
+    expires_at: datetime
+
+
+def _timestamp(value) -> datetime:
+    """Timestamp column as an aware datetime (YDB returns microseconds)"""
+    if isinstance(value, int):
+        return datetime.fromtimestamp(value / 1_000_000, tz=timezone.utc)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class LeaseRepository:
+    """leases table access
+
+    Every change is a conditional upsert (read and write in one serializable
+    transaction), so two workers can never both hold the same lease. An
+    expired lease is free for anyone; released leases keep their row so
+    tokens never go backwards.
+    """
+
+    TABLE = "leases"
+
+    def __init__(self, db=None, clock: Callable[[], datetime] = None):
+        self.db = db or get_db()
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def acquire(self, name: str, owner: str, ttl_seconds: float) -> Optional[Lease]:
+        """Take the lease if it is free or expired; None if someone else holds it"""
+        now = self.clock()
+
+        def change(row: Optional[dict]) -> Optional[dict]:
+            if row and _timestamp(row["expires_at"]) > now:
+                return None
+            token = (row["token"] if row else 0) + 1
+            return {"owner": owner, "token": token, "expires_at": now + timedelta(seconds=ttl_seconds)}
+
+        row = self.db.update_row(self.TABLE, {"name": name}, change, types=LEASE_COLUMNS)
+        if row is None:
+            return None
+        return Lease(name, owner, row["token"], row["expires_at"])
+
+    def renew(self, lease: Lease, ttl_seconds: float) -> bool:
+        """Extend a lease still held by its owner; False once it has been lost"""
+        now = self.clock()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+
+        def change(row: Optional[dict]) -> Optional[dict]:
+            if not row or row["owner"] != lease.owner or row["token"] != lease.token:
+                return None
+            if _timestamp(row["expires_at"]) <= now:
+                return None
+            return {"owner": lease.owner, "token": lease.token, "expires_at": expires_at}
+
+        if self.db.update_row(self.TABLE, {"name": lease.name}, change, types=LEASE_COLUMNS) is None:
+            return False
+        lease.expires_at = expires_at
+        return True
+
+    def release(self, lease: Lease) -> None:
+        """Expire a lease now, if it is still ours"""
+        now = self.clock()
+
+        def change(row: Optional[dict]) -> Optional[dict]:
+            if not row or row["owner"] != lease.owner or row["token"] != lease.token:
+                return None
+            return {"owner": lease.owner, "token": lease.token, "expires_at": now}
+
+        self.db.update_row(self.TABLE, {"name": lease.name}, change, types=LEASE_COLUMNS)
+
+    def holder(self, name: str) -> Optional[Lease]:
+        """Current unexpired lease, if any"""
+        rows = self.db.select(self.TABLE, {"name": name}, limit=1)
+        if not rows or _timestamp(rows[0]["expires_at"]) <= self.clock():
+            return None
+        row = rows[0]
+        return Lease(name, row["owner"], row["token"], _timestamp(row["expires_at"]))
+
+
+_repository: Optional[LeaseRepository] = None
+
+
+def get_lease_repository() -> LeaseRepository:
+    """Process-wide repository (keeps one in-memory database in development)"""
+    global _repository
+    if _repository is None:
+        _repository = LeaseRepository()
+    return _repository
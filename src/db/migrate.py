@@ -0,0 +1,95 @@
+"""
+Schema Migrations
+Applies migrations/tables.yql and then migrations/NNNN_*.yql in order, once each
+
+Applied migrations are recorded in schema_migrations. Statements are also
+idempotent on their own: CREATE TABLE is skipped for an existing table and
+ALTER TABLE ... ADD COLUMN / ADD INDEX for a column or index that already
+exists, so a database created from an older or newer baseline converges
+to the same schema. Each ALTER statement should make one change.
+"""
+
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+BASELINE = "tables.yql"
+TABLE = "schema_migrations"
+
+_CREATE = re.compile(r"^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?", re.IGNORECASE)
+_ALTER = re.compile(r"^ALTER\s+TABLE\s+`?(\w+)`?", re.IGNORECASE)
+_ADD_COLUMN = re.compile(r"ADD\s+COLUMN\s+`?(\w+)`?", re.IGNORECASE)
+_ADD_INDEX = re.compile(r"ADD\s+INDEX\s+`?(\w+)`?", re.IGNORECASE)
+_NUMBERED = re.compile(r"^\d{4}_\w+\.yql$")
+
+
+def migration_files(directory: Path = MIGRATIONS_DIR) -> List[Path]:
+    """Baseline first, then numbered migrations in order"""
+    numbered = sorted(p for p in directory.iterdir() if _NUMBERED.match(p.name))
+    baseline = directory / BASELINE
+    return ([baseline] if baseline.exists() else []) + numbered
+
+
+def split_statements(text: str) -> List[str]:
+    """YQL statements of a script, without comments"""
+    lines = [line.split("--", 1)[0] for line in text.splitlines()]
+    return [" ".join(s.split()) for s in "\n".join(lines).split(";") if s.strip()]
+
+
+def is_applied(statement: str, db) -> bool:
+    """Whether the change a statement makes is already in the schema"""
+    create = _CREATE.match(statement)
+    if create:
+        return db.describe_table(create.group(1)) is not None
+    alter = _ALTER.match(statement)
+    if alter:
+        existing = db.describe_table(alter.group(1))
+        if existing is None:
+            return False
+        columns = _ADD_COLUMN.findall(statement)
+        indexes = _ADD_INDEX.findall(statement)
+        if columns or indexes:
+            return set(columns) <= existing["columns"] and set(indexes) <= existing["indexes"]
+    return False
+
+
+def apply_migrations(db, directory: Path = MIGRATIONS_DIR, log=print) -> List[str]:
+    """Apply pending migrations; returns the names applied"""
+    bookkeeping = f"CREATE TABLE {TABLE} (name Utf8, applied_at Timestamp, PRIMARY KEY (name))"
+    if not is_applied(bookkeeping, db):
+        db.execute_scheme(bookkeeping)
+    done = {row["name"] for row in db.select(TABLE, limit=10000)}
+
+    applied = []
+    for path in migration_files(directory):
+        if path.name in done:
+            continue
+        for statement in split_statements(path.read_text(encoding="utf-8")):
+            if is_applied(statement, db):
+                log(f"  {path.name}: already in schema: {statement[:60]}")
+                continue
+            db.execute_scheme(statement)
+        db.insert(TABLE, {"name": path.name, "applied_at": datetime.now(timezone.utc)},
+                  types={"applied_at": "Timestamp"})
+        log(f"Applied {path.name}")
+        applied.append(path.name)
+    return applied
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.db.ydb_client import YDBClient, get_db
+
+    db = get_db()
+    if not isinstance(db, YDBClient):
+        print("YDB_ENDPOINT and the ydb package are required to run migrations", file=sys.stderr)
+        return 1
+    applied = apply_migrations(db)
+    print(f"{len(applied)} migration(s) applied" if applied else "Schema is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,75 @@
+"""
+Pipeline State Repository
+Per-stage checkpoints that let an episode pipeline resume
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from src.db.ydb_client import get_db
+from src.models.episode import PipelineState
+
+logger = logging.getLogger(__name__)
+
+STATE_COLUMNS = {
+    "episode_id": "Utf8",
+    "stage": "Utf8",
+    "status": "Utf8",
+    "started_at": "Timestamp",
+    "completed_at": "Timestamp",
+    "duration_ms": "Int64",
+    "error_message": "Utf8",
+    "retry_count": "Int32",
+    "inputs": "Json",
+    "outputs": "Json",
+}
+
+
+class PipelineStateRepository:
+    """pipeline_states table access"""
+
+    TABLE = "pipeline_states"
+
+    def __init__(self, db=None):
+        self.db = db or get_db()
+
+    def save(self, state: PipelineState) -> None:
+        """Insert or replace the checkpoint for one stage"""
+        row = state.model_dump(mode="json")
+        row["started_at"] = state.started_at
+        row["completed_at"] = state.completed_at
+        self.db.insert(self.TABLE, {k: row.get(k) for k in STATE_COLUMNS}, types=STATE_COLUMNS)
+
+    def load(self, episode_id: str) -> Dict[str, PipelineState]:
+        """Checkpoints of an episode keyed by stage"""
+        rows = self.db.select(self.TABLE, {"episode_id": episode_id})
+        return {row["stage"]: _from_row(row) for row in rows}
+
+    def clear(self, episode_id: str) -> None:
+        """Forget all checkpoints so the next run starts from scratch"""
+        self.db.delete(self.TABLE, {"episode_id": episode_id})
+
+
+def _from_row(row: dict) -> PipelineState:
+    """PipelineState from a YDB row (microseconds/JSON text) or a MemoryDB row"""
+    data = {k: v for k, v in row.items() if k in STATE_COLUMNS and v is not None}
+    for key in ("started_at", "completed_at"):
+        if isinstance(data.get(key), int):
+            data[key] = datetime.fromtimestamp(data[key] / 1_000_000, tz=timezone.utc)
+    for key in ("inputs", "outputs"):
+        if isinstance(data.get(key), (str, bytes)):
+            data[key] = json.loads(data[key])
+    return PipelineState(**data)
+
+
+_repository: Optional[PipelineStateRepository] = None
+
+
+def get_pipeline_state_repository() -> PipelineStateRepository:
+    """Process-wide repository (keeps one in-memory database in development)"""
+    global _repository
+    if _repository is None:
+        _repository = PipelineStateRepository()
+    return _repository
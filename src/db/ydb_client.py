@@ -4,46 +4,162 @@ YDB Client for Yandex Database (Serverless)
 
 import os
 import json
-from typing import Optional, List, Dict, Any
+import threading
+import weakref
+from collections import OrderedDict
+from importlib.util import find_spec
+from datetime import date
+from typing import Callable, Optional, List, Dict, Any
 
-# YDB SDK is optional - works without it for basic operations
-try:
-    import ydb
-    HAS_YDB = True
-except ImportError:
-    HAS_YDB = False
+from src.common.metrics import counter
+from src.common.tracing import span
+
+# YDB SDK is optional - works without it for basic operations.
+# It pulls in grpc and protobuf, so it is imported on first connect, not here.
+HAS_YDB = find_spec("ydb") is not None
+
+
+_EPOCH = date(1970, 1, 1)
+
+PREPARED = counter("ydb_prepared_queries_total", "Prepared query lookups by result", ("result",))
+PREPARED_INVALIDATIONS = counter(
+    "ydb_prepared_query_invalidations_total", "Prepared query cache entries dropped after errors", ("reason",)
+)
+
+
+def _declared_type(ydb_type: str, value) -> str:
+    return f"Optional<{ydb_type}>" if value is None else ydb_type
+
+
+def _to_param(ydb_type: str, value):
+    """Python value to a YDB parameter value of the given type"""
+    if value is None:
+        return None
+    if ydb_type in ("Int32", "Int64", "Uint32", "Uint64"):
+        return int(value)
+    if ydb_type == "Double":
+        return float(value)
+    if ydb_type == "Bool":
+        return bool(value)
+    if ydb_type == "Date":
+        return (value - _EPOCH).days
+    if ydb_type == "Timestamp":
+        return int(value.timestamp() * 1_000_000)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+class PreparedQueryCache:
+    """Prepared queries per session, keyed by query text, least recently used evicted
+
+    A prepared query belongs to the session that prepared it, so entries
+    are kept per session and disappear with it. max_size=0 disables caching.
+    """
+
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._sessions: "weakref.WeakKeyDictionary[Any, OrderedDict]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def prepare(self, session, query: str):
+        """Cached session.prepare(query)"""
+        if self.max_size <= 0:
+            self.misses += 1
+            PREPARED.labels("miss").inc()
+            return session.prepare(query)
+        with self._lock:
+            queries = self._sessions.setdefault(session, OrderedDict())
+            prepared = queries.get(query)
+            if prepared is not None:
+                queries.move_to_end(query)
+                self.hits += 1
+                PREPARED.labels("hit").inc()
+                return prepared
+            self.misses += 1
+        PREPARED.labels("miss").inc()
+
+        # A session runs one operation at a time, so no other thread prepares on it meanwhile
+        prepared = session.prepare(query)
+        with self._lock:
+            queries[query] = prepared
+            while len(queries) > self.max_size:
+                queries.popitem(last=False)
+                self.evictions += 1
+        return prepared
+
+    def invalidate(self, session, reason: str = "session") -> None:
+        """Forget the queries prepared on a session (lost, expired, or its plans went missing)"""
+        with self._lock:
+            dropped = len(self._sessions.pop(session, ()))
+            self.invalidations += dropped
+        PREPARED_INVALIDATIONS.labels(reason).inc(dropped)
+
+    def clear(self, reason: str = "schema") -> None:
+        """Forget every prepared query, e.g. after a schema change made them stale"""
+        with self._lock:
+            dropped = sum(len(queries) for queries in self._sessions.values())
+            self._sessions.clear()
+            self.invalidations += dropped
+        PREPARED_INVALIDATIONS.labels(reason).inc(dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = sum(len(queries) for queries in self._sessions.values())
+            sessions = len(self._sessions)
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "sessions": sessions,
+            "entries": entries,
+        }
 
 
 class YDBClient:
     """Yandex Database client for serverless YDB"""
+
+    PREPARED_CACHE_SIZE = 128  # prepared queries kept per session
     
     def __init__(self):
         self.endpoint = os.getenv('YDB_ENDPOINT', '')
         self.database = os.getenv('YDB_DATABASE', '')
         self.driver = None
         self.pool = None
+        self.prepared = PreparedQueryCache(self.PREPARED_CACHE_SIZE)
+        self._connect_lock = threading.Lock()
     
     def _get_credentials(self):
         """Get YDB credentials"""
         if not HAS_YDB:
             return None
-            
+        import ydb
+
         # Try service account key file
         sa_key_file = os.getenv('YC_SA_KEY_FILE')
         if sa_key_file and os.path.exists(sa_key_file):
             return ydb.iam.ServiceAccountCredentials.from_file(sa_key_file)
-        
+
+        # Try IAM token (e.g. `yc iam create-token` for migrations run outside YC).
+        # Checked before the metadata service, whose credentials are created
+        # without error anywhere and only fail on the first request.
+        token = os.getenv('YC_TOKEN')
+        if token:
+            return ydb.credentials.AccessTokenCredentials(token)
+
         # Try metadata service (when running in YC)
         try:
             return ydb.iam.MetadataUrlCredentials()
         except:
             pass
         
-        # Try OAuth token
-        token = os.getenv('YC_TOKEN')
-        if token:
-            return ydb.credentials.AccessTokenCredentials(token)
-        
         return None
     
     def connect(self):
@@ -51,26 +167,60 @@ class YDBClient:
         if not HAS_YDB:
             raise RuntimeError("YDB SDK not installed. Run: pip install ydb")
         
-        if self.driver:
+        if self.pool:
             return
-        
-        driver_config = ydb.DriverConfig(
-            endpoint=self.endpoint,
-            database=self.database,
-            credentials=self._get_credentials()
-        )
-        
-        self.driver = ydb.Driver(driver_config)
-        self.driver.wait(timeout=10)
-        self.pool = ydb.SessionPool(self.driver)
+        import ydb
+
+        # Warm-up and the first requests may race to connect
+        with self._connect_lock:
+            if self.pool:
+                return
+            driver_config = ydb.DriverConfig(
+                endpoint=self.endpoint,
+                database=self.database,
+                credentials=self._get_credentials()
+            )
+
+            driver = ydb.Driver(driver_config)
+            driver.wait(timeout=10)
+            self.driver = driver
+            self.pool = ydb.SessionPool(driver)
+
+    def warm_up(self) -> None:
+        """Connect and create a pooled session, so the first query skips discovery"""
+        self.connect()
+        self.pool.retry_operation_sync(lambda session: None)
     
+    def execute_scheme(self, yql: str) -> None:
+        """Run a schema statement (CREATE / ALTER / DROP TABLE)"""
+        self.connect()
+        with span("db.query"):
+            self.pool.retry_operation_sync(lambda session: session.execute_scheme(yql))
+        self.prepared.clear(reason="schema")
+
+    def describe_table(self, table: str) -> Optional[Dict[str, set]]:
+        """Column and index names of a table, or None if it does not exist"""
+        self.connect()
+        import ydb
+
+        try:
+            description = self.pool.retry_operation_sync(
+                lambda session: session.describe_table(f"{self.database}/{table}")
+            )
+        except ydb.SchemeError:
+            return None
+        return {
+            "columns": {column.name for column in description.columns},
+            "indexes": {index.name for index in description.indexes},
+        }
+
     def execute(self, query: str, parameters: dict = None) -> List[Dict]:
         """Execute YQL query"""
         self.connect()
         
         def callee(session):
             if parameters:
-                prepared = session.prepare(query)
+                prepared = self.prepared.prepare(session, query)
                 result_sets = session.transaction().execute(
                     prepared,
                     parameters,
@@ -88,15 +238,44 @@ class YDBClient:
                     results.append(dict(row))
             return results
         
-        return self.pool.retry_operation_sync(callee)
+        with span("db.query"):
+            return self._retry(callee)
+
+    def _retry(self, callee: Callable):
+        """pool.retry_operation_sync, dropping prepared queries that the error made stale"""
+        import ydb
+
+        def guarded(session):
+            try:
+                return callee(session)
+            except ydb.NotFound:
+                # The server evicted a compiled query: prepare again on this session, once
+                self.prepared.invalidate(session, "not_found")
+                return callee(session)
+            except (ydb.BadSession, ydb.SessionExpired):
+                self.prepared.invalidate(session)
+                raise
+            except ydb.SchemeError:
+                self.prepared.clear()
+                raise
+
+        return self.pool.retry_operation_sync(guarded)
     
-    def insert(self, table: str, data: dict) -> bool:
-        """Insert record into table"""
+    def insert(self, table: str, data: dict, types: Dict[str, str] = None) -> bool:
+        """Insert record into table
+
+        Columns are declared as Utf8 unless types gives their YDB type
+        (Int32, Int64, Double, Bool, Date, Timestamp, Json, ...).
+        """
+        types = types or {}
         columns = ', '.join(data.keys())
         placeholders = ', '.join(f'${k}' for k in data.keys())
-        
+        declarations = ' '.join(
+            f'DECLARE ${k} AS {_declared_type(types.get(k, "Utf8"), v)};' for k, v in data.items()
+        )
+
         query = f"""
-            DECLARE ${' DECLARE $'.join(f'{k} AS Utf8;' for k in data.keys())}
+            {declarations}
             
             UPSERT INTO {table} ({columns})
             VALUES ({placeholders});
@@ -105,21 +284,56 @@ class YDBClient:
         # Convert values to proper types
         params = {}
         for k, v in data.items():
-            if isinstance(v, dict):
-                params[f'${k}'] = json.dumps(v)
-            else:
-                params[f'${k}'] = str(v) if v is not None else None
+            params[f'${k}'] = _to_param(types.get(k, "Utf8"), v)
         
         self.execute(query, params)
         return True
     
-    def select(self, table: str, where: dict = None, limit: int = 100) -> List[Dict]:
-        """Select records from table with parameterized query"""
+    def insert_many(self, table: str, rows: List[dict], types: Dict[str, str] = None) -> bool:
+        """Upsert many records in one query
+
+        All rows must have the same columns; typing is as for insert.
+        """
+        if not rows:
+            return True
+        types = types or {}
+        columns = list(rows[0].keys())
+        fields = ', '.join(f'{k}: Optional<{types.get(k, "Utf8")}>' for k in columns)
+        query = f"""
+            DECLARE $rows AS List<Struct<{fields}>>;
+
+            UPSERT INTO {table}
+            SELECT * FROM AS_TABLE($rows);
+        """
+        params = {'$rows': [
+            {k: _to_param(types.get(k, "Utf8"), row.get(k)) for k in columns} for row in rows
+        ]}
+        self.execute(query, params)
+        return True
+
+    def select(
+        self,
+        table: str,
+        where: dict = None,
+        limit: int = 100,
+        order_by: str = None,
+        index: str = None
+    ) -> List[Dict]:
+        """Select records from table with parameterized query
+
+        A list value in where matches any of its items (IN). order_by is a
+        column optionally followed by DESC; index reads through a secondary
+        index (VIEW).
+        """
         # Validate table name (alphanumeric and underscore only)
         if not table.replace('_', '').isalnum():
             raise ValueError(f"Invalid table name: {table}")
 
         query = f"SELECT * FROM {table}"  # nosec B608 - table name is validated
+        if index:
+            if not index.replace('_', '').isalnum():
+                raise ValueError(f"Invalid index name: {index}")
+            query += f" VIEW {index}"
         params = {}
 
         if where:
@@ -130,10 +344,20 @@ class YDBClient:
                 if not k.replace('_', '').isalnum():
                     raise ValueError(f"Invalid column name: {k}")
                 param_name = f"param{i}"
-                conditions.append(f"{k} = ${param_name}")
-                params[f"${param_name}"] = str(v) if v is not None else None
+                if isinstance(v, (list, tuple)):
+                    conditions.append(f"{k} IN ${param_name}")
+                    params[f"${param_name}"] = [str(item) for item in v]
+                else:
+                    conditions.append(f"{k} = ${param_name}")
+                    params[f"${param_name}"] = str(v) if v is not None else None
             query += " WHERE " + " AND ".join(conditions)
 
+        if order_by:
+            column, _, direction = order_by.partition(" ")
+            if not column.replace('_', '').isalnum() or direction.upper() not in ("", "ASC", "DESC"):
+                raise ValueError(f"Invalid order: {order_by}")
+            query += f" ORDER BY {order_by}"
+
         query += f" LIMIT {limit}"
 
         return self.execute(query, params if params else None)
@@ -158,6 +382,69 @@ class YDBClient:
         self.execute(query, params)
         return True
 
+    def update_row(
+        self,
+        table: str,
+        key: dict,
+        change: Callable[[Optional[dict]], Optional[dict]],
+        types: Dict[str, str] = None
+    ) -> Optional[dict]:
+        """Conditional upsert: read one row and write change(row) in one serializable transaction
+
+        change gets the current row (None if missing) and returns the row to
+        write, or None to leave it as is. If another writer commits first the
+        transaction aborts and is retried with the fresh row, so change must
+        not have side effects. Returns the row written, or None.
+        """
+        if not table.replace('_', '').isalnum() or not all(k.replace('_', '').isalnum() for k in key):
+            raise ValueError(f"Invalid table or key: {table}")
+        types = types or {}
+        self.connect()
+        import ydb
+
+        key_types = {k: types.get(k, "Utf8") for k in key}
+        select = ' '.join(f'DECLARE ${k} AS {t};' for k, t in key_types.items())
+        select += f" SELECT * FROM {table} WHERE " + " AND ".join(f"{k} = ${k}" for k in key)  # nosec B608 - validated
+        select_params = {f'${k}': _to_param(key_types[k], v) for k, v in key.items()}
+
+        def callee(session):
+            tx = session.transaction(ydb.SerializableReadWrite())
+            result_sets = tx.execute(self.prepared.prepare(session, select), select_params, commit_tx=False)
+            rows = [dict(row) for result_set in result_sets for row in result_set.rows]
+            row = change(rows[0] if rows else None)
+            if row is None:
+                tx.commit()
+                return None
+
+            row = {**row, **key}
+            declarations = ' '.join(
+                f'DECLARE ${k} AS {_declared_type(types.get(k, "Utf8"), v)};' for k, v in row.items()
+            )
+            upsert = f"""
+                {declarations}
+                UPSERT INTO {table} ({', '.join(row)})
+                VALUES ({', '.join(f'${k}' for k in row)});
+            """
+            params = {f'${k}': _to_param(types.get(k, "Utf8"), v) for k, v in row.items()}
+            tx.execute(self.prepared.prepare(session, upsert), params, commit_tx=True)
+            return row
+
+        with span("db.query"):
+            return self._retry(callee)
+
+
+# Primary key columns per table, as declared in migrations/
+PRIMARY_KEYS: Dict[str, tuple] = {
+    "episodes": ("episode_id",),
+    "articles": ("article_id",),
+    "episode_articles": ("episode_id", "article_id"),
+    "generation_logs": ("log_id",),
+    "pipeline_states": ("episode_id", "stage"),
+    "generation_jobs": ("job_id",),
+    "leases": ("name",),
+    "schema_migrations": ("name",),
+}
+
 
 # Simple in-memory fallback when YDB is not available
 class MemoryDB:
@@ -165,18 +452,38 @@ class MemoryDB:
     
     def __init__(self):
         self.tables: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
     
+    def warm_up(self) -> None:
+        """Nothing to connect"""
+
     def execute(self, query: str, parameters: dict = None) -> List[Dict]:
         # Very basic query parsing for simple cases
         return []
     
-    def insert(self, table: str, data: dict) -> bool:
-        if table not in self.tables:
-            self.tables[table] = []
-        self.tables[table].append(data)
+    def insert(self, table: str, data: dict, types: Dict[str, str] = None) -> bool:
+        """Insert or replace by primary key, like YDB's UPSERT"""
+        return self.insert_many(table, [data], types)
+
+    def insert_many(self, table: str, rows: List[dict], types: Dict[str, str] = None) -> bool:
+        key_columns = PRIMARY_KEYS.get(table)
+        with self._lock:
+            existing = self.tables.setdefault(table, [])
+            for row in rows:
+                if key_columns:
+                    key = tuple(row.get(c) for c in key_columns)
+                    existing[:] = [r for r in existing if tuple(r.get(c) for c in key_columns) != key]
+                existing.append(row)
         return True
     
-    def select(self, table: str, where: dict = None, limit: int = 100) -> List[Dict]:
+    def select(
+        self,
+        table: str,
+        where: dict = None,
+        limit: int = 100,
+        order_by: str = None,
+        index: str = None
+    ) -> List[Dict]:
         if table not in self.tables:
             return []
         
@@ -185,8 +492,12 @@ class MemoryDB:
         if where:
             results = [
                 r for r in results
-                if all(r.get(k) == v for k, v in where.items())
+                if all(r.get(k) in v if isinstance(v, (list, tuple)) else r.get(k) == v for k, v in where.items())
             ]
+
+        if order_by:
+            column, _, direction = order_by.partition(" ")
+            results = sorted(results, key=lambda r: r.get(column), reverse=direction.upper() == "DESC")
         
         return results[:limit]
     
@@ -200,11 +511,39 @@ class MemoryDB:
         ]
         return True
 
+    def update_row(
+        self,
+        table: str,
+        key: dict,
+        change: Callable[[Optional[dict]], Optional[dict]],
+        types: Dict[str, str] = None
+    ) -> Optional[dict]:
+        """Conditional upsert of one row, atomic across threads"""
+        with self._lock:
+            rows = self.select(table, key, limit=1)
+            row = change(dict(rows[0]) if rows else None)
+            if row is None:
+                return None
+            row = {**row, **key}
+            self.delete(table, key)
+            self.tables.setdefault(table, []).append(row)
+            return row
+
+
+_ydb_client: Optional[YDBClient] = None
+
 
 def get_db():
-    """Get database client (YDB or fallback)"""
+    """Get database client (YDB or fallback)
+
+    Repositories share one YDB client, so the process keeps a single
+    driver and session pool; each gets its own in-memory fallback.
+    """
+    global _ydb_client
     if os.getenv('YDB_ENDPOINT') and HAS_YDB:
-        return YDBClient()
+        if _ydb_client is None:
+            _ydb_client = YDBClient()
+        return _ydb_client
     else:
         return MemoryDB()
 
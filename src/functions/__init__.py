@@ -0,0 +1 @@
+# Serverless function entry points
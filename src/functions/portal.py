@@ -0,0 +1,66 @@
+"""
+Portal Function
+Yandex Cloud Functions entry point for portal reads behind API Gateway
+
+Serves the same JSON as the FastAPI portal routes without importing
+FastAPI or the pipeline. The repository (and its database driver) is a
+module-level singleton, so warm invocations reuse the connection.
+"""
+
+import logging
+import re
+from typing import Dict
+
+from src.audio.renditions import CLIENT_HINTS
+from src.db.episodes import get_episode_repository
+from src.common.logs import flush_logging
+from src.functions.runtime import configure, json_response
+from src.portal.views import audio_url, episode_summary
+
+logger = logging.getLogger(__name__)
+
+AUDIO_PATH = re.compile(r"/api/episodes/([\w-]+)/audio")
+HINT_HEADERS = {"Accept-CH": CLIENT_HINTS, "Vary": CLIENT_HINTS}
+
+
+def handler(event: dict, context=None) -> dict:
+    """API Gateway HTTP event → response"""
+    configure()
+    try:
+        return route(event)
+    except Exception as e:
+        logger.exception(f"Portal function failed: {e}")
+        return json_response(500, {"detail": "Internal error"})
+    finally:
+        # The container may be frozen once the handler returns
+        flush_logging()
+
+
+def route(event: dict) -> dict:
+    method = event.get("httpMethod", "GET").upper()
+    path = (event.get("path") or event.get("url") or "/").split("?", 1)[0].rstrip("/") or "/"
+    headers: Dict[str, str] = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    query = event.get("queryStringParameters") or {}
+    hints = (headers.get("save-data"), headers.get("ect"), headers.get("downlink"))
+
+    if method not in ("GET", "HEAD"):
+        return json_response(405, {"detail": "Method not allowed"})
+
+    if path == "/health":
+        return json_response(200, {"status": "healthy", "version": "1.0.0", "service": "ai-morning-podcast"})
+
+    if path == "/api/episodes":
+        episodes = get_episode_repository().list_recent()
+        return json_response(200, {"episodes": [episode_summary(e, *hints) for e in episodes]}, HINT_HEADERS)
+
+    match = AUDIO_PATH.fullmatch(path)
+    if match:
+        episode = get_episode_repository().get(match.group(1))
+        if episode is None:
+            return json_response(404, {"detail": "Episode not found"})
+        url = audio_url(episode, *hints, query.get("quality"))
+        if not url:
+            return json_response(404, {"detail": "Audio not available"})
+        return {"statusCode": 307, "headers": {"Location": url, **HINT_HEADERS}, "body": "", "isBase64Encoded": False}
+
+    return json_response(404, {"detail": "Not found"})
@@ -0,0 +1,47 @@
+"""
+Function Runtime
+Shared plumbing for Yandex Cloud Functions handlers: logging, event loop, responses
+"""
+
+import asyncio
+import json
+import os
+from typing import Awaitable, Dict, Optional, TypeVar
+
+from src.common.logs import configure_logging
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def configure() -> None:
+    """Set up logging on the first invocation of a container
+
+    Reads LOG_LEVEL directly rather than through Settings, so the portal
+    function does not need the pipeline's secrets. Files are not written:
+    the function filesystem is read-only and stderr goes to Cloud Logging.
+    """
+    configure_logging(os.getenv("LOG_LEVEL", "INFO"), log_dir=None, json_stderr=True)
+
+
+def run(coro: Awaitable[T]) -> T:
+    """Run a coroutine on the container's event loop
+
+    The loop outlives the invocation: clients, rate limiters and schedulers
+    created on it stay usable by the next warm invocation, which a fresh
+    asyncio.run() per call would break.
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+def json_response(status: int, body, headers: Optional[Dict[str, str]] = None) -> dict:
+    return {
+        "statusCode": status,
+        "headers": {"Content-Type": "application/json", **(headers or {})},
+        "body": json.dumps(body, ensure_ascii=False, default=str),
+        "isBase64Encoded": False,
+    }
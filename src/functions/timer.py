@@ -0,0 +1,60 @@
+"""
+Timer Function
+Yandex Cloud Functions entry point for the cron-triggered episode run
+
+The trigger's payload may be JSON with "target_date" (YYYY-MM-DD) and
+"resume"; without it today's episode is generated. The pipeline and its
+clients are built on the first invocation and reused while the container
+stays warm.
+"""
+
+import json
+import logging
+from datetime import date
+from typing import Optional, Tuple
+
+from src.automation.pipeline import EpisodePipeline
+from src.common.logs import flush_logging
+from src.functions.runtime import configure, json_response, run
+
+logger = logging.getLogger(__name__)
+
+_pipeline: Optional[EpisodePipeline] = None
+
+
+def get_pipeline() -> EpisodePipeline:
+    """Pipeline shared by warm invocations"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = EpisodePipeline()
+    return _pipeline
+
+
+def parse_event(event: dict) -> Tuple[Optional[date], bool]:
+    """Target date and resume flag from a timer trigger message or a direct call"""
+    options = dict(event or {})
+    for message in options.pop("messages", None) or []:
+        payload = (message.get("details") or {}).get("payload")
+        if payload:
+            options.update(json.loads(payload))
+    target_date = options.get("target_date")
+    return (date.fromisoformat(target_date) if target_date else None), bool(options.get("resume", True))
+
+
+def handler(event: dict, context=None) -> dict:
+    """Generate the episode; failures are raised so the trigger can retry"""
+    configure()
+    try:
+        target_date, resume = parse_event(event)
+        episode = run(get_pipeline().generate_episode(target_date, resume=resume))
+    except Exception as e:
+        logger.exception(f"Timer function failed: {e}")
+        raise
+    finally:
+        # The container may be frozen once the handler returns
+        flush_logging()
+    return json_response(200, {
+        "episode_id": episode.episode_id,
+        "status": episode.status,
+        "audio_url": episode.audio_url,
+    })
@@ -3,22 +3,46 @@ AI Morning Podcast Portal - Main Application Entry Point
 FastAPI application with modular architecture
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from src.common.config import get_settings
+from src.common import metrics
+from src.common.logs import configure_logging, shutdown_logging
+from src.common.warmup import get_warmup, start_warmup
+from src.common.watchdog import start_watchdog
 from src.portal import routes as portal_routes
 from src.automation import routes as automation_routes
+from src.admin import routes as admin_routes
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging(settings.log_level, settings.log_dir, settings.log_json)
+    watchdog = start_watchdog(settings.loop_watchdog_threshold_ms / 1000) if settings.loop_watchdog_enabled else None
+    # Runs in the background: /health answers at once, /ready once connections and caches are warm
+    warmup = start_warmup(settings.warmup_timeout_seconds) if settings.warmup_enabled else None
+    yield
+    if warmup is not None:
+        await warmup.stop()
+    if watchdog is not None:
+        await watchdog.stop()
+    shutdown_logging()
+
+
 app = FastAPI(
     title="AI Morning Podcast Portal",
     description="Daily AI news podcast generated automatically",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -30,22 +54,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency by route, method and status
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(portal_routes.router, prefix="/api", tags=["portal"])
 app.include_router(automation_routes.router, prefix="/api/automation", tags=["automation"])
+app.include_router(admin_routes.router, prefix="/api/admin", tags=["admin"], include_in_schema=False)
 
 # Static files (frontend)
 # app.mount("/static", StaticFiles(directory="static"), name="static")
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for monitoring"""
+    """Liveness: the process is up and serving"""
     return {
         "status": "healthy",
         "version": "1.0.0",
         "service": "ai-morning-podcast"
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 until the startup warm-up has succeeded"""
+    warmup = get_warmup()
+    if warmup is None:
+        return {"status": "ready", "steps": {}}
+    if not warmup.ready:
+        warmup.start()  # retries failed steps
+        return JSONResponse({"status": "warming", "steps": warmup.status}, status_code=503)
+    return {"status": "ready", "steps": warmup.status}
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/")
 async def root():
     """Root endpoint - redirects to web portal"""
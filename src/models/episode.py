@@ -2,8 +2,8 @@
 Episode domain model
 """
 
-from datetime import date, datetime
-from typing import Optional, List
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional, List
 from pydantic import BaseModel, Field
 
 class Article(BaseModel):
@@ -15,6 +15,15 @@ class Article(BaseModel):
     published_at: datetime
     source: str = "techcrunch"
 
+class AudioRendition(BaseModel):
+    """One encoding of an episode's audio"""
+    name: str  # standard|mobile|...
+    output_format: str
+    bitrate_kbps: int
+    url: str
+    size_bytes: int
+    duration_seconds: float
+
 class Episode(BaseModel):
     """Podcast episode model"""
     episode_id: str
@@ -26,6 +35,8 @@ class Episode(BaseModel):
     audio_url: Optional[str] = None
     audio_duration_seconds: Optional[int] = None
     audio_file_size_bytes: Optional[int] = None
+    audio_renditions: List[AudioRendition] = Field(default_factory=list)
+    hls_url: Optional[str] = None  # multivariant playlist
     created_at: datetime = Field(default_factory=datetime.now)
     published_at: Optional[datetime] = None
 
@@ -38,11 +49,42 @@ class Episode(BaseModel):
         ])
 
 class PipelineState(BaseModel):
-    """Pipeline stage execution state"""
+    """Pipeline stage execution state (checkpoint)"""
     episode_id: str
-    stage: str  # news|script|audio|upload
-    status: str  # pending|running|completed|failed
+    stage: str  # news|script|audio|hls
+    status: str  # pending|running|completed|failed|timed_out|cancelled
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    duration_ms: Optional[int] = None
+    error_message: Optional[str] = None
+    retry_count: int = 0  # failed attempts so far
+    inputs: Dict[str, Any] = Field(default_factory=dict)
+    outputs: Dict[str, Any] = Field(default_factory=dict)  # reused when resuming
+
+class GenerationJob(BaseModel):
+    """Queued request to generate the episode for a date"""
+    job_id: str
+    target_date: date
+    resume: bool = True
+    status: str = "queued"  # queued|running|done|failed|cancelled
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+    episode_status: Optional[str] = None  # completed|script_only once done
+    owner: Optional[str] = None  # replica (host:pid:nonce) that queued and runs the job
+    heartbeat_at: Optional[datetime] = None  # refreshed by the owner while queued or running
+
+class GenerationLog(BaseModel):
+    """Timed span of a pipeline stage or of an outbound call within one"""
+    log_id: str
+    run_id: str  # one generate_episode run
+    episode_id: str
+    stage: Optional[str] = None  # enclosing stage; for a stage span, the stage itself
+    name: str  # stage name, or call such as news.fetch, llm.yagpt, tts.chunk
+    kind: str = "call"  # stage|call
+    status: str = "completed"  # completed|failed|timed_out|cancelled
     error_message: Optional[str] = None
-    retry_count: int = 0
+    duration_ms: int = 0
+    bytes: Optional[int] = None
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -6,7 +6,6 @@ GREEN phase: Minimal implementation to pass tests
 import hashlib
 from datetime import datetime, timedelta
 from typing import List
-from bs4 import BeautifulSoup
 
 from src.models.episode import Article
 
@@ -15,6 +14,8 @@ class TechCrunchParser:
 
     def parse_article(self, html: str) -> Article:
         """Parse a single article from HTML"""
+        from bs4 import BeautifulSoup  # deferred: bs4 is only needed once news is fetched
+
         soup = BeautifulSoup(html, 'html.parser')
 
         # Extract title
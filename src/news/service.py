@@ -3,44 +3,97 @@ News Collection Service
 Orchestrates news fetching, parsing, and caching
 """
 
+import asyncio
+import logging
+import time
 import httpx
-from typing import List
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 from src.news.parser import TechCrunchParser
 from src.models.episode import Article
-from src.common.config import get_settings
+from src.common.ratelimit import get_rate_limiter
+from src.common.retry import RetryPolicy, remaining_timeout
+from src.common.tracing import span
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
 class NewsService:
     """Service for collecting AI news"""
 
+    REQUEST_TIMEOUT = 30.0
+    MAX_PAGES = 20  # listing pages walked back for a past date
+    PAGE_TTL = 600.0  # seconds a fetched page is shared between dates
+
     def __init__(self):
         self.parser = TechCrunchParser()
         self.base_url = "https://techcrunch.com/category/artificial-intelligence/"
-
-    async def collect_latest(self, hours: int = 24) -> List[Article]:
-        """Collect latest AI news from TechCrunch"""
+        self.retry_policy = RetryPolicy(
+            "techcrunch",
+            max_attempts=3,
+            base_delay=1.0,
+            max_delay=10.0,
+            attempt_timeout=self.REQUEST_TIMEOUT + 5,
+            deadline=90
+        )
+        self._pages: Dict[int, Tuple[float, asyncio.Future]] = {}
+
+    async def collect_latest(self, hours: int = 24, until: Optional[datetime] = None) -> List[Article]:
+        """Collect AI news from TechCrunch published in the hours before until (default: now)
+
+        For a past window, older listing pages are walked until they reach
+        the start of the window.
+        """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(self.base_url)
-                response.raise_for_status()
-
+            if until is None:
                 # Parse all articles from page
-                articles = self._parse_page(response.text)
+                articles = await asyncio.to_thread(self._parse_page, await self._page(1))
 
                 # Filter by date
                 recent = self.parser.filter_by_date(articles, hours=hours)
+            else:
+                start = until - timedelta(hours=hours)
+                articles = []
+                for page in range(1, self.MAX_PAGES + 1):
+                    page_articles = await asyncio.to_thread(self._parse_page, await self._page(page))
+                    articles.extend(page_articles)
+                    if not page_articles or min(a.published_at for a in page_articles) <= start:
+                        break
+                recent = [a for a in articles if start < a.published_at <= until]
 
-                # Remove duplicates
-                unique = self.parser.remove_duplicates(recent)
+            # Remove duplicates
+            unique = self.parser.remove_duplicates(recent)
 
-                return unique
+            return unique
 
         except (httpx.RequestError, Exception) as e:
             raise NewsCollectionError(f"Failed to fetch news: {e}")
 
+    async def _page(self, page: int) -> str:
+        """Listing page HTML, fetched once per PAGE_TTL however many dates need it"""
+        now = time.monotonic()
+        cached = self._pages.get(page)
+        if cached is None or now - cached[0] > self.PAGE_TTL:
+            cached = (now, asyncio.ensure_future(self.retry_policy.call(self._fetch_page, page)))
+            self._pages[page] = cached
+        try:
+            return await asyncio.shield(cached[1])
+        except Exception:
+            if self._pages.get(page) is cached:
+                del self._pages[page]
+            raise
+
+    async def _fetch_page(self, page: int = 1) -> str:
+        """Fetch one listing page"""
+        await get_rate_limiter("news").acquire()
+        url = self.base_url if page == 1 else f"{self.base_url}page/{page}/"
+        with span("news.fetch") as log:
+            async with httpx.AsyncClient(timeout=remaining_timeout(self.REQUEST_TIMEOUT)) as client:
+                response = await client.get(url)
+                response.raise_for_status()
+            log.bytes = len(response.content)
+        return response.text
+
     def _parse_page(self, html: str) -> List[Article]:
         """Parse all articles from page HTML"""
         from bs4 import BeautifulSoup
@@ -55,6 +108,7 @@ class NewsService:
                 articles.append(article)
             except Exception as e:
                 # Skip malformed articles
+                logger.debug(f"Skipping malformed article: {e}")
                 continue
 
         return articles
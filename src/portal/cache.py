@@ -0,0 +1,78 @@
+"""
+Portal Cache
+Recent episodes, the latest episode and the RSS body, shared by portal reads
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from src.db.episodes import get_episode_repository
+from src.models.episode import Episode
+
+logger = logging.getLogger(__name__)
+
+TTL_SECONDS = 60.0  # other replicas see a new episode within this
+
+
+class EpisodeCache:
+    """Snapshot of the archive, reloaded from the repository after ttl seconds
+
+    Reloads are synchronous DB I/O, so call from a worker thread. Concurrent
+    readers of a stale snapshot wait for one reload instead of each querying.
+    The pipeline invalidates its own process's cache after saving an episode.
+    """
+
+    def __init__(self, repository=None, ttl: float = TTL_SECONDS, clock=time.monotonic):
+        self.repository = repository
+        self.ttl = ttl
+        self.clock = clock
+        self._episodes: Optional[List[Episode]] = None
+        self._feed: Optional[Tuple[List[Episode], str]] = None  # built from which snapshot
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def episodes(self) -> List[Episode]:
+        """Recent episodes, newest first"""
+        with self._lock:
+            if self._episodes is None or self.clock() - self._loaded_at >= self.ttl:
+                repository = self.repository or get_episode_repository()
+                self._episodes = repository.list_recent()
+                self._loaded_at = self.clock()
+            return self._episodes
+
+    def latest(self) -> Optional[Episode]:
+        """Newest episode with audio"""
+        return next((e for e in self.episodes() if e.audio_url), None)
+
+    def feed(self) -> str:
+        """RSS XML for the current snapshot"""
+        from src.common.config import get_settings
+        from src.portal.rss import build_feed
+
+        episodes = self.episodes()
+        feed = self._feed
+        if feed is None or feed[0] is not episodes:
+            feed = self._feed = (episodes, build_feed(episodes, f"https://{get_settings().domain}"))
+        return feed[1]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._episodes = self._feed = None
+
+    def warm_up(self) -> None:
+        """Load the archive and render the feed ahead of the first request"""
+        self.feed()
+        logger.info(f"Portal cache warm: {len(self._episodes or [])} episodes")
+
+
+_cache: Optional[EpisodeCache] = None
+
+
+def get_episode_cache() -> EpisodeCache:
+    """Process-wide cache"""
+    global _cache
+    if _cache is None:
+        _cache = EpisodeCache()
+    return _cache
@@ -1,12 +1,80 @@
 """
-Portal Routes (placeholder)
+Portal Routes
 """
-from fastapi import APIRouter
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi.responses import RedirectResponse
+
+from src.audio.renditions import CLIENT_HINTS
+from src.db.episodes import get_episode_repository
+from src.portal.cache import get_episode_cache
+from src.portal.rss import FEED_CACHE, FEED_TYPE
+from src.portal.views import audio_url, episode_summary
 
 router = APIRouter()
 
 
+def _advertise_hints(response: Response) -> None:
+    # Ask browsers to send network hints on later requests, and keep caches per hint
+    response.headers["Accept-CH"] = CLIENT_HINTS
+    response.headers["Vary"] = CLIENT_HINTS
+
+
 @router.get("/episodes")
-async def list_episodes():
-    """List all episodes"""
-    return {"episodes": []}
+async def list_episodes(
+    response: Response,
+    save_data: Optional[str] = Header(None),
+    ect: Optional[str] = Header(None),
+    downlink: Optional[str] = Header(None)
+):
+    """List all episodes, with the audio URL suited to the client's connection"""
+    # A stale cache reloads with synchronous DB I/O
+    episodes = await asyncio.to_thread(get_episode_cache().episodes)
+    _advertise_hints(response)
+    return {"episodes": [episode_summary(e, save_data, ect, downlink) for e in episodes]}
+
+
+@router.get("/episodes/latest")
+async def latest_episode(
+    response: Response,
+    save_data: Optional[str] = Header(None),
+    ect: Optional[str] = Header(None),
+    downlink: Optional[str] = Header(None)
+):
+    """Newest episode with audio"""
+    episode = await asyncio.to_thread(get_episode_cache().latest)
+    if episode is None:
+        raise HTTPException(status_code=404, detail="No episodes yet")
+    _advertise_hints(response)
+    return episode_summary(episode, save_data, ect, downlink)
+
+
+@router.get("/rss.xml")
+async def rss_feed():
+    """Podcast feed (also published to storage as rss.xml)"""
+    feed = await asyncio.to_thread(get_episode_cache().feed)
+    return Response(feed, media_type=FEED_TYPE, headers={"Cache-Control": FEED_CACHE})
+
+
+@router.get("/episodes/{episode_id}/audio")
+async def episode_audio(
+    episode_id: str,
+    quality: Optional[str] = None,
+    save_data: Optional[str] = Header(None),
+    ect: Optional[str] = Header(None),
+    downlink: Optional[str] = Header(None)
+):
+    """Redirect to the episode rendition chosen by ?quality= or client hints"""
+    episode = await asyncio.to_thread(get_episode_repository().get, episode_id)
+    if episode is None:
+        raise HTTPException(status_code=404, detail="Episode not found")
+
+    url = audio_url(episode, save_data, ect, downlink, quality)
+    if not url:
+        raise HTTPException(status_code=404, detail="Audio not available")
+
+    response = RedirectResponse(url, status_code=307)
+    _advertise_hints(response)
+    return response
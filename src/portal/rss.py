@@ -0,0 +1,90 @@
+"""
+RSS Feed
+RSS 2.0 podcast feed with iTunes tags, published as a static file
+"""
+
+import asyncio
+import logging
+from datetime import datetime, time, timezone
+from email.utils import format_datetime
+from typing import List
+from xml.etree import ElementTree as ET
+
+from src.common.config import get_settings
+from src.models.episode import Episode
+
+logger = logging.getLogger(__name__)
+
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+FEED_OBJECT = "rss.xml"
+FEED_TYPE = "application/rss+xml"
+FEED_CACHE = "public, max-age=300"
+TITLE = "AI Morning Podcast"
+DESCRIPTION = "Ежедневный подкаст о главных новостях искусственного интеллекта"
+SUMMARY_CHARS = 400
+
+ET.register_namespace("itunes", ITUNES_NS)
+
+
+def _itunes(tag: str) -> str:
+    return f"{{{ITUNES_NS}}}{tag}"
+
+
+def _duration(seconds: int) -> str:
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+def _pub_date(episode: Episode) -> str:
+    published = episode.published_at or datetime.combine(episode.date, time(6, 0), tzinfo=timezone.utc)
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return format_datetime(published)
+
+
+def _summary(script: str) -> str:
+    if len(script) <= SUMMARY_CHARS:
+        return script
+    return script[:SUMMARY_CHARS].rsplit(" ", 1)[0] + "…"
+
+
+def build_feed(episodes: List[Episode], site_url: str) -> str:
+    """Feed XML for the episodes that have audio, in the given order"""
+    rss = ET.Element("rss", {"version": "2.0"})
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = TITLE
+    ET.SubElement(channel, "link").text = site_url
+    ET.SubElement(channel, "description").text = DESCRIPTION
+    ET.SubElement(channel, "language").text = "ru"
+    ET.SubElement(channel, _itunes("author")).text = TITLE
+    ET.SubElement(channel, _itunes("category"), {"text": "Technology"})
+    ET.SubElement(channel, _itunes("explicit")).text = "false"
+
+    for episode in episodes:
+        if not episode.audio_url:
+            continue
+        item = ET.SubElement(channel, "item")
+        ET.SubElement(item, "title").text = f"{TITLE} — {episode.date.isoformat()}"
+        ET.SubElement(item, "description").text = _summary(episode.script_text or "")
+        ET.SubElement(item, "guid", {"isPermaLink": "false"}).text = episode.episode_id
+        ET.SubElement(item, "pubDate").text = _pub_date(episode)
+        ET.SubElement(item, "enclosure", {
+            "url": episode.audio_url,
+            "length": str(episode.audio_file_size_bytes or 0),
+            "type": "audio/mpeg",
+        })
+        if episode.audio_duration_seconds:
+            ET.SubElement(item, _itunes("duration")).text = _duration(episode.audio_duration_seconds)
+
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(rss, encoding="unicode")
+
+
+async def publish_feed(episodes: List[Episode], storage=None) -> str:
+    """Rebuild rss.xml and upload it; returns the feed URL"""
+    from src.storage.s3_client import get_storage
+
+    storage = storage or get_storage()
+    feed = build_feed(episodes, f"https://{get_settings().domain}")
+    url = await asyncio.to_thread(storage.upload_bytes, feed.encode(), FEED_OBJECT, FEED_TYPE, FEED_CACHE)
+    logger.info(f"RSS feed updated: {len(episodes)} episodes")
+    return url
@@ -0,0 +1,42 @@
+"""
+Portal Views
+Episode JSON and audio URL selection shared by the API routes and the portal function
+"""
+
+from typing import Optional
+
+from src.audio.renditions import choose_rendition
+from src.models.episode import Episode
+
+
+def episode_summary(
+    episode: Episode,
+    save_data: Optional[str] = None,
+    ect: Optional[str] = None,
+    downlink: Optional[str] = None
+) -> dict:
+    """Episode list entry, with the audio URL suited to the client's connection"""
+    rendition = choose_rendition(episode.audio_renditions, save_data, ect, downlink)
+    return {
+        "episode_id": episode.episode_id,
+        "date": episode.date.isoformat(),
+        "status": episode.status,
+        "article_count": episode.article_count,
+        "audio_url": rendition.url if rendition else episode.audio_url,
+        "audio_duration_seconds": episode.audio_duration_seconds,
+        "audio_file_size_bytes": rendition.size_bytes if rendition else episode.audio_file_size_bytes,
+        "renditions": [r.model_dump() for r in episode.audio_renditions],
+        "hls_url": episode.hls_url,
+    }
+
+
+def audio_url(
+    episode: Episode,
+    save_data: Optional[str] = None,
+    ect: Optional[str] = None,
+    downlink: Optional[str] = None,
+    quality: Optional[str] = None
+) -> Optional[str]:
+    """URL of the rendition chosen by quality or client hints"""
+    rendition = choose_rendition(episode.audio_renditions, save_data, ect, downlink, quality)
+    return rendition.url if rendition else episode.audio_url
@@ -0,0 +1,170 @@
+"""
+Prompt Token Budget
+Fast local token estimation and per-article budget allocation for LLM prompts
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Approximate characters per token for each provider tokenizer.
+# Conservative (slightly pessimistic) so estimates err on the side of fitting.
+CHARS_PER_TOKEN: Dict[str, Dict[str, float]] = {
+    "yagpt": {"cyrillic": 3.2, "other": 3.0},
+    "claude": {"cyrillic": 2.2, "other": 3.5},
+}
+
+# Context window (input + output tokens) per provider
+CONTEXT_WINDOW: Dict[str, int] = {
+    "yagpt": 8000,
+    "claude": 200000,
+}
+
+SAFETY_MARGIN = 1.1
+ELLIPSIS = "…"
+
+_CYRILLIC = re.compile(r"[Ѐ-ӿ]")
+_WHITESPACE = re.compile(r"\s+")
+_URL = re.compile(r"https?://\S+")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def estimate_tokens(text: str, provider: str = "yagpt") -> int:
+    """Estimate token count with a character-class approximation"""
+    if not text:
+        return 0
+
+    ratios = CHARS_PER_TOKEN.get(provider, CHARS_PER_TOKEN["yagpt"])
+    cyrillic = len(_CYRILLIC.findall(text))
+    other = len(text) - cyrillic
+
+    tokens = cyrillic / ratios["cyrillic"] + other / ratios["other"]
+    return int(tokens * SAFETY_MARGIN) + 1
+
+
+def compress_text(text: str) -> str:
+    """Drop URLs and collapse whitespace without changing meaning"""
+    text = _URL.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@dataclass
+class TokenUsage:
+    """Projected vs actual token usage for a single LLM call"""
+    provider: str
+    projected_input_tokens: int
+    max_output_tokens: int
+    actual_input_tokens: Optional[int] = None
+    actual_output_tokens: Optional[int] = None
+    recorded_at: float = field(default_factory=time.time)
+
+    @property
+    def input_error_ratio(self) -> Optional[float]:
+        """Actual / projected input tokens (>1 means we under-estimated)"""
+        if not self.actual_input_tokens or not self.projected_input_tokens:
+            return None
+        return self.actual_input_tokens / self.projected_input_tokens
+
+
+class PromptBudget:
+    """Fit article titles and descriptions into an input token budget"""
+
+    MIN_ARTICLE_TOKENS = 24
+
+    def __init__(self, provider: str, max_input_tokens: int, max_output_tokens: int):
+        self.provider = provider
+        self.max_output_tokens = max_output_tokens
+
+        # Never let input + output exceed the provider context window
+        window = CONTEXT_WINDOW.get(provider, CONTEXT_WINDOW["yagpt"])
+        self.max_input_tokens = min(max_input_tokens, window - max_output_tokens)
+
+    def estimate(self, text: str) -> int:
+        """Estimate tokens for this budget's provider"""
+        return estimate_tokens(text, self.provider)
+
+    def fit_articles(
+        self,
+        articles: List[Tuple[str, str]],
+        overhead_tokens: int
+    ) -> List[Tuple[str, str]]:
+        """Return (title, description) pairs truncated to fit the remaining budget
+
+        Articles are in priority order; when there is not enough budget for
+        every article to get MIN_ARTICLE_TOKENS, the last ones are dropped.
+        """
+        if not articles:
+            return []
+
+        available = max(self.max_input_tokens - overhead_tokens, 0)
+        items = [(compress_text(title), compress_text(desc)) for title, desc in articles]
+        costs = [self.estimate(title) + self.estimate(desc) for title, desc in items]
+
+        shares = self._allocate(costs, available)
+
+        fitted = []
+        for (title, desc), cost, share in zip(items, costs, shares):
+            if cost <= share:
+                fitted.append((title, desc))
+                continue
+
+            title_tokens = self.estimate(title)
+            if title_tokens >= share:
+                fitted.append((self.truncate(title, share), ""))
+            else:
+                fitted.append((title, self.truncate(desc, share - title_tokens)))
+
+        return fitted
+
+    def _allocate(self, costs: List[int], available: int) -> List[int]:
+        """Max-min fair split: short articles donate unused budget to long ones
+
+        Shares are returned for the leading articles that fit at least
+        MIN_ARTICLE_TOKENS each; the total never exceeds available.
+        """
+        kept = min(len(costs), available // self.MIN_ARTICLE_TOKENS)
+        shares = [0] * kept
+        pending = sorted(range(kept), key=lambda i: costs[i])
+        remaining = available
+
+        while pending:
+            fair_share = remaining // len(pending)
+            index = pending[0]
+            if costs[index] <= fair_share:
+                shares[index] = costs[index]
+                remaining -= costs[index]
+                pending.pop(0)
+            else:
+                for index in pending:
+                    shares[index] = fair_share
+                break
+
+        return shares
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Truncate at a sentence boundary, falling back to a word boundary"""
+        if self.estimate(text) <= max_tokens:
+            return text
+        if max_tokens <= 1:
+            return ""
+
+        sentences = _SENTENCE_END.split(text)
+        kept = self._longest_prefix(sentences, max_tokens)
+        if kept:
+            return kept
+
+        # Single oversized sentence: cut by words, reserving room for the ellipsis
+        kept = self._longest_prefix(text.split(), max_tokens, suffix=ELLIPSIS)
+        return kept + ELLIPSIS if kept else ""
+
+    def _longest_prefix(self, parts: List[str], max_tokens: int, suffix: str = "") -> str:
+        """Binary search the longest run of leading parts that fits max_tokens"""
+        low, high = 0, len(parts)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.estimate(" ".join(parts[:middle]) + suffix) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return " ".join(parts[:low])
@@ -4,64 +4,89 @@ Uses LLM (YaGPT/Claude) to generate engaging scripts
 """
 
 import asyncio
+import logging
 import requests
+from collections import deque
 from typing import List, Optional
 from datetime import date
 
 from src.models.episode import Article
 from src.common.config import get_settings
+from src.common.ratelimit import get_rate_limiter
+from src.common.retry import RetryableError, RetryPolicy, remaining_timeout
+from src.common.tracing import span
+from src.script.budget import PromptBudget, TokenUsage
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = "Ты - ведущий AI подкаста. Создай дружелюбный и информативный скрипт с легким юмором."
 
 
 class ScriptGenerator:
     """Generate podcast scripts from news articles"""
 
     MAX_RETRIES = 3
+    REQUEST_TIMEOUT = 60
+    RETRY_DEADLINE = 150  # per provider, sleeps included
     TARGET_WORD_COUNT = 600
     MIN_WORD_COUNT = 450
     MAX_WORD_COUNT = 750
+    USAGE_HISTORY_SIZE = 100
 
     def __init__(self):
+        settings = get_settings()
         self.yagpt_api_key = settings.yagpt_api_key
         self.claude_api_key = settings.claude_api_key
+        self.yagpt_url = settings.yagpt_api_url
+        self.claude_url = settings.claude_api_url
+        self.max_input_tokens = settings.llm_max_input_tokens
+        self.max_output_tokens = settings.llm_max_output_tokens
+        self.usage_history: deque = deque(maxlen=self.USAGE_HISTORY_SIZE)
+        self.retry_policies = {
+            provider: RetryPolicy(
+                provider,
+                max_attempts=self.MAX_RETRIES,
+                base_delay=1.0,
+                max_delay=10.0,
+                attempt_timeout=self.REQUEST_TIMEOUT + 5,
+                deadline=self.RETRY_DEADLINE
+            )
+            for provider in ("yagpt", "claude")
+        }
 
     async def generate(self, articles: List[Article], target_date: date) -> str:
         """Generate script from articles using LLM with fallback chain"""
-        # Try YaGPT first with retries
-        for attempt in range(self.MAX_RETRIES):
-            try:
-                script = await self._call_yagpt(articles, target_date)
-                if self.validate_structure(script) and self.is_safe_content(script):
-                    return script
-            except Exception as e:
-                print(f"YaGPT attempt {attempt + 1} failed: {e}")
-                if attempt < self.MAX_RETRIES - 1:
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
-
-        # Fallback to Claude with retries
-        for attempt in range(self.MAX_RETRIES):
+        # YaGPT first, then Claude, each under its retry policy
+        providers = (("yagpt", self._call_yagpt), ("claude", self._call_claude))
+        for provider, call in providers:
             try:
-                script = await self._call_claude(articles, target_date)
-                if self.validate_structure(script) and self.is_safe_content(script):
-                    return script
+                return await self.retry_policies[provider].call(
+                    self._generate_validated, call, articles, target_date
+                )
             except Exception as e:
-                print(f"Claude attempt {attempt + 1} failed: {e}")
-                if attempt < self.MAX_RETRIES - 1:
-                    await asyncio.sleep(2 ** attempt)
+                logger.warning(f"{provider} script generation failed: {e}")
 
         # Final fallback to template
         return self._template_script(articles, target_date)
 
+    async def _generate_validated(self, call, articles: List[Article], target_date: date) -> str:
+        """One LLM attempt; an unusable script is worth another try"""
+        script = await call(articles, target_date)
+        if not (self.validate_structure(script) and self.is_safe_content(script)):
+            raise RetryableError("Generated script failed validation")
+        return script
+
     async def _call_yagpt(self, articles: List[Article], target_date: date) -> str:
         """Call YaGPT API for script generation"""
         if not self.yagpt_api_key:
             raise ValueError("YaGPT API key not configured")
 
-        prompt = self._build_prompt(articles, target_date)
+        await get_rate_limiter("llm").acquire()
+        prompt = self._build_prompt(articles, target_date, provider="yagpt")
+        projected = self._budget("yagpt").estimate(SYSTEM_PROMPT + prompt)
 
         # YaGPT API call
-        url = "https://llm.api.cloud.yandex.net/foundationModels/v1/completion"
+        url = self.yagpt_url
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.yagpt_api_key}"
@@ -72,12 +97,12 @@ class ScriptGenerator:
             "completionOptions": {
                 "stream": False,
                 "temperature": 0.7,
-                "maxTokens": 2000
+                "maxTokens": self.max_output_tokens
             },
             "messages": [
                 {
                     "role": "system",
-                    "text": "Ты - ведущий AI подкаста. Создай дружелюбный и информативный скрипт с легким юмором."
+                    "text": SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
@@ -86,12 +111,20 @@ class ScriptGenerator:
             ]
         }
 
-        response = await asyncio.to_thread(
-            requests.post, url, json=payload, headers=headers, timeout=60
-        )
-        response.raise_for_status()
+        with span("llm.yagpt") as log:
+            response = await asyncio.to_thread(
+                requests.post, url, json=payload, headers=headers,
+                timeout=remaining_timeout(self.REQUEST_TIMEOUT)
+            )
+            response.raise_for_status()
+            log.bytes = len(response.content)
 
         result = response.json()
+        usage = result.get("result", {}).get("usage", {})
+        self._record_usage(
+            "yagpt", projected,
+            usage.get("inputTextTokens"), usage.get("completionTokens")
+        )
         return result.get("result", {}).get("alternatives", [{}])[0].get("message", {}).get("text", "")
 
     async def _call_claude(self, articles: List[Article], target_date: date) -> str:
@@ -99,9 +132,11 @@ class ScriptGenerator:
         if not self.claude_api_key:
             raise ValueError("Claude API key not configured")
 
-        prompt = self._build_prompt(articles, target_date)
+        await get_rate_limiter("llm").acquire()
+        prompt = self._build_prompt(articles, target_date, provider="claude")
+        projected = self._budget("claude").estimate(SYSTEM_PROMPT + prompt)
 
-        url = "https://api.anthropic.com/v1/messages"
+        url = self.claude_url
         headers = {
             "Content-Type": "application/json",
             "x-api-key": self.claude_api_key,
@@ -110,9 +145,9 @@ class ScriptGenerator:
 
         payload = {
             "model": "claude-3-5-sonnet-20241022",
-            "max_tokens": 2000,
+            "max_tokens": self.max_output_tokens,
             "temperature": 0.7,
-            "system": "Ты - ведущий AI подкаста. Создай дружелюбный и информативный скрипт с легким юмором.",
+            "system": SYSTEM_PROMPT,
             "messages": [
                 {
                     "role": "user",
@@ -121,29 +156,84 @@ class ScriptGenerator:
             ]
         }
 
-        response = await asyncio.to_thread(
-            requests.post, url, json=payload, headers=headers, timeout=60
-        )
-        response.raise_for_status()
+        with span("llm.claude") as log:
+            response = await asyncio.to_thread(
+                requests.post, url, json=payload, headers=headers,
+                timeout=remaining_timeout(self.REQUEST_TIMEOUT)
+            )
+            response.raise_for_status()
+            log.bytes = len(response.content)
 
         result = response.json()
+        usage = result.get("usage", {})
+        self._record_usage(
+            "claude", projected,
+            usage.get("input_tokens"), usage.get("output_tokens")
+        )
         return result.get("content", [{}])[0].get("text", "")
 
-    def _build_prompt(self, articles: List[Article], target_date: date) -> str:
-        """Build LLM prompt from articles"""
+    def _budget(self, provider: str) -> PromptBudget:
+        """Token budget for the given provider"""
+        return PromptBudget(provider, self.max_input_tokens, self.max_output_tokens)
+
+    def _record_usage(
+        self,
+        provider: str,
+        projected: int,
+        actual_input: Optional[int],
+        actual_output: Optional[int]
+    ) -> TokenUsage:
+        """Record projected vs actual token usage of an LLM call"""
+        usage = TokenUsage(
+            provider=provider,
+            projected_input_tokens=projected,
+            max_output_tokens=self.max_output_tokens,
+            actual_input_tokens=int(actual_input) if actual_input is not None else None,
+            actual_output_tokens=int(actual_output) if actual_output is not None else None
+        )
+        self.usage_history.append(usage)
+        logger.info(
+            f"{provider} tokens: projected input {projected}, "
+            f"actual input {usage.actual_input_tokens}, output {usage.actual_output_tokens}"
+        )
+        return usage
+
+    def _build_prompt(
+        self,
+        articles: List[Article],
+        target_date: date,
+        provider: str = "yagpt"
+    ) -> str:
+        """Build LLM prompt from articles, fitted to the provider's input token budget"""
         date_str = target_date.strftime("%d %B %Y")
 
         # Limit to top 5-7 articles
         selected_articles = articles[:7]
 
+        # Fixed prompt cost plus the "N. " / newline framing around each article
+        budget = self._budget(provider)
+        overhead = (
+            budget.estimate(SYSTEM_PROMPT)
+            + budget.estimate(self._render_prompt(date_str, len(selected_articles), ""))
+            + budget.estimate("00. \n\n\n") * len(selected_articles)
+        )
+        fitted = budget.fit_articles(
+            [(article.title, article.description) for article in selected_articles],
+            overhead
+        )
+
         articles_text = "\n\n".join([
-            f"{i+1}. {article.title}\n{article.description}"
-            for i, article in enumerate(selected_articles)
+            f"{i+1}. {title}\n{description}"
+            for i, (title, description) in enumerate(fitted)
         ])
 
+        return self._render_prompt(date_str, len(fitted), articles_text)
+
+    def _render_prompt(self, date_str: str, article_count: int, articles_text: str) -> str:
+        """Render the prompt template"""
         prompt = f"""Создай скрипт для утреннего AI подкаста на русском языке на дату {date_str}.
 
-У нас есть {len(selected_articles)} новостей из мира искусственного интеллекта:
+У нас есть {article_count} новостей из мира искусственного интеллекта:
 
 {articles_text}
 
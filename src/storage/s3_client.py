@@ -4,15 +4,44 @@ S3 Client for Yandex Object Storage
 
 import os
 import json
+import threading
+from importlib.util import find_spec
 from typing import Optional, BinaryIO
 from pathlib import Path
 
-try:
-    import boto3
-    from botocore.config import Config
-    HAS_BOTO = True
-except ImportError:
-    HAS_BOTO = False
+from src.common.tracing import span
+
+# boto3 and botocore take a noticeable share of cold start, so they are
+# imported when the first S3 client is built, not with this module
+HAS_BOTO = find_spec("boto3") is not None
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def _boto_client():
+    """Process-wide boto3 client; building one takes ~100ms and clients are thread-safe"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            import boto3
+            from botocore.config import Config
+
+            _shared_client = boto3.client(
+                's3',
+                endpoint_url=S3Client.ENDPOINT,
+                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                region_name=S3Client.REGION,
+                # Bounded timeouts so a cancelled upload cannot pin its worker thread
+                config=Config(
+                    signature_version='s3v4',
+                    connect_timeout=S3Client.CONNECT_TIMEOUT,
+                    read_timeout=S3Client.READ_TIMEOUT,
+                    retries={'max_attempts': 3, 'mode': 'standard'}
+                )
+            )
+        return _shared_client
 
 
 class S3Client:
@@ -20,6 +49,8 @@ class S3Client:
     
     ENDPOINT = 'https://storage.yandexcloud.net'
     REGION = 'ru-central1'
+    CONNECT_TIMEOUT = 10
+    READ_TIMEOUT = 60
     
     def __init__(self, bucket: str = None):
         self.bucket = bucket or os.getenv('S3_BUCKET', '')
@@ -30,16 +61,12 @@ class S3Client:
         if self._client is None:
             if not HAS_BOTO:
                 raise RuntimeError("boto3 not installed. Run: pip install boto3")
-            
-            self._client = boto3.client(
-                's3',
-                endpoint_url=self.ENDPOINT,
-                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                region_name=self.REGION,
-                config=Config(signature_version='s3v4')
-            )
+            self._client = _boto_client()
         return self._client
+
+    def warm_up(self) -> None:
+        """Build the boto3 client ahead of the first request"""
+        self.client
     
     def upload_file(self, file_path: str, object_name: str = None) -> str:
         """Upload file to S3"""
@@ -49,20 +76,34 @@ class S3Client:
         self.client.upload_file(file_path, self.bucket, object_name)
         return self.get_url(object_name)
     
-    def upload_bytes(self, data: bytes, object_name: str, content_type: str = 'application/octet-stream') -> str:
+    def upload_bytes(
+        self,
+        data: bytes,
+        object_name: str,
+        content_type: str = 'application/octet-stream',
+        cache_control: str = None
+    ) -> str:
         """Upload bytes to S3"""
-        self.client.put_object(
-            Bucket=self.bucket,
-            Key=object_name,
-            Body=data,
-            ContentType=content_type
-        )
+        extra = {'CacheControl': cache_control} if cache_control else {}
+        with span("storage.upload") as log:
+            log.bytes = len(data)
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=object_name,
+                Body=data,
+                ContentType=content_type,
+                **extra
+            )
         return self.get_url(object_name)
     
     def upload_fileobj(self, file_obj: BinaryIO, object_name: str) -> str:
         """Upload file object to S3"""
         self.client.upload_fileobj(file_obj, self.bucket, object_name)
         return self.get_url(object_name)
+
+    def open_writer(self, object_name: str, content_type: str = 'application/octet-stream') -> 'S3StreamWriter':
+        """Open a streaming writer backed by a multipart upload"""
+        return S3StreamWriter(self, object_name, content_type)
     
     def download_file(self, object_name: str, file_path: str) -> str:
         """Download file from S3"""
@@ -70,8 +111,11 @@ class S3Client:
         return file_path
     
     def download_bytes(self, object_name: str) -> bytes:
-        """Download file as bytes"""
-        response = self.client.get_object(Bucket=self.bucket, Key=object_name)
+        """Download file as bytes; FileNotFoundError if there is no such object"""
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=object_name)
+        except self.client.exceptions.NoSuchKey:
+            raise FileNotFoundError(object_name)
         return response['Body'].read()
     
     def delete(self, object_name: str) -> bool:
@@ -132,6 +176,81 @@ class S3Client:
         }
 
 
+class S3StreamWriter:
+    """Incremental S3 upload holding at most one multipart part in memory"""
+
+    PART_SIZE = 5 * 1024 * 1024  # S3 minimum for all but the last part
+
+    def __init__(self, storage: S3Client, object_name: str, content_type: str):
+        self.storage = storage
+        self.object_name = object_name
+        self.content_type = content_type
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+
+    def write(self, data: bytes) -> None:
+        """Buffer data, uploading full parts as they accumulate"""
+        self._buffer.extend(data)
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.PART_SIZE:
+            part = bytes(self._buffer[:self.PART_SIZE])
+            del self._buffer[:self.PART_SIZE]
+            self._upload_part(part)
+
+    def _upload_part(self, data: bytes) -> None:
+        client = self.storage.client
+        if self._upload_id is None:
+            response = client.create_multipart_upload(
+                Bucket=self.storage.bucket,
+                Key=self.object_name,
+                ContentType=self.content_type
+            )
+            self._upload_id = response['UploadId']
+
+        part_number = len(self._parts) + 1
+        with span("storage.upload_part") as log:
+            log.bytes = len(data)
+            response = client.upload_part(
+                Bucket=self.storage.bucket,
+                Key=self.object_name,
+                UploadId=self._upload_id,
+                PartNumber=part_number,
+                Body=data
+            )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+    def close(self) -> str:
+        """Flush the remainder and complete the upload"""
+        if self._upload_id is None:
+            # Small object: a single PUT is cheaper than a multipart upload
+            return self.storage.upload_bytes(bytes(self._buffer), self.object_name, self.content_type)
+
+        if self._buffer:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+
+        self.storage.client.complete_multipart_upload(
+            Bucket=self.storage.bucket,
+            Key=self.object_name,
+            UploadId=self._upload_id,
+            MultipartUpload={'Parts': self._parts}
+        )
+        return self.storage.get_url(self.object_name)
+
+    def abort(self) -> None:
+        """Discard buffered data and any uploaded parts"""
+        self._buffer.clear()
+        if self._upload_id is not None:
+            self.storage.client.abort_multipart_upload(
+                Bucket=self.storage.bucket,
+                Key=self.object_name,
+                UploadId=self._upload_id
+            )
+            self._upload_id = None
+
+
 # Local filesystem fallback
 class LocalStorage:
     """Local filesystem storage for development"""
@@ -140,6 +259,9 @@ class LocalStorage:
         self.base_path = Path(base_path or os.getenv('LOCAL_STORAGE_PATH', './storage'))
         self.base_path.mkdir(parents=True, exist_ok=True)
     
+    def warm_up(self) -> None:
+        """Nothing to connect"""
+
     def _path(self, object_name: str) -> Path:
         return self.base_path / object_name
     
@@ -153,12 +275,20 @@ class LocalStorage:
         shutil.copy2(file_path, dest)
         return str(dest)
     
-    def upload_bytes(self, data: bytes, object_name: str, content_type: str = None) -> str:
+    def upload_bytes(self, data: bytes, object_name: str, content_type: str = None, cache_control: str = None) -> str:
         dest = self._path(object_name)
         dest.parent.mkdir(parents=True, exist_ok=True)
-        dest.write_bytes(data)
+        with span("storage.upload") as log:
+            log.bytes = len(data)
+            dest.write_bytes(data)
         return str(dest)
     
+    def open_writer(self, object_name: str, content_type: str = None) -> 'LocalStreamWriter':
+        """Open a chunked file writer"""
+        dest = self._path(object_name)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        return LocalStreamWriter(dest)
+
     def download_file(self, object_name: str, file_path: str) -> str:
         import shutil
         shutil.copy2(self._path(object_name), file_path)
@@ -196,6 +326,30 @@ class LocalStorage:
         return self.get_url(object_name)
 
 
+class LocalStreamWriter:
+    """Chunked write to a temporary file, renamed into place on close"""
+
+    def __init__(self, dest: Path):
+        self.dest = dest
+        self.bytes_written = 0
+        self._tmp = dest.with_name(dest.name + '.part')
+        self._file = open(self._tmp, 'wb')
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def close(self) -> str:
+        self._file.close()
+        os.replace(self._tmp, self.dest)
+        return str(self.dest)
+
+    def abort(self) -> None:
+        self._file.close()
+        if self._tmp.exists():
+            self._tmp.unlink()
+
+
 def get_storage(bucket: str = None):
     """Get storage client (S3 or local fallback)"""
     if os.getenv('AWS_ACCESS_KEY_ID') and HAS_BOTO:
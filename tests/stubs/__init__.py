@@ -0,0 +1 @@
+# Local stand-in servers for load and latency testing
@@ -0,0 +1,264 @@
+"""
+LLM Provider Stand-in Server
+Offline imitation of the YaGPT completion and Anthropic messages APIs
+with configurable latency, error injection and templated Russian scripts
+"""
+
+import asyncio
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.script.budget import estimate_tokens
+
+YAGPT_PATH = "/foundationModels/v1/completion"
+CLAUDE_PATH = "/v1/messages"
+
+_ARTICLE_LINE = re.compile(r"^\d+\.\s+(.+)$", re.MULTILINE)
+_DATE = re.compile(r"на дату ([^.\n]+)")
+
+FILLER_SENTENCES = [
+    "Это может заметно изменить то, как мы работаем с нейросетями каждый день.",
+    "Эксперты пока спорят, но рынок уже реагирует.",
+    "Видимо, гонка за умными моделями только набирает обороты.",
+    "Посмотрим, как это отразится на стартапах и крупных компаниях.",
+    "Звучит амбициозно, и, конечно, мы будем следить за развитием событий.",
+]
+
+
+@dataclass
+class LatencyProfile:
+    """Response latency distribution in seconds"""
+    distribution: str = "fixed"  # fixed|uniform|lognormal
+    mean: float = 0.0
+    spread: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyProfile":
+        """Parse 'fixed:1.5', 'uniform:0.5:2.0' or 'lognormal:1.5:0.4'"""
+        parts = spec.split(":")
+        distribution = parts[0]
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        mean = float(parts[1]) if len(parts) > 1 else 0.0
+        spread = float(parts[2]) if len(parts) > 2 else 0.0
+        return cls(distribution, mean, spread)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency value"""
+        if self.distribution == "uniform":
+            return rng.uniform(self.mean, self.spread)
+        if self.distribution == "lognormal" and self.mean > 0:
+            # mean is the median, spread is sigma of the underlying normal
+            return self.mean * rng.lognormvariate(0.0, self.spread)
+        return self.mean
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stand-in server"""
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    error_429_rate: float = 0.0
+    error_503_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 120.0
+    retry_after_seconds: int = 1
+    stream_chunks: int = 20
+    target_words: int = 600
+    fixed_script: Optional[str] = None
+    seed: Optional[int] = None
+
+
+def render_script(prompt: str, target_words: int = 600) -> str:
+    """Render a plausible Russian podcast script from the prompt's articles"""
+    titles = _ARTICLE_LINE.findall(prompt)
+    date_match = _DATE.search(prompt)
+    date_str = date_match.group(1).strip() if date_match else "сегодня"
+
+    paragraphs = [
+        "Доброе утро! С вами AI Morning Podcast.",
+        f"Сегодня, {date_str}, у нас {len(titles)} новостей из мира искусственного интеллекта.",
+    ]
+    for i, title in enumerate(titles, 1):
+        paragraphs.append(f"Новость {i}: {title}. {FILLER_SENTENCES[i % len(FILLER_SENTENCES)]}")
+
+    outro = "Это был краткий обзор ключевых AI новостей. До встречи завтра!"
+    words = sum(len(p.split()) for p in paragraphs) + len(outro.split())
+
+    # Pad news paragraphs with commentary until the target length is reached
+    i = 0
+    while words < target_words and len(paragraphs) > 2:
+        sentence = FILLER_SENTENCES[i % len(FILLER_SENTENCES)]
+        index = 2 + i % max(len(paragraphs) - 2, 1)
+        paragraphs[index] += " " + sentence
+        words += len(sentence.split())
+        i += 1
+
+    paragraphs.append(outro)
+    return "\n\n".join(paragraphs)
+
+
+def split_chunks(text: str, count: int) -> List[str]:
+    """Split text into roughly equal word-aligned chunks for streaming"""
+    words = text.split(" ")
+    size = max(len(words) // max(count, 1), 1)
+    return [" ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+            for i in range(0, len(words), size)]
+
+
+def create_app(config: Optional[StubConfig] = None) -> FastAPI:
+    """Create the stand-in server application"""
+    config = config or StubConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="LLM Provider Stand-in")
+    app.state.config = config
+    app.state.requests = 0
+
+    async def inject_faults(request_kind: str) -> Optional[JSONResponse]:
+        app.state.requests += 1
+        await asyncio.sleep(config.latency.sample(rng))
+
+        roll = rng.random()
+        if roll < config.timeout_rate:
+            await asyncio.sleep(config.timeout_seconds)
+        roll -= config.timeout_rate
+        if roll < config.error_429_rate:
+            return JSONResponse(
+                {"error": {"type": "rate_limit_error", "message": f"{request_kind}: too many requests"}},
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after_seconds)}
+            )
+        roll -= config.error_429_rate
+        if roll < config.error_503_rate:
+            return JSONResponse(
+                {"error": {"type": "overloaded_error", "message": f"{request_kind}: unavailable"}},
+                status_code=503
+            )
+        return None
+
+    def script_for(prompt: str) -> str:
+        return config.fixed_script or render_script(prompt, config.target_words)
+
+    @app.post(YAGPT_PATH)
+    async def yagpt_completion(request: Request):
+        body = await request.json()
+        fault = await inject_faults("yagpt")
+        if fault:
+            return fault
+
+        prompt = "\n".join(m.get("text", "") for m in body.get("messages", []))
+        text = script_for(prompt)
+        usage = {
+            "inputTextTokens": str(estimate_tokens(prompt, "yagpt")),
+            "completionTokens": str(estimate_tokens(text, "yagpt")),
+        }
+
+        def result(alternative_text: str, status: str) -> dict:
+            return {"result": {
+                "alternatives": [{
+                    "message": {"role": "assistant", "text": alternative_text},
+                    "status": status
+                }],
+                "usage": usage,
+                "modelVersion": "stub"
+            }}
+
+        if not body.get("completionOptions", {}).get("stream"):
+            return result(text, "ALTERNATIVE_STATUS_FINAL")
+
+        # YaGPT streams newline-delimited JSON with the cumulative text so far
+        async def stream() -> AsyncIterator[bytes]:
+            sent = ""
+            for chunk in split_chunks(text, config.stream_chunks):
+                sent += chunk
+                yield (json.dumps(result(sent, "ALTERNATIVE_STATUS_PARTIAL"), ensure_ascii=False) + "\n").encode()
+                await asyncio.sleep(0)
+            yield (json.dumps(result(text, "ALTERNATIVE_STATUS_FINAL"), ensure_ascii=False) + "\n").encode()
+
+        return StreamingResponse(stream(), media_type="application/json")
+
+    @app.post(CLAUDE_PATH)
+    async def claude_messages(request: Request):
+        body = await request.json()
+        fault = await inject_faults("claude")
+        if fault:
+            return fault
+
+        prompt = body.get("system", "") + "\n" + "\n".join(
+            m.get("content", "") if isinstance(m.get("content"), str) else ""
+            for m in body.get("messages", [])
+        )
+        text = script_for(prompt)
+        input_tokens = estimate_tokens(prompt, "claude")
+        output_tokens = estimate_tokens(text, "claude")
+        message = {
+            "id": f"msg_stub_{app.state.requests}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "stub"),
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+        }
+
+        if not body.get("stream"):
+            return {**message, "content": [{"type": "text", "text": text}]}
+
+        # Anthropic streams server-sent events
+        def event(name: str, data: dict) -> bytes:
+            return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+        async def stream() -> AsyncIterator[bytes]:
+            start = {**message, "content": [], "stop_reason": None,
+                     "usage": {"input_tokens": input_tokens, "output_tokens": 0}}
+            yield event("message_start", {"type": "message_start", "message": start})
+            yield event("content_block_start", {
+                "type": "content_block_start", "index": 0,
+                "content_block": {"type": "text", "text": ""}
+            })
+            for chunk in split_chunks(text, config.stream_chunks):
+                yield event("content_block_delta", {
+                    "type": "content_block_delta", "index": 0,
+                    "delta": {"type": "text_delta", "text": chunk}
+                })
+                await asyncio.sleep(0)
+            yield event("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield event("message_delta", {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn"},
+                "usage": {"output_tokens": output_tokens}
+            })
+            yield event("message_stop", {"type": "message_stop"})
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+# CLI
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Offline YaGPT/Anthropic stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:S | uniform:MIN:MAX | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-503", type=float, default=0.0)
+    parser.add_argument("--timeouts", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    stub_config = StubConfig(
+        latency=LatencyProfile.parse(args.latency),
+        error_429_rate=args.error_429,
+        error_503_rate=args.error_503,
+        timeout_rate=args.timeouts,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(stub_config), host=args.host, port=args.port)
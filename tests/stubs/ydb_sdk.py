@@ -0,0 +1,151 @@
+"""
+YDB Stand-in
+In-process imitation of the YDB SDK surface that YDBClient uses: a session
+pool, sessions, prepare and transactions, with simulated round trips
+
+Installed as the ydb module (sys.modules["ydb"]) for benchmarks and tests
+without a database. Queries return no rows; what is measured is how many
+round trips and compilations the client causes.
+"""
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+
+class Error(Exception):
+    pass
+
+
+class BadSession(Error):
+    pass
+
+
+class SessionExpired(Error):
+    pass
+
+
+class NotFound(Error):
+    pass
+
+
+class SchemeError(Error):
+    pass
+
+
+class SerializableReadWrite:
+    pass
+
+
+RETRIABLE = (BadSession, SessionExpired)
+
+
+@dataclass
+class DataQuery:
+    """A query prepared on one session"""
+    yql_text: str
+    session_id: str
+
+
+@dataclass
+class Latency:
+    """Simulated server costs in seconds"""
+    round_trip: float = 0.002
+    compile: float = 0.003  # extra server time to compile a query on prepare
+
+
+class Session:
+    """Tracks the queries the "server" has compiled for this session"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, pool: "SessionPool"):
+        self.pool = pool
+        self.session_id = f"stand-in-{next(self._ids)}"
+        self.alive = True
+        self.compiled = set()
+
+    def _call(self, seconds: float) -> None:
+        self.pool.round_trips += 1
+        if seconds:
+            time.sleep(seconds)
+        error, self.pool.fail_next = self.pool.fail_next, None
+        if error is not None:
+            raise error
+        if not self.alive:
+            raise BadSession(f"Session {self.session_id} is gone")
+
+    def prepare(self, query: str) -> DataQuery:
+        self._call(self.pool.latency.round_trip + self.pool.latency.compile)
+        self.pool.prepares += 1
+        self.compiled.add(query)
+        return DataQuery(query, self.session_id)
+
+    def transaction(self, mode=None) -> "Transaction":
+        return Transaction(self)
+
+
+class Transaction:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def execute(self, query, parameters: Optional[dict] = None, commit_tx: bool = False) -> List:
+        session = self.session
+        if isinstance(query, DataQuery):
+            session._call(session.pool.latency.round_trip)
+            if query.session_id != session.session_id:
+                raise BadSession("Query was prepared on another session")
+            if query.yql_text not in session.compiled:
+                raise NotFound("Query not found")
+        else:
+            # Unprepared text is compiled as part of the call
+            session._call(session.pool.latency.round_trip + session.pool.latency.compile)
+        session.pool.executes += 1
+        return []
+
+    def commit(self) -> None:
+        self.session._call(self.session.pool.latency.round_trip)
+
+
+class SessionPool:
+    """Hands out sessions like ydb.SessionPool.retry_operation_sync"""
+
+    def __init__(self, latency: Latency = None, size: int = 4, retries: int = 3):
+        self.latency = latency or Latency()
+        self.size = size
+        self.retries = retries
+        self.round_trips = 0
+        self.prepares = 0
+        self.executes = 0
+        self.fail_next: Optional[Exception] = None  # raised by the next server call
+        self._idle: List[Session] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Session:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return Session(self)
+
+    def release(self, session: Session) -> None:
+        with self._lock:
+            if session.alive and len(self._idle) < self.size:
+                self._idle.append(session)
+
+    def retry_operation_sync(self, callee: Callable[[Session], object]):
+        for attempt in range(self.retries + 1):
+            session = self.acquire()
+            try:
+                return callee(session)
+            except RETRIABLE:
+                session.alive = False
+                if attempt == self.retries:
+                    raise
+            finally:
+                self.release(session)
+
+    def sessions(self) -> List[Session]:
+        with self._lock:
+            return list(self._idle)
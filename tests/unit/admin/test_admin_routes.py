@@ -0,0 +1,59 @@
+"""
+Unit tests for admin routes
+"""
+
+import pytest
+from unittest.mock import Mock
+from fastapi.testclient import TestClient
+from src.common import profiler
+from src.main import app
+
+ADMIN = {"X-Admin-Token": "s3cret"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr("src.admin.routes.get_settings", lambda: Mock(admin_token="s3cret"))
+    return TestClient(app)
+
+
+class TestAdminRoutes:
+    """Test access control and diagnostics endpoints"""
+
+    def test_disabled_without_configured_token(self, monkeypatch):
+        """Test admin routes do not exist unless ADMIN_TOKEN is set"""
+        monkeypatch.setattr("src.admin.routes.get_settings", lambda: Mock(admin_token=""))
+
+        response = TestClient(app).post("/api/admin/profile/next-run", headers=ADMIN)
+
+        assert response.status_code == 404
+
+    def test_wrong_token_is_forbidden(self, client):
+        assert client.post("/api/admin/profile/next-run").status_code == 403
+        assert client.post("/api/admin/profile/next-run", headers={"X-Admin-Token": "nope"}).status_code == 403
+
+    def test_profile_next_run(self, client):
+        """Test arming the pipeline profile"""
+        response = client.post("/api/admin/profile/next-run", headers=ADMIN)
+
+        assert response.json() == {"status": "armed"}
+        assert profiler.take_run_profile_request() is True
+
+    def test_memory_snapshots_and_diff(self, client):
+        """Test snapshot, listing, diff and stop"""
+        try:
+            first = client.post("/api/admin/memory/snapshots", headers=ADMIN).json()["snapshot_id"]
+            second = client.post("/api/admin/memory/snapshots?limit=3", headers=ADMIN).json()
+            assert len(second["top"]) <= 3
+
+            listed = client.get("/api/admin/memory/snapshots", headers=ADMIN).json()["snapshots"]
+            assert first in listed and second["snapshot_id"] in listed
+
+            diff = client.get(
+                f"/api/admin/memory/diff?older={first}&newer={second['snapshot_id']}", headers=ADMIN
+            )
+            assert diff.status_code == 200
+            assert "diff" in diff.json()
+            assert client.get("/api/admin/memory/snapshots/missing", headers=ADMIN).status_code == 404
+        finally:
+            assert client.delete("/api/admin/memory/snapshots", headers=ADMIN).json() == {"status": "stopped"}
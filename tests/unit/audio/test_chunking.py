@@ -0,0 +1,60 @@
+"""
+Unit tests for script chunking
+"""
+
+import pytest
+from src.audio.chunking import split_text, split_sentences
+
+
+class TestSplitText:
+    """Test sentence-aware chunking"""
+
+    def test_short_text_is_single_chunk(self):
+        """Test text under the limit is untouched"""
+        assert split_text("Доброе утро! Новости дня.", 100) == ["Доброе утро! Новости дня."]
+
+    def test_paragraphs_are_packed_together(self):
+        """Test that small paragraphs share a chunk"""
+        text = "Первый абзац.\n\nВторой абзац.\n\nТретий абзац."
+
+        chunks = split_text(text, 30)
+
+        assert chunks == ["Первый абзац.\n\nВторой абзац.", "Третий абзац."]
+
+    def test_chunks_respect_limit_and_sentence_boundaries(self):
+        """Test long paragraphs are split at sentence ends"""
+        text = " ".join(f"Предложение номер {i} про искусственный интеллект." for i in range(100))
+
+        chunks = split_text(text, 500)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 500 for chunk in chunks)
+        assert all(chunk.endswith(".") for chunk in chunks)
+
+    def test_no_text_is_lost(self):
+        """Test that chunk contents cover the original words in order"""
+        text = "Доброе утро!\n\n" + " ".join(f"Слово{i}, и ещё." for i in range(300))
+
+        chunks = split_text(text, 200)
+
+        assert " ".join(chunks).split() == text.split()
+
+    def test_oversized_sentence_is_split_at_words(self):
+        """Test a sentence longer than the limit"""
+        text = " ".join(["слово"] * 200)
+
+        chunks = split_text(text, 50)
+
+        assert all(len(chunk) <= 50 for chunk in chunks)
+        assert " ".join(chunks).split() == text.split()
+
+    def test_invalid_limit(self):
+        """Test that a non-positive limit is rejected"""
+        with pytest.raises(ValueError):
+            split_text("text", 0)
+
+    def test_split_sentences(self):
+        """Test sentence splitting across paragraphs"""
+        text = "Привет! Как дела?\n\nВсё хорошо"
+
+        assert split_sentences(text) == ["Привет!", "Как дела?", "Всё хорошо"]
@@ -0,0 +1,90 @@
+"""
+Unit tests for HLS packaging
+"""
+
+import pytest
+from src.audio import hls, mp3
+from src.storage.s3_client import LocalStorage
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz: 417-byte frames of 1152 samples
+HEADER = bytes((0xFF, 0xFB, 0x90, 0x44))
+FRAME_SECONDS = 1152 / 44100
+
+
+def make_mp3(frames: int) -> bytes:
+    return mp3.concat([b"".join(HEADER + bytes([i % 256]) * 413 for i in range(frames))])
+
+
+class TestSegmenting:
+    """Test frame-aligned slicing"""
+
+    def test_segments_cover_every_frame_once(self):
+        """Test segments are whole frames and add up to the source"""
+        data = make_mp3(1000)
+        rendition = hls.segment(data, target_seconds=6)
+
+        per_segment = round(6 / FRAME_SECONDS)
+        assert len(rendition.segments) == -(-1000 // per_segment)
+        assert sum(s.size_bytes for s in rendition.segments) == 1000 * 417
+        assert rendition.segments[1].start_seconds == pytest.approx(per_segment * FRAME_SECONDS)
+
+        body = rendition.segment_bytes(rendition.segments[1])
+        assert mp3.scan(body).frame_count == per_segment
+
+    def test_segment_starts_with_timestamp(self):
+        """Test the ID3 PRIV timestamp in 90 kHz units"""
+        rendition = hls.segment(make_mp3(500), target_seconds=6)
+        segment = rendition.segments[2]
+
+        body = rendition.segment_bytes(segment)
+        owner = b"com.apple.streaming.transportStreamTimestamp\x00"
+        position = body.index(owner) + len(owner)
+
+        assert body.startswith(b"ID3\x04")
+        assert int.from_bytes(body[position:position + 8], "big") == round(segment.start_seconds * 90000)
+
+    def test_media_playlist(self):
+        """Test a valid VOD playlist"""
+        playlist = hls.segment(make_mp3(600), target_seconds=6).playlist()
+
+        assert playlist.startswith("#EXTM3U\n")
+        assert "#EXT-X-TARGETDURATION:7" in playlist
+        assert "seg-00000.mp3" in playlist
+        assert playlist.rstrip().endswith("#EXT-X-ENDLIST")
+
+    def test_non_mp3_yields_nothing(self):
+        """Test unparseable input produces no files"""
+        assert hls.package({"standard": b"not audio"}) == {}
+
+
+class TestPublish:
+    """Test packaging and upload through storage"""
+
+    @pytest.mark.asyncio
+    async def test_publish_uploads_content_addressed_files(self, tmp_path):
+        """Test segments, media and master playlists are stored under a content hash"""
+        storage = LocalStorage(base_path=str(tmp_path))
+        storage.upload_bytes(make_mp3(600), "audio/ep-1.mp3")
+        storage.upload_bytes(make_mp3(300), "audio/ep-1-mobile.mp3")
+
+        url = await hls.publish("ep-1", {"standard": "audio/ep-1.mp3", "mobile": "audio/ep-1-mobile.mp3"}, storage)
+
+        keys = [o["key"] for o in storage.list_objects("audio/hls/ep-1/")]
+        assert url.endswith("/master.m3u8")
+        assert any(k.endswith("standard/index.m3u8") for k in keys)
+        assert any(k.endswith("mobile/seg-00000.mp3") for k in keys)
+
+        master = (tmp_path / url.split(str(tmp_path) + "/")[1]).read_text()
+        assert master.count("#EXT-X-STREAM-INF") == 2
+        assert 'CODECS="mp4a.40.34"' in master
+
+    def test_s3_upload_sets_cache_control(self):
+        """Test the S3 client forwards Cache-Control"""
+        from unittest.mock import Mock
+        from src.storage.s3_client import S3Client
+
+        client = S3Client(bucket="b")
+        client._client = Mock()
+        client.upload_bytes(b"x", "k", "audio/mpeg", hls.IMMUTABLE)
+
+        assert client._client.put_object.call_args.kwargs["CacheControl"] == hls.IMMUTABLE
@@ -0,0 +1,193 @@
+"""
+Unit tests for the MP3 frame toolkit
+"""
+
+import pytest
+from array import array
+from src.audio import mp3
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo, no CRC
+HEADER = bytes((0xFF, 0xFB, 0x90, 0x44))
+HEADER_PADDED = bytes((0xFF, 0xFB, 0x92, 0x44))
+FRAME_LENGTH = 417
+
+
+def make_frames(count: int, fill: int = 0x00) -> bytes:
+    """Build count frames alternating padding like a real CBR stream"""
+    frames = []
+    for i in range(count):
+        if i % 3 == 2:
+            frames.append(HEADER_PADDED + bytes([fill]) * (FRAME_LENGTH + 1 - 4))
+        else:
+            frames.append(HEADER + bytes([fill]) * (FRAME_LENGTH - 4))
+    return b"".join(frames)
+
+
+def id3v2(payload_size: int = 20) -> bytes:
+    syncsafe = bytes(((payload_size >> 21) & 0x7F, (payload_size >> 14) & 0x7F,
+                      (payload_size >> 7) & 0x7F, payload_size & 0x7F))
+    return b"ID3\x03\x00\x00" + syncsafe + b"\x00" * payload_size
+
+
+def with_lame_header(audio: bytes, delay: int, padding: int) -> bytes:
+    lengths = array("L", [FRAME_LENGTH] * mp3.scan(audio).frame_count)
+    return mp3.build_xing_frame(HEADER, lengths, 1152, delay, padding) + audio
+
+
+class TestScan:
+    """Test frame indexing"""
+
+    def test_counts_frames_and_duration(self):
+        """Test exact duration from frame count"""
+        info = mp3.scan(make_frames(100))
+
+        assert info.frame_count == 100
+        assert info.sample_rate == 44100
+        assert info.duration_seconds == pytest.approx(100 * 1152 / 44100)
+        assert info.bitrate_kbps == pytest.approx(128, rel=0.01)
+
+    def test_skips_id3_tags_and_junk(self):
+        """Test ID3v2, ID3v1 and garbage bytes are not counted"""
+        data = id3v2() + b"\x00\x12junk" + make_frames(10) + b"TAG" + b"\x00" * 125
+
+        info = mp3.scan(data)
+
+        assert info.frame_count == 10
+        assert info.offsets[0] == len(id3v2()) + 6
+
+    def test_accepts_memoryview(self):
+        """Test scanning a memoryview without copying"""
+        assert mp3.scan(memoryview(make_frames(5))).frame_count == 5
+
+    def test_reads_lame_delay_and_padding(self):
+        """Test encoder delay/padding reduce the reported duration"""
+        data = with_lame_header(make_frames(10), delay=576, padding=1000)
+
+        info = mp3.scan(data)
+
+        assert info.frame_count == 10
+        assert info.xing.encoder_delay == 576
+        assert info.xing.encoder_padding == 1000
+        assert info.duration_seconds == pytest.approx((10 * 1152 - 1576) / 44100)
+
+    def test_non_mp3_data(self):
+        """Test arbitrary bytes yield no frames"""
+        assert mp3.scan("Привет".encode()).frame_count == 0
+
+
+class TestConcat:
+    """Test gapless concatenation"""
+
+    def test_strips_inner_tags_and_writes_one_header(self):
+        """Test ID3 tags and per-chunk Xing frames are removed"""
+        first = id3v2() + with_lame_header(make_frames(20, 0x11), 576, 0)
+        second = id3v2() + make_frames(30, 0x22)
+
+        result = mp3.concat([first, second])
+        info = mp3.scan(result)
+
+        assert result.count(b"ID3") == 0
+        assert info.frame_count == 50
+        assert info.xing.frames == 50
+        assert info.xing.bytes == len(result)
+        assert info.xing.encoder_delay == 576
+
+    def test_drops_whole_padding_frames_between_chunks(self):
+        """Test trailing frames made only of encoder padding are removed"""
+        first = with_lame_header(make_frames(10), delay=576, padding=2 * 1152 + 100)
+        last = with_lame_header(make_frames(10), delay=576, padding=700)
+
+        info = mp3.scan(mp3.concat([first, last]))
+
+        assert info.frame_count == 18
+        assert info.xing.encoder_padding == 700
+
+    def test_toc_is_monotonic(self):
+        """Test the seek table is usable"""
+        result = mp3.concat([make_frames(200)])
+        offset = 4 + 32 + 16
+
+        toc = result[offset:offset + 100]
+
+        assert toc[0] < 5
+        assert list(toc) == sorted(toc)
+        assert toc[50] == pytest.approx(128, abs=2)
+
+    def test_lame_tag_crc(self):
+        """Test the LAME tag CRC covers the header bytes"""
+        frame = mp3.build_xing_frame(HEADER, array("L", [FRAME_LENGTH] * 10), 1152)
+        lame = 4 + 32 + 120
+
+        assert int.from_bytes(frame[lame + 34:lame + 36], "big") == mp3.crc16(frame[:lame + 34])
+
+    def test_passes_through_unparseable_chunks(self):
+        """Test non-MP3 chunks are joined unchanged"""
+        assert mp3.concat([b"abc", b"def"]) == b"abcdef"
+
+    def test_crc16_check_value(self):
+        """Test CRC-16/ARC reference value"""
+        assert mp3.crc16(b"123456789") == 0xBB3D
+
+
+class TestSplicer:
+    """Test incremental gapless splicing"""
+
+    @pytest.mark.parametrize("piece", [1, 100, 4096])
+    def test_matches_concat_frames_for_any_split(self, piece):
+        """Test the same audio frames as concat(), without its header"""
+        chunks = [
+            id3v2() + with_lame_header(make_frames(10, 0x11), delay=576, padding=2 * 1152 + 100),
+            id3v2(300) + make_frames(5, 0x22),
+            with_lame_header(make_frames(10, 0x33), delay=576, padding=700),
+        ]
+        splicer = mp3.Mp3Splicer()
+
+        out = b""
+        for n, chunk in enumerate(chunks):
+            for i in range(0, len(chunk), piece):
+                out += splicer.feed(chunk[i:i + piece])
+            out += splicer.end_segment(last=n == len(chunks) - 1)
+
+        assert out == mp3.strip_tags(mp3.concat(chunks))
+        assert mp3.scan(out).frame_count == 23
+
+    def test_keeps_one_frame_of_a_padding_only_segment(self):
+        """Test a segment is never dropped entirely"""
+        splicer = mp3.Mp3Splicer()
+
+        out = splicer.feed(with_lame_header(make_frames(1), delay=0, padding=5000))
+        out += splicer.end_segment()
+
+        assert mp3.scan(out).frame_count == 1
+
+    def test_passes_through_unparseable_segments(self):
+        """Test non-MP3 segments are written unchanged"""
+        splicer = mp3.Mp3Splicer()
+
+        out = splicer.feed(b"abc") + splicer.feed(b"def") + splicer.end_segment()
+
+        assert out == b"abcdef"
+
+
+class TestStreamMeter:
+    """Test incremental measurement"""
+
+    @pytest.mark.parametrize("piece", [1, 7, 100, 4096])
+    def test_matches_scan_for_any_split(self, piece):
+        """Test frames split across feeds are counted once"""
+        data = id3v2(300) + make_frames(40) + id3v2() + make_frames(10)
+        meter = mp3.Mp3StreamMeter()
+
+        for i in range(0, len(data), piece):
+            meter.feed(data[i:i + piece])
+
+        assert meter.size_bytes == len(data)
+        assert meter.frame_count == 50
+        assert meter.duration_seconds == pytest.approx(50 * 1152 / 44100)
+
+    def test_ignores_xing_frames(self):
+        """Test Xing/Info frames do not add duration"""
+        meter = mp3.Mp3StreamMeter()
+        meter.feed(with_lame_header(make_frames(10), 0, 0))
+
+        assert meter.frame_count == 10
@@ -0,0 +1,118 @@
+"""
+Unit tests for multi-bitrate audio renditions
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.audio.renditions import (
+    RenditionSpec, choose_rendition, parse_renditions, prefers_low_bitrate, rendition_object_name
+)
+from src.audio.tts import AudioUpload, TTSService
+from src.models.episode import AudioRendition
+
+
+def rendition(name: str, bitrate: int) -> AudioRendition:
+    return AudioRendition(
+        name=name, output_format=f"mp3_44100_{bitrate}", bitrate_kbps=bitrate,
+        url=f"https://s3/{name}.mp3", size_bytes=bitrate * 1000, duration_seconds=300.0
+    )
+
+
+class TestRenditionSpecs:
+    """Test rendition configuration"""
+
+    def test_parse_renditions(self):
+        """Test names, formats and bitrates"""
+        specs = parse_renditions("standard:mp3_44100_128, mobile:mp3_22050_32")
+
+        assert specs == [RenditionSpec("standard", "mp3_44100_128"), RenditionSpec("mobile", "mp3_22050_32")]
+        assert specs[1].bitrate_kbps == 32
+
+    def test_parse_rejects_unknown_formats(self):
+        """Test only MP3 provider formats are accepted"""
+        with pytest.raises(ValueError):
+            parse_renditions("hifi:pcm_44100")
+        with pytest.raises(ValueError):
+            parse_renditions("")
+
+    def test_primary_keeps_canonical_path(self):
+        """Test storage keys"""
+        spec = RenditionSpec("mobile", "mp3_22050_32")
+
+        assert rendition_object_name("ep-1", spec, primary=True) == "audio/ep-1.mp3"
+        assert rendition_object_name("ep-1", spec, primary=False) == "audio/ep-1-mobile.mp3"
+
+
+class TestRenditionSelection:
+    """Test client-hint negotiation"""
+
+    @pytest.fixture
+    def renditions(self):
+        return [rendition("standard", 128), rendition("mobile", 32)]
+
+    @pytest.mark.parametrize("hints", [
+        {"save_data": "on"},
+        {"ect": "3g"},
+        {"downlink": "0.4"},
+    ])
+    def test_constrained_clients_get_low_bitrate(self, renditions, hints):
+        """Test Save-Data, ECT and Downlink"""
+        assert choose_rendition(renditions, **hints).name == "mobile"
+
+    def test_default_is_highest_bitrate(self, renditions):
+        """Test no hints or a fast link get full quality"""
+        assert choose_rendition(renditions).name == "standard"
+        assert choose_rendition(renditions, ect="4g", downlink="10").name == "standard"
+        assert not prefers_low_bitrate(downlink="fast")
+
+    def test_explicit_quality_wins(self, renditions):
+        """Test ?quality= overrides hints"""
+        assert choose_rendition(renditions, save_data="on", quality="standard").name == "standard"
+        assert choose_rendition([]) is None
+
+
+class TestStreamRenditions:
+    """Test parallel rendition synthesis"""
+
+    @pytest.mark.asyncio
+    async def test_streams_each_format(self):
+        """Test each rendition uses its own output format and object name"""
+        service = TTSService()
+        seen = []
+
+        async def fake_stream(self, text, object_name, storage=None):
+            seen.append((self.output_format, object_name))
+            return AudioUpload(url=object_name, size_bytes=1, duration_seconds=1.0)
+
+        specs = parse_renditions("standard:mp3_44100_128,mobile:mp3_22050_32")
+        with patch.object(TTSService, 'stream_to_storage', new=fake_stream):
+            uploads = await service.stream_renditions("Текст", "ep-1", specs)
+
+        assert sorted(seen) == [("mp3_22050_32", "audio/ep-1-mobile.mp3"), ("mp3_44100_128", "audio/ep-1.mp3")]
+        assert set(uploads) == {"standard", "mobile"}
+        assert service.output_format == TTSService.OUTPUT_FORMAT
+
+    @pytest.mark.asyncio
+    async def test_secondary_failure_is_tolerated(self):
+        """Test only the primary rendition is required"""
+        service = TTSService()
+        service.stream_to_storage = AsyncMock(side_effect=[
+            AudioUpload(url="a", size_bytes=1, duration_seconds=1.0),
+            Exception("mobile failed"),
+        ])
+
+        uploads = await service.stream_renditions("Текст", "ep-1", parse_renditions("standard:mp3_44100_128,mobile:mp3_22050_32"))
+
+        assert list(uploads) == ["standard"]
+
+    @pytest.mark.asyncio
+    async def test_primary_failure_raises(self):
+        """Test the episode has no audio without the primary rendition"""
+        service = TTSService()
+        service.stream_to_storage = AsyncMock(side_effect=[
+            Exception("standard failed"),
+            AudioUpload(url="b", size_bytes=1, duration_seconds=1.0),
+        ])
+
+        with pytest.raises(Exception, match="standard failed"):
+            await service.stream_renditions("Текст", "ep-1", parse_renditions("standard:mp3_44100_128,mobile:mp3_22050_32"))
@@ -0,0 +1,215 @@
+"""
+Unit tests for the quota-aware TTS scheduler
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+from src.audio.scheduler import (
+    PRIORITY_BACKFILL, PRIORITY_TODAY, QuotaExceededError, QuotaTracker, TTSScheduler,
+    parse_reset
+)
+from src.audio.tts import TTSService
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestQuotaTracker:
+    """Test quota accounting"""
+
+    def test_reservations_reduce_remaining(self):
+        """Test admitted jobs cannot over-commit the quota"""
+        quota = QuotaTracker()
+        quota.update_from_subscription({"character_limit": 1000, "character_count": 600})
+
+        assert quota.reserve(300)
+        assert not quota.reserve(200)
+        quota.release(300)
+        assert quota.reserve(400)
+
+    def test_unknown_limit_admits(self):
+        """Test jobs run optimistically before the limit is known"""
+        assert QuotaTracker().reserve(10_000)
+
+    def test_exhausted_until_reset(self):
+        """Test a 429 blocks admissions until the reset time"""
+        clock = FakeClock()
+        quota = QuotaTracker(clock=clock)
+        quota.exhaust(reset_at=clock.now + 60)
+
+        assert not quota.available(1)
+        assert quota.wait_seconds(300) == 60
+
+        clock.now += 61
+        assert quota.available(1)
+
+    def test_parse_reset_formats(self):
+        """Test epoch and ISO reset values"""
+        assert parse_reset("1705236000") == 1705236000.0
+        assert parse_reset("2024-01-14T12:40:00Z") == 1705236000.0
+        assert parse_reset("unknown") is None
+
+
+class TestTTSServiceQuota:
+    """Test quota signals from the TTS client"""
+
+    @pytest.mark.asyncio
+    async def test_429_carries_reset_time(self):
+        """Test the quota error exposes the parsed reset time"""
+        service = TTSService()
+        with patch('src.audio.tts.requests.post') as mock_post:
+            mock_post.return_value = Mock(status_code=429, headers={'X-RateLimit-Reset': '1705236000'})
+            mock_post.return_value.json.return_value = {"detail": {"status": "quota_exceeded"}}
+
+            with pytest.raises(QuotaExceededError) as error:
+                await service.synthesize("Текст")
+
+        assert error.value.reset_at == 1705236000.0
+        assert mock_post.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_usage_headers_and_subscription_update_tracker(self):
+        """Test consumed characters are tracked"""
+        quota = QuotaTracker()
+        service = TTSService(quota_tracker=quota)
+        subscription = Mock(status_code=200)
+        subscription.json.return_value = {
+            "character_limit": 10_000, "character_count": 2_000, "next_character_count_reset_unix": 4102444800
+        }
+        with patch('src.audio.tts.requests.get', return_value=subscription), \
+             patch('src.audio.tts.requests.post') as mock_post:
+            mock_post.return_value = Mock(status_code=200, content=b"audio", headers={"character-cost": "500"})
+
+            await service.refresh_quota()
+            await service.synthesize("Текст")
+
+        assert quota.remaining == 7_500
+        assert quota.reset_at == 4102444800.0
+        assert service.check_quota(7_500)
+        assert not service.check_quota(7_501)
+
+
+class TestTTSScheduler:
+    """Test admission, parking and priority"""
+
+    @pytest.mark.asyncio
+    async def test_today_runs_before_backfills(self):
+        """Test queued jobs drain in priority order"""
+        scheduler = TTSScheduler()
+        order = []
+
+        def job(name):
+            async def run():
+                order.append(name)
+                return name
+            return run
+
+        jobs = [
+            scheduler.submit(job("backfill-1"), 10, PRIORITY_BACKFILL),
+            scheduler.submit(job("backfill-2"), 10, PRIORITY_BACKFILL),
+            scheduler.submit(job("today"), 10, PRIORITY_TODAY),
+        ]
+
+        assert await asyncio.gather(*jobs) == ["backfill-1", "backfill-2", "today"]
+        assert order == ["today", "backfill-1", "backfill-2"]
+
+    @pytest.mark.asyncio
+    async def test_parks_until_reset_instead_of_failing(self):
+        """Test a 429 re-queues the job and it completes after the reset"""
+        clock = FakeClock()
+        quota = QuotaTracker(clock=clock)
+        scheduler = TTSScheduler(quota)
+        calls = []
+
+        async def run():
+            calls.append(clock.now)
+            if len(calls) == 1:
+                raise QuotaExceededError("Quota exceeded", reset_at=clock.now + 0.05)
+            return "audio"
+
+        async def advance():
+            await asyncio.sleep(0.01)
+            clock.now += 1
+
+        job = scheduler.submit(run, 100)
+        with patch.object(quota, "wait_seconds", return_value=0.02):
+            await advance()
+            assert job.status == "parked"
+            assert await job == "audio"
+
+        assert len(calls) == 2
+        assert job.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_refreshes_subscription_while_parked(self):
+        """Test the subscription endpoint is polled to learn about new quota"""
+        quota = QuotaTracker()
+        quota.update_from_subscription({"character_limit": 1000, "character_count": 1000})
+
+        async def refresh():
+            quota.update_from_subscription({"character_count": 0})
+
+        scheduler = TTSScheduler(quota, refresh=refresh)
+        scheduler.DEFAULT_PARK_SECONDS = 0.01
+
+        async def run():
+            return "audio"
+
+        assert await scheduler.submit(run, 500) == "audio"
+
+    @pytest.mark.asyncio
+    async def test_job_larger_than_plan_fails(self):
+        """Test jobs that can never fit are not parked forever"""
+        quota = QuotaTracker()
+        quota.update_from_subscription({"character_limit": 100, "character_count": 0})
+        scheduler = TTSScheduler(quota)
+
+        async def run():
+            return "audio"
+
+        with pytest.raises(QuotaExceededError):
+            await scheduler.submit(run, 101)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_leaves_queue(self):
+        """Test cancelling a parked job removes it"""
+        quota = QuotaTracker()
+        quota.exhaust(reset_at=quota.clock() + 3600)
+        scheduler = TTSScheduler(quota)
+
+        async def run():
+            return "audio"
+
+        job = scheduler.submit(run, 10)
+        await asyncio.sleep(0)
+        job.cancel()
+        await asyncio.sleep(0)
+
+        assert scheduler.pending() == []
+        assert job.status == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_admitted_covers_only_the_wait_for_quota(self):
+        """Test the quota wait ends when the job starts, however long it then runs"""
+        quota = QuotaTracker()
+        quota.exhaust(reset_at=quota.clock() + 3600)
+        scheduler = TTSScheduler(quota)
+
+        async def run():
+            await asyncio.sleep(0.05)
+            return "audio"
+
+        parked = scheduler.submit(run, 10, name="parked")
+        assert await parked.admitted(timeout=0.02) is False
+        parked.cancel()
+
+        running = TTSScheduler().submit(run, 10, name="running")
+        assert await running.admitted(timeout=0.02) is True
+        assert running.status == "running"
+        assert await running == "audio"
@@ -0,0 +1,124 @@
+"""
+Unit tests for the TTS segment cache
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from src.audio.segment_cache import SegmentCache, normalize_sentence, segment_key
+from src.audio.tts import TTSService
+from src.storage.s3_client import LocalStorage
+
+
+class TestSegmentKeys:
+    """Test content addressing"""
+
+    def test_normalize_whitespace_and_quotes(self):
+        """Test that cosmetic differences map to the same text"""
+        assert normalize_sentence("  «Привет»,\n мир ") == '"Привет", мир'
+
+    def test_key_depends_on_voice_parameters(self):
+        """Test voice, model, settings and format all change the key"""
+        base = segment_key("Текст.", "voice", "model", {"stability": 0.7}, "mp3_44100_128")
+
+        assert base == segment_key("Текст. ", "voice", "model", {"stability": 0.7}, "mp3_44100_128")
+        assert base != segment_key("Текст.", "other", "model", {"stability": 0.7}, "mp3_44100_128")
+        assert base != segment_key("Текст.", "voice", "model", {"stability": 0.5}, "mp3_44100_128")
+        assert base != segment_key("Текст.", "voice", "model", {"stability": 0.7}, "mp3_22050_32")
+
+
+class TestSegmentCache:
+    """Test LRU storage and statistics"""
+
+    def test_hit_and_miss_statistics(self):
+        """Test hit ratio and characters saved"""
+        cache = SegmentCache(max_bytes=1000)
+        cache.put("a", b"audio", characters=10)
+
+        assert cache.get("a", characters=10) == b"audio"
+        assert cache.get("b", characters=7) is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["characters_saved"] == 10
+        assert stats["characters_synthesized"] == 10
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test the byte limit is enforced"""
+        cache = SegmentCache(max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"5678")
+        cache.get("a")
+        cache.put("c", b"9012")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1234"
+        assert cache.stats()["bytes"] <= 10
+        assert cache.evictions == 1
+
+    def test_persistent_cache_survives_restart(self, tmp_path):
+        """Test entries are reloaded from the storage backend"""
+        storage = LocalStorage(base_path=str(tmp_path))
+        first = SegmentCache(persistent=True)
+        first._storage = storage
+        first.put("key", b"audio")
+
+        second = SegmentCache(persistent=True)
+        second._storage = storage
+
+        assert second.get("key") == b"audio"
+
+    def test_persistent_miss_is_a_single_request(self):
+        """Test a miss downloads once and treats not-found as a miss"""
+        storage = Mock()
+        storage.download_bytes.side_effect = FileNotFoundError("cache/tts/key.mp3")
+        cache = SegmentCache(persistent=True)
+        cache._storage = storage
+
+        assert cache.get("key") is None
+        storage.download_bytes.assert_called_once_with("cache/tts/key.mp3")
+        storage.exists.assert_not_called()
+
+
+class TestDiffResynthesis:
+    """Test that only changed sentences are re-synthesized"""
+
+    @pytest.fixture
+    def tts_service(self):
+        return TTSService(segment_cache=SegmentCache())
+
+    @pytest.mark.asyncio
+    async def test_only_changed_sentences_hit_the_api(self, tts_service):
+        """Test sentence-level diff and in-order splicing"""
+        original = "Доброе утро! Первая новость. Вторая новость.\n\nДо встречи!"
+        edited = "Доброе утро! Первая новость. Новая вторая новость.\n\nДо встречи!"
+
+        async def fake_call(text, **kwargs):
+            return f"[{text}]".encode()
+
+        with patch.object(tts_service, '_make_api_call', new=AsyncMock(side_effect=fake_call)) as mock_call:
+            await tts_service.synthesize_script(original)
+            assert mock_call.call_count == 4
+
+            result = await tts_service.synthesize_script(edited)
+
+        assert mock_call.call_count == 5
+        assert mock_call.call_args.args[0] == "Новая вторая новость."
+        assert result.decode() == "[Доброе утро!][Первая новость.][Новая вторая новость.][До встречи!]"
+        assert tts_service.segment_cache.characters_saved == len("Доброе утро!Первая новость.До встречи!")
+
+    @pytest.mark.asyncio
+    async def test_streaming_uses_cache(self, tts_service):
+        """Test cached sentences are spliced into the stream in order"""
+        script = "Один. Два. Три. Четыре. Пять."
+
+        async def fake_call(text, **kwargs):
+            return text.encode()
+
+        with patch.object(tts_service, '_make_api_call', new=AsyncMock(side_effect=fake_call)) as mock_call:
+            first = b"".join([chunk async for chunk in tts_service.stream_audio(script)])
+            second = b"".join([chunk async for chunk in tts_service.stream_audio(script)])
+
+        assert first == second == "Один.Два.Три.Четыре.Пять.".encode()
+        assert mock_call.call_count == 5
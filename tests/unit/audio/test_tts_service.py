@@ -109,8 +109,9 @@ class TestCircuitBreaker:
 
     @pytest.mark.asyncio
     async def test_exponential_backoff(self, tts_service):
-        """Test that retries use exponential backoff"""
-        with patch('src.audio.tts.requests.post') as mock_post:
+        """Test that retries use exponential backoff (jitter pinned to its upper bound)"""
+        with patch('src.audio.tts.requests.post') as mock_post, \
+             patch('src.common.retry.random.uniform', side_effect=lambda low, high: high):
             with patch('src.audio.tts.asyncio.sleep') as mock_sleep:
                 mock_post.side_effect = [
                     Mock(status_code=503),
@@ -152,11 +153,24 @@ class TestQuotaHandling:
             mock_response = Mock()
             mock_response.status_code = 429
             mock_response.headers = {'X-RateLimit-Reset': '1705236000'}
+            mock_response.json.return_value = {"detail": {"status": "quota_exceeded", "message": "Quota exceeded"}}
             mock_post.return_value = mock_response
 
             with pytest.raises(Exception, match="Quota exceeded"):
                 await tts_service.synthesize("Test quota")
 
+    @pytest.mark.asyncio
+    async def test_429_rate_limit_is_retried(self, tts_service):
+        """Test concurrency limits are retried rather than treated as quota"""
+        limited = Mock(status_code=429, headers={'Retry-After': '0'})
+        limited.json.return_value = {"detail": {"status": "too_many_concurrent_requests"}}
+        ok = Mock(status_code=200, headers={}, content=b"audio")
+
+        with patch('src.audio.tts.requests.post', side_effect=[limited, ok]) as mock_post:
+            assert await tts_service.synthesize("Test rate limit") == b"audio"
+
+        assert mock_post.call_count == 2
+
     @pytest.mark.asyncio
     async def test_check_quota_before_request(self, tts_service):
         """Test that quota is checked before making requests"""
@@ -198,3 +212,192 @@ class TestAudioValidation:
             # This will fail until save_audio is properly implemented
             # For now, just verify the method exists
             assert hasattr(tts_service, 'save_audio')
+
+
+class TestChunkedSynthesis:
+    """Test chunked synthesis of long scripts"""
+
+    @pytest.fixture
+    def tts_service(self):
+        service = TTSService()
+        service.max_concurrency = 3
+        return service
+
+    @pytest.fixture
+    def long_script(self):
+        return "\n\n".join(
+            " ".join(f"Абзац {p}, предложение {i} о новостях ИИ." for i in range(30))
+            for p in range(10)
+        )
+
+    @pytest.mark.asyncio
+    async def test_synthesize_script_accepts_long_text(self, tts_service, long_script):
+        """Test that scripts over MAX_TEXT_LENGTH are chunked, not rejected"""
+        assert len(long_script) > TTSService.MAX_TEXT_LENGTH
+
+        with patch.object(tts_service, '_make_api_call', new=AsyncMock(side_effect=lambda text, **kw: text[:5].encode())) as mock_call:
+            result = await tts_service.synthesize_script(long_script)
+
+        chunks = tts_service.plan_chunks(long_script)
+        assert mock_call.call_count == len(chunks)
+        assert all(len(chunk) <= TTSService.MAX_TEXT_LENGTH for chunk in chunks)
+        assert result == b"".join(chunk[:5].encode() for chunk in chunks)
+
+    @pytest.mark.asyncio
+    async def test_synthesize_script_passes_neighbour_context(self, tts_service, long_script):
+        """Test previous/next text is sent for prosody"""
+        with patch.object(tts_service, '_make_api_call', new=AsyncMock(return_value=b'a')) as mock_call:
+            await tts_service.synthesize_script(long_script)
+
+        calls = sorted(mock_call.call_args_list, key=lambda c: long_script.index(c.args[0]))
+        assert calls[0].kwargs["previous_text"] is None
+        assert calls[0].kwargs["next_text"]
+        assert calls[-1].kwargs["next_text"] is None
+        assert calls[1].kwargs["previous_text"] == calls[0].args[0][-TTSService.CONTEXT_LENGTH:]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, tts_service, long_script):
+        """Test that no more than max_concurrency calls run at once"""
+        import asyncio
+        active = 0
+        peak = 0
+
+        async def slow_call(text, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return b'a'
+
+        with patch.object(tts_service, '_make_api_call', new=slow_call):
+            await tts_service.synthesize_script(long_script * 3)
+
+        assert peak == tts_service.max_concurrency
+
+    def test_plan_chunks_scales_with_concurrency(self, tts_service):
+        """Test that a script under the limit is split across workers"""
+        script = " ".join(f"Предложение {i} о новостях." for i in range(120))
+
+        tts_service.max_concurrency = 1
+        single = tts_service.plan_chunks(script)
+        tts_service.max_concurrency = 3
+        parallel = tts_service.plan_chunks(script)
+
+        assert len(single) == 1
+        assert len(parallel) >= 3
+
+    @pytest.mark.asyncio
+    async def test_context_is_sent_to_api(self, tts_service):
+        """Test payload contains previous_text and next_text"""
+        with patch('src.audio.tts.requests.post') as mock_post:
+            mock_post.return_value = Mock(status_code=200, content=b'audio')
+
+            await tts_service._make_api_call("Текст", previous_text="До", next_text="После")
+
+            payload = mock_post.call_args.kwargs["json"]
+            assert payload["previous_text"] == "До"
+            assert payload["next_text"] == "После"
+
+
+class TestStreamingSynthesis:
+    """Test streaming synthesis into storage"""
+
+    @pytest.fixture
+    def tts_service(self):
+        return TTSService()
+
+    @pytest.mark.asyncio
+    async def test_stream_to_storage_writes_audio_in_order(self, tts_service, tmp_path):
+        """Test streamed chunks land in storage with measured size and duration"""
+        from src.storage.s3_client import LocalStorage
+        storage = LocalStorage(base_path=str(tmp_path))
+        tts_service.STREAM_BLOCK_SIZE = 4
+
+        async def fake_stream(text, previous_text=None, next_text=None):
+            for i in range(3):
+                yield f"{text[:3]}{i}".encode()
+
+        script = "Первый абзац.\n\n" + "Второй абзац. " * 400
+        with patch.object(tts_service, '_stream_api_call', new=fake_stream):
+            upload = await tts_service.stream_to_storage(script, "audio/ep.mp3", storage=storage)
+
+        data = storage.download_bytes("audio/ep.mp3")
+        assert upload.size_bytes == len(data)
+        assert data.startswith("Пер0".encode())
+        assert upload.duration_seconds == pytest.approx(len(data) * 8 / 128000)
+
+    @pytest.mark.asyncio
+    async def test_stream_to_storage_aborts_on_failure(self, tts_service, tmp_path):
+        """Test that a failed stream leaves no partial object"""
+        from src.storage.s3_client import LocalStorage
+        storage = LocalStorage(base_path=str(tmp_path))
+
+        async def failing_stream(text, previous_text=None, next_text=None):
+            yield b"partial"
+            raise Exception("connection reset")
+
+        with patch.object(tts_service, '_stream_api_call', new=failing_stream):
+            with pytest.raises(Exception, match="connection reset"):
+                await tts_service.stream_to_storage("Текст", "audio/ep.mp3", storage=storage)
+
+        assert storage.list_objects("audio") == []
+
+    @pytest.mark.asyncio
+    async def test_stream_audio_calls_api_concurrently_in_order(self, tts_service):
+        """Test uncached chunks are fetched concurrently but written in order"""
+        import asyncio
+        tts_service.max_concurrency = 3
+        active = []
+        peak = []
+
+        async def fake_stream(text, previous_text=None, next_text=None):
+            active.append(text)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            yield text[:3].encode()
+            active.remove(text)
+
+        script = "\n\n".join(f"{name} абзац. " * 100 for name in ("Один", "Два", "Три", "Четыре", "Пять"))
+        with patch.object(tts_service, '_stream_api_call', new=fake_stream):
+            data = b"".join([chunk async for chunk in tts_service.stream_audio(script)])
+
+        chunks = tts_service.plan_chunks(script)
+        assert data == b"".join(chunk[:3].encode() for chunk in chunks)
+        assert max(peak) == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_audio_drops_per_chunk_tags(self, tts_service):
+        """Test streamed chunks are spliced without their ID3 tags"""
+        frame = bytes((0xFF, 0xFB, 0x90, 0x44)) + bytes(413)
+        tag = b"ID3\x03\x00\x00\x00\x00\x00\x04" + bytes(4)
+
+        async def fake_stream(text, previous_text=None, next_text=None):
+            yield tag + frame
+            yield frame
+
+        script = "Первый абзац. " * 400 + "\n\n" + "Второй абзац. " * 400
+        with patch.object(tts_service, '_stream_api_call', new=fake_stream):
+            data = b"".join([chunk async for chunk in tts_service.stream_audio(script)])
+
+        assert b"ID3" not in data
+        assert len(data) % len(frame) == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_api_call_uses_streaming_endpoint(self, tts_service):
+        """Test the ElevenLabs streaming endpoint and output format"""
+        import httpx
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, content=b"\xff\xfb" * 10)
+
+        real_client = httpx.AsyncClient
+        with patch('src.audio.tts.httpx.AsyncClient',
+                   side_effect=lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw)):
+            data = b"".join([chunk async for chunk in tts_service._stream_api_call("Текст")])
+
+        assert data == b"\xff\xfb" * 10
+        assert requests_seen[0].url.path.endswith(f"/{TTSService.RUSSIAN_VOICE_ID}/stream")
+        assert requests_seen[0].url.params["output_format"] == TTSService.OUTPUT_FORMAT
@@ -0,0 +1,59 @@
+"""
+Unit tests for multi-date backfill
+"""
+
+import asyncio
+import pytest
+from datetime import date
+from unittest.mock import Mock
+from src.automation.backfill import Backfill, date_range
+from src.models.episode import Episode
+
+
+class FakePipeline:
+    def __init__(self, fail: set = ()):
+        self.fail = fail
+        self.running = 0
+        self.peak = 0
+
+    async def generate_episode(self, target_date, resume=True):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.01)
+            if target_date in self.fail:
+                raise RuntimeError("No articles found")
+            return Episode(
+                episode_id=f"ep-{target_date.isoformat()}", date=target_date,
+                status="completed", audio_duration_seconds=300
+            )
+        finally:
+            self.running -= 1
+
+
+class TestBackfill:
+    """Test concurrent date ranges and reporting"""
+
+    def test_date_range_newest_first(self):
+        """Test range order and validation"""
+        assert date_range(date(2026, 1, 1), date(2026, 1, 3)) == [
+            date(2026, 1, 3), date(2026, 1, 2), date(2026, 1, 1)
+        ]
+        with pytest.raises(ValueError):
+            date_range(date(2026, 1, 3), date(2026, 1, 1))
+
+    @pytest.mark.asyncio
+    async def test_runs_dates_concurrently_within_limit(self):
+        """Test concurrency is bounded and failures do not stop other dates"""
+        pipeline = FakePipeline(fail={date(2026, 1, 2)})
+        progress = Mock()
+
+        report = await Backfill(date(2026, 1, 1), date(2026, 1, 6), concurrency=2, pipeline=pipeline).run(progress)
+
+        assert pipeline.peak == 2
+        assert len(report.results) == 6
+        assert report.count("completed") == 5
+        assert report.count("failed") == 1
+        assert [c.args[1] for c in progress.call_args_list] == [1, 2, 3, 4, 5, 6]
+        assert "5 completed" in report.summary()
+        assert "25.0 min of audio" in report.summary()
@@ -0,0 +1,164 @@
+"""
+Unit tests for the pipeline DAG executor
+"""
+
+import asyncio
+import pytest
+from src.automation.dag import Channel, Dag, Node, StageTimeoutError, node_metrics
+
+
+class TestDag:
+    """Test scheduling, failures and critical path"""
+
+    def test_rejects_unknown_inputs_and_cycles(self):
+        """Test graph validation"""
+        async def noop(**kwargs):
+            return None
+
+        with pytest.raises(ValueError, match="unknown node"):
+            Dag([Node("a", noop, inputs=("missing",))])
+        with pytest.raises(ValueError, match="Cycle"):
+            Dag([Node("a", noop, inputs=("b",)), Node("b", noop, inputs=("a",))])
+
+    @pytest.mark.asyncio
+    async def test_passes_results_and_runs_independent_nodes_concurrently(self):
+        """Test inputs are passed by name and siblings overlap"""
+        running = []
+
+        async def source():
+            return 2
+
+        async def branch(source):
+            running.append(1)
+            await asyncio.sleep(0.02)
+            assert len(running) == 2
+            return source * 10
+
+        async def join(left, right):
+            return left + right
+
+        run = await Dag([
+            Node("source", source),
+            Node("left", branch, inputs=("source",)),
+            Node("right", branch, inputs=("source",)),
+            Node("join", join, inputs=("left", "right")),
+        ]).run()
+
+        assert run.results["join"] == 40
+        assert run.timings["left"].started < run.timings["right"].finished
+
+    @pytest.mark.asyncio
+    async def test_critical_path_follows_slowest_input(self):
+        """Test the reported path goes through the branch the join waited on"""
+        def sleeper(seconds):
+            async def run(**kwargs):
+                await asyncio.sleep(seconds)
+            return run
+
+        run = await Dag([
+            Node("news", sleeper(0)),
+            Node("fast", sleeper(0), inputs=("news",)),
+            Node("slow", sleeper(0.05), inputs=("news",)),
+            Node("episode", sleeper(0), inputs=("fast", "slow")),
+        ]).run()
+
+        assert run.critical_path() == ["news", "slow", "episode"]
+        assert "slow" in run.describe_critical_path()
+
+    @pytest.mark.asyncio
+    async def test_optional_failure_yields_none(self):
+        """Test an optional node's error does not stop its dependents"""
+        async def broken():
+            raise RuntimeError("S3 down")
+
+        async def after(broken):
+            return broken is None
+
+        run = await Dag([Node("broken", broken, optional=True), Node("after", after, inputs=("broken",))]).run()
+
+        assert run.results["after"] is True
+        assert run.timings["broken"].status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_required_failure_cancels_the_rest(self):
+        """Test the first required failure is raised and siblings are cancelled"""
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def broken():
+            raise RuntimeError("LLM API down")
+
+        with pytest.raises(RuntimeError, match="LLM API down"):
+            await Dag([Node("slow", slow), Node("broken", broken)]).run()
+
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_streaming_node_overlaps_consumers(self):
+        """Test consumers read a streaming node's items while it is still running"""
+        seen_before_finish = []
+
+        async def produce(channel: Channel):
+            for i in range(3):
+                await channel.put(i)
+                await asyncio.sleep(0.01)
+            seen_before_finish.extend(consumed)
+
+        consumed = []
+
+        async def consume(produce):
+            async for item in produce:
+                consumed.append(item)
+            return sum(consumed)
+
+        run = await Dag([
+            Node("produce", produce, streaming=True),
+            Node("consume", consume, inputs=("produce",)),
+        ]).run()
+
+        assert run.results["consume"] == 3
+        assert seen_before_finish == [0, 1, 2]
+        assert run.timings["consume"].started < run.timings["produce"].finished
+
+    @pytest.mark.asyncio
+    async def test_node_timeout_cancels_the_node(self):
+        """Test a node past its timeout is cancelled and raises StageTimeoutError"""
+        cancelled = asyncio.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        before = node_metrics().get("hang_required", {}).get("timed_out", 0)
+        with pytest.raises(StageTimeoutError, match="hang_required"):
+            await Dag([Node("hang_required", hang, timeout=0.02)]).run()
+
+        assert cancelled.is_set()
+        assert node_metrics()["hang_required"]["timed_out"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_optional_node_timeout_passes_none(self):
+        """Test a timed-out optional node lets its consumers run"""
+        async def hang():
+            await asyncio.sleep(10)
+
+        async def after(hang):
+            return hang
+
+        run = await Dag([
+            Node("hang", hang, optional=True, timeout=0.02),
+            Node("after", after, inputs=("hang",)),
+        ]).run()
+
+        assert run.results["after"] is None
+        assert run.timings["hang"].status == "timed_out"
+        assert run.timings["after"].status == "completed"
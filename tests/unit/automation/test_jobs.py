@@ -0,0 +1,181 @@
+"""
+Unit tests for the generation job queue
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+from src.automation.jobs import JobOwnedElsewhereError, JobQueue
+from src.db.jobs import JobRepository
+from src.db.ydb_client import MemoryDB
+from src.models.episode import Episode, GenerationJob
+
+
+def make_queue(run, workers: int = 1) -> JobQueue:
+    return JobQueue(run, repository=JobRepository(db=MemoryDB()), workers=workers)
+
+
+async def generate(target_date: date, resume: bool) -> Episode:
+    await asyncio.sleep(0.01)
+    return Episode(episode_id=f"ep-{target_date.isoformat()}", date=target_date, status="completed")
+
+
+class TestJobQueue:
+    """Test queueing, coalescing, persistence and cancellation"""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_and_record_is_persisted(self):
+        """Test a job goes queued → running → done and is written to the DB"""
+        queue = make_queue(generate)
+
+        start = time.perf_counter()
+        job = queue.submit(date(2026, 1, 14))
+        assert time.perf_counter() - start < 0.005
+        assert job.status == "queued"
+
+        await queue.drain()
+
+        assert job.status == "done"
+        assert job.episode_status == "completed"
+        stored = queue.repository.get(job.job_id)
+        assert stored.status == "done"
+        assert stored.target_date == date(2026, 1, 14)
+
+    @pytest.mark.asyncio
+    async def test_identical_pending_requests_are_coalesced(self):
+        """Test one job per date while it is queued or running"""
+        calls = []
+
+        async def run(target_date, resume):
+            calls.append(target_date)
+            return await generate(target_date, resume)
+
+        queue = make_queue(run)
+        first = queue.submit(date(2026, 1, 14))
+        second = queue.submit(date(2026, 1, 14))
+        other = queue.submit(date(2026, 1, 13))
+
+        assert second is first
+        assert other is not first
+
+        await queue.drain()
+
+        assert calls == [date(2026, 1, 14), date(2026, 1, 13)]
+        assert queue.submit(date(2026, 1, 14)) is not first
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded(self):
+        """Test a pipeline error marks the job failed"""
+        async def run(target_date, resume):
+            raise RuntimeError("No articles found")
+
+        queue = make_queue(run)
+        job = queue.submit(date(2026, 1, 14))
+        await queue.drain()
+
+        assert job.status == "failed"
+        assert queue.repository.get(job.job_id).error_message == "No articles found"
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_and_running_jobs(self):
+        """Test cancellation before and during the run"""
+        started = asyncio.Event()
+
+        async def run(target_date, resume):
+            started.set()
+            await asyncio.sleep(10)
+
+        queue = make_queue(run)
+        running = queue.submit(date(2026, 1, 14))
+        queued = queue.submit(date(2026, 1, 13))
+        await started.wait()
+
+        queue.cancel(queued.job_id)
+        queue.cancel(running.job_id)
+        await queue.drain()
+
+        assert running.status == "cancelled"
+        assert queued.status == "cancelled"
+        assert queued.started_at is None
+
+    @pytest.mark.asyncio
+    async def test_cancel_job_of_another_replica(self):
+        """Test a live replica's job is not cancelled behind its back, a dead one's is"""
+        queue = make_queue(generate)
+        stale = datetime.now(timezone.utc) - timedelta(minutes=5)
+        queue.repository.save(GenerationJob(job_id="live", target_date=date(2026, 1, 14), owner="other",
+                                            heartbeat_at=datetime.now(timezone.utc)))
+        queue.repository.save(GenerationJob(job_id="orphan", target_date=date(2026, 1, 13), owner="gone",
+                                            heartbeat_at=stale))
+
+        with pytest.raises(JobOwnedElsewhereError):
+            queue.cancel("live")
+        assert queue.cancel("orphan").status == "cancelled"
+        assert queue.cancel("missing") is None
+        await queue.drain()
+        assert queue.repository.get("orphan").status == "cancelled"
+        assert queue.repository.get("live").status == "queued"
+
+    @pytest.mark.asyncio
+    async def test_only_jobs_with_expired_heartbeat_are_failed(self):
+        """Test jobs of a crashed replica are failed, those of a live one are left alone"""
+        queue = make_queue(generate)
+        stale = datetime.now(timezone.utc) - timedelta(minutes=5)
+        queue.repository.save(GenerationJob(job_id="crashed", target_date=date(2026, 1, 14), status="running",
+                                            owner="gone", heartbeat_at=stale))
+        queue.repository.save(GenerationJob(job_id="running", target_date=date(2026, 1, 13), status="running",
+                                            owner="other", heartbeat_at=datetime.now(timezone.utc)))
+
+        queue.submit(date(2026, 1, 15))
+        await asyncio.sleep(0.05)
+        await queue.drain()
+
+        crashed = queue.repository.get("crashed")
+        assert (crashed.status, crashed.error_message) == ("failed", "Abandoned")
+        assert queue.repository.get("running").status == "running"
+
+    @pytest.mark.asyncio
+    async def test_own_jobs_are_stamped_and_heartbeat(self):
+        """Test submitted jobs carry the owner id and a refreshed heartbeat"""
+        release = asyncio.Event()
+
+        async def run(target_date, resume):
+            await release.wait()
+            return Episode(episode_id="ep", date=target_date, status="completed")
+
+        queue = JobQueue(run, repository=JobRepository(db=MemoryDB()), heartbeat_seconds=0.01)
+        job = queue.submit(date(2026, 1, 14))
+        first = job.heartbeat_at
+        await asyncio.sleep(0.05)
+
+        stored = queue.repository.get(job.job_id)
+        assert stored.owner == queue.owner
+        assert stored.heartbeat_at > first
+        release.set()
+        await queue.drain()
+        assert job.started_at.tzinfo is not None and job.finished_at.tzinfo is not None
+
+    @pytest.mark.asyncio
+    async def test_routes(self):
+        """Test enqueue, status and cancel endpoints"""
+        from src.main import app
+
+        queue = make_queue(generate)
+        transport = httpx.ASGITransport(app=app)
+        with patch('src.automation.routes.get_job_queue', return_value=queue):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/automation/generate", json={"target_date": "2026-01-14"})
+                assert response.status_code == 200
+                job_id = response.json()["job_id"]
+                assert response.json()["status"] == "queued"
+
+                await queue.drain()
+
+                response = await client.get(f"/api/automation/jobs/{job_id}")
+                assert response.json()["status"] == "done"
+                assert (await client.post(f"/api/automation/jobs/{job_id}/cancel")).status_code == 409
+                assert (await client.get("/api/automation/jobs/missing")).status_code == 404
+                assert (await client.post("/api/automation/jobs/missing/cancel")).status_code == 404
@@ -3,19 +3,32 @@ Unit tests for Episode Pipeline
 RED phase: Writing tests first
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import date
 from src.automation.pipeline import EpisodePipeline, PipelineError
+from src.db.generation_logs import GenerationLogRepository
+from src.db.pipeline_states import PipelineStateRepository
+from src.db.ydb_client import MemoryDB
+from src.storage.s3_client import LocalStorage
 from src.models.episode import Article, Episode
+from src.audio.tts import AudioUpload
 
 
 class TestEpisodePipeline:
     """Test episode generation pipeline"""
 
     @pytest.fixture
-    def pipeline(self):
-        return EpisodePipeline()
+    def pipeline(self, tmp_path):
+        pipeline = EpisodePipeline()
+        pipeline.storage = LocalStorage(str(tmp_path))
+        # Keep unit tests offline: TTS is exercised explicitly where needed
+        pipeline.tts_service.stream_to_storage = AsyncMock(side_effect=Exception("TTS offline"))
+        # Fresh checkpoints per test, so runs for the same date do not resume each other
+        pipeline.states = PipelineStateRepository(db=MemoryDB())
+        pipeline.logs = GenerationLogRepository(db=MemoryDB())
+        return pipeline
 
     @pytest.fixture
     def sample_articles(self):
@@ -59,7 +72,8 @@ class TestEpisodePipeline:
     async def test_generate_episode_uses_today_if_no_date(self, pipeline, sample_articles):
         """Test that today's date is used by default"""
         with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
-             patch.object(pipeline.script_generator, 'generate') as mock_script:
+             patch.object(pipeline.script_generator, 'generate') as mock_script, \
+             patch('src.automation.pipeline.hls.publish', new=AsyncMock(return_value="https://s3/master.m3u8")):
 
             mock_news.return_value = sample_articles
             mock_script.return_value = "Доброе утро! Script."
@@ -172,3 +186,215 @@ class TestEpisodePipeline:
             episode = await pipeline.generate_episode()
 
             assert episode.article_count == 5
+
+    @pytest.mark.asyncio
+    async def test_generate_episode_with_audio(self, pipeline, sample_articles):
+        """Test that streamed audio marks the episode completed with size and duration"""
+        pipeline.tts_service.stream_to_storage = AsyncMock(
+            return_value=AudioUpload(url="https://s3/ep.mp3", size_bytes=4_800_000, duration_seconds=300.2)
+        )
+
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate') as mock_script, \
+             patch('src.automation.pipeline.hls.publish', new=AsyncMock(return_value="https://s3/master.m3u8")):
+
+            mock_news.return_value = sample_articles
+            mock_script.return_value = "Доброе утро! Script."
+
+            episode = await pipeline.generate_episode(date(2026, 1, 14))
+
+            assert episode.status == "completed"
+            assert episode.audio_url == "https://s3/ep.mp3"
+            assert episode.audio_file_size_bytes == 4_800_000
+            assert episode.audio_duration_seconds == 300
+            assert episode.hls_url == "https://s3/master.m3u8"
+            object_names = sorted(call.args[1] for call in pipeline.tts_service.stream_to_storage.await_args_list)
+            assert object_names == ["audio/ep-2026-01-14-mobile.mp3", "audio/ep-2026-01-14.mp3"]
+            assert [r.name for r in episode.audio_renditions] == ["standard", "mobile"]
+            assert pipeline.episodes.get("ep-2026-01-14").audio_renditions == episode.audio_renditions
+
+    @pytest.mark.asyncio
+    async def test_resume_after_tts_failure_reuses_news_and_script(self, pipeline, sample_articles):
+        """Test a rerun skips completed stages and only retries audio"""
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate') as mock_script, \
+             patch('src.automation.pipeline.hls.publish', new=AsyncMock(return_value="https://s3/master.m3u8")):
+
+            mock_news.return_value = sample_articles
+            mock_script.return_value = "Доброе утро! Script."
+
+            first = await pipeline.generate_episode(date(2026, 1, 14))
+            assert first.status == "script_only"
+
+            states = pipeline.states.load("ep-2026-01-14")
+            assert states["script"].status == "completed"
+            assert states["script"].inputs["article_ids"] == ["1", "2"]
+            assert states["script"].duration_ms is not None
+            assert states["audio"].status == "failed"
+            assert states["audio"].retry_count == 1
+
+            pipeline.tts_service.stream_to_storage = AsyncMock(
+                return_value=AudioUpload(url="https://s3/ep.mp3", size_bytes=1000, duration_seconds=60.0)
+            )
+            second = await pipeline.generate_episode(date(2026, 1, 14))
+
+            assert mock_news.call_count == 1
+            assert mock_script.call_count == 1
+            assert second.status == "completed"
+            assert second.article_count == 2
+            assert second.script_text == "Доброе утро! Script."
+            assert pipeline.states.load("ep-2026-01-14")["audio"].retry_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_stage_is_checkpointed(self, pipeline, sample_articles):
+        """Test a failing stage records its error and is retried on the next run"""
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate') as mock_script:
+
+            mock_news.return_value = sample_articles
+            mock_script.side_effect = [Exception("LLM API down"), "Script"]
+
+            with pytest.raises(PipelineError):
+                await pipeline.generate_episode(date(2026, 1, 14))
+
+            state = pipeline.states.load("ep-2026-01-14")["script"]
+            assert state.status == "failed"
+            assert state.error_message == "LLM API down"
+
+            episode = await pipeline.generate_episode(date(2026, 1, 14))
+
+            assert episode.script_text == "Script"
+            assert mock_news.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_resume_false_starts_from_scratch(self, pipeline, sample_articles):
+        """Test checkpoints are discarded on request"""
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate') as mock_script:
+
+            mock_news.return_value = sample_articles
+            mock_script.return_value = "Script"
+
+            await pipeline.generate_episode(date(2026, 1, 14))
+            await pipeline.generate_episode(date(2026, 1, 14), resume=False)
+
+            assert mock_news.call_count == 2
+            assert mock_script.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_publishes_transcript_and_feed(self, pipeline, sample_articles):
+        """Test the transcript and RSS nodes run and their failure is not fatal"""
+        pipeline.tts_service.stream_to_storage = AsyncMock(
+            return_value=AudioUpload(url="https://s3/ep.mp3", size_bytes=1000, duration_seconds=60.0)
+        )
+
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate') as mock_script, \
+             patch('src.automation.pipeline.hls.publish', new=AsyncMock(return_value=None)):
+
+            mock_news.return_value = sample_articles
+            mock_script.return_value = "Доброе утро! Script."
+
+            await pipeline.generate_episode(date(2026, 1, 14))
+
+            assert pipeline.storage.download_bytes("transcripts/ep-2026-01-14.txt").decode() == "Доброе утро! Script."
+            assert b"https://s3/ep.mp3" in pipeline.storage.download_bytes("rss.xml")
+
+            with patch('src.automation.pipeline.rss.publish_feed', new=AsyncMock(side_effect=Exception("S3 down"))):
+                episode = await pipeline.generate_episode(date(2026, 1, 14))
+
+            assert episode.status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_for_same_date_share_one_generation(self, pipeline, sample_articles):
+        """Test a second trigger attaches to the running pipeline instead of duplicating it"""
+        pipeline.single_flight.poll_seconds = 0.01
+
+        async def slow_script(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return "Script"
+
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate', side_effect=slow_script) as mock_script:
+
+            mock_news.return_value = sample_articles
+
+            first, second = await asyncio.gather(
+                pipeline.generate_episode(date(2026, 1, 14)),
+                pipeline.generate_episode(date(2026, 1, 14))
+            )
+
+            assert mock_script.call_count == 1
+            assert first.episode_id == second.episode_id == "ep-2026-01-14"
+
+    @pytest.mark.asyncio
+    async def test_hung_audio_stage_times_out_to_script_only(self, pipeline, sample_articles):
+        """Test a stalled TTS stream is cancelled at its deadline and the script is kept"""
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        pipeline.tts_service.stream_to_storage = AsyncMock(side_effect=hang)
+
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate') as mock_script, \
+             patch.dict('src.automation.pipeline.STAGE_DEADLINES', {"audio": 0.05}):
+
+            mock_news.return_value = sample_articles
+            mock_script.return_value = "Script"
+
+            episode = await pipeline.generate_episode(date(2026, 1, 14))
+
+            assert episode.status == "script_only"
+            assert episode.script_text == "Script"
+            assert pipeline.states.load("ep-2026-01-14")["audio"].status == "timed_out"
+
+    @pytest.mark.asyncio
+    async def test_run_past_pipeline_deadline_fails(self, pipeline, sample_articles):
+        """Test the whole run is terminated at the pipeline deadline"""
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        with patch.object(pipeline.news_service, 'collect_latest', side_effect=hang), \
+             patch('src.automation.pipeline.get_settings') as mock_settings:
+
+            mock_settings.return_value.pipeline_deadline_seconds = 0.05
+            mock_settings.return_value.pipeline_warning_seconds = 0.01
+
+            with pytest.raises(PipelineError):
+                await pipeline.generate_episode(date(2026, 1, 14))
+
+    @pytest.mark.asyncio
+    async def test_stage_and_call_timings_are_logged(self, pipeline, sample_articles):
+        """Test each run writes its stage spans and nested call spans to generation_logs"""
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate') as mock_script:
+
+            mock_news.return_value = sample_articles
+            mock_script.return_value = "Доброе утро! Script."
+
+            await pipeline.generate_episode(date(2026, 1, 14))
+
+        logs = pipeline.logs.db.select("generation_logs", limit=1000)
+        stages = {log["name"]: log for log in logs if log["kind"] == "stage"}
+        assert {"news", "script", "transcript", "audio", "episode"} <= set(stages)
+        assert stages["script"]["status"] == "completed"
+        assert stages["audio"]["status"] == "completed"  # optional stage degraded inside
+        upload = next(log for log in logs if log["name"] == "storage.upload" and log["stage"] == "transcript")
+        assert upload["bytes"] == len("Доброе утро! Script.".encode())
+        assert len({log["run_id"] for log in logs}) == 1
+        assert "script" in pipeline.logs.stage_percentiles()
+
+    @pytest.mark.asyncio
+    async def test_profiled_run_uploads_collapsed_stacks(self, pipeline, sample_articles, tmp_path):
+        """Test profile=True stores the run's profile under profiles/"""
+        with patch.object(pipeline.news_service, 'collect_latest') as mock_news, \
+             patch.object(pipeline.script_generator, 'generate') as mock_script:
+
+            mock_news.return_value = sample_articles
+            mock_script.return_value = "Script"
+
+            await pipeline.generate_episode(date(2026, 1, 14), profile=True)
+
+        profiles = list((tmp_path / "profiles").iterdir())
+        assert len(profiles) == 1
+        assert profiles[0].name.startswith("ep-2026-01-14-")
@@ -0,0 +1,109 @@
+"""
+Unit tests for lease-based single-flight execution
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.automation.singleflight import LeaseLostError, SingleFlight
+from src.db.leases import LeaseRepository
+from src.db.ydb_client import MemoryDB
+
+
+class TestSingleFlight:
+    """Test one run per key across workers"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_run(self):
+        """Test the second caller waits and attaches to the first one's result"""
+        leases = LeaseRepository(db=MemoryDB())
+        results = {}
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            results["ep"] = "episode"
+            return "episode"
+
+        async def attach():
+            return results.get("ep")
+
+        workers = [SingleFlight(leases, ttl_seconds=5, poll_seconds=0.01) for _ in range(2)]
+        outcomes = await asyncio.gather(*(w.run("ep", work, attach) for w in workers))
+
+        assert outcomes == ["episode", "episode"]
+        assert len(runs) == 1
+        assert leases.holder("ep") is None
+
+    @pytest.mark.asyncio
+    async def test_waiter_takes_over_after_holder_failure(self):
+        """Test a failed holder leaves no result, so the waiter runs the work itself"""
+        leases = LeaseRepository(db=MemoryDB())
+        calls = []
+
+        async def failing():
+            calls.append("failing")
+            await asyncio.sleep(0.02)
+            raise RuntimeError("LLM API down")
+
+        async def working():
+            calls.append("working")
+            return "episode"
+
+        async def attach():
+            return None
+
+        flight = SingleFlight(leases, ttl_seconds=5, poll_seconds=0.01)
+        first = asyncio.create_task(flight.run("ep", failing, attach))
+        await asyncio.sleep(0.005)
+        second = asyncio.create_task(flight.run("ep", working, attach))
+
+        with pytest.raises(RuntimeError):
+            await first
+        assert await second == "episode"
+        assert calls == ["failing", "working"]
+
+    @pytest.mark.asyncio
+    async def test_abandoned_lease_is_taken_over(self):
+        """Test a lease left by a crashed worker expires and is acquired"""
+        leases = LeaseRepository(db=MemoryDB())
+        leases.acquire("ep", "crashed-worker", 0.05)
+
+        async def work():
+            return "episode"
+
+        flight = SingleFlight(leases, ttl_seconds=5, poll_seconds=0.01)
+        assert await asyncio.wait_for(flight.run("ep", work, lambda: asyncio.sleep(0)), timeout=1) == "episode"
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_stops_the_work(self):
+        """Test the heartbeat cancels work whose lease was taken over"""
+        leases = LeaseRepository(db=MemoryDB())
+
+        async def work():
+            # Simulate a stall long enough for another worker to take over
+            for lease_row in leases.db.tables["leases"]:
+                lease_row["expires_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+            leases.acquire("ep", "other-worker", 60)
+            await asyncio.sleep(10)
+
+        flight = SingleFlight(leases, ttl_seconds=0.06, poll_seconds=0.01)
+
+        with pytest.raises(LeaseLostError):
+            await asyncio.wait_for(flight.run("ep", work, lambda: asyncio.sleep(0)), timeout=1)
+
+        assert leases.holder("ep").owner == "other-worker"
+
+    @pytest.mark.asyncio
+    async def test_runs_without_lease_when_leases_unavailable(self):
+        """Test a failing lease table does not stop the work"""
+        class BrokenLeases(LeaseRepository):
+            def acquire(self, name, owner, ttl_seconds):
+                raise RuntimeError("Table leases not found")
+
+        async def work():
+            return "episode"
+
+        flight = SingleFlight(BrokenLeases(db=MemoryDB()), ttl_seconds=5, poll_seconds=0.01)
+        assert await flight.run("ep", work, lambda: asyncio.sleep(0)) == "episode"
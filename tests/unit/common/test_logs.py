@@ -0,0 +1,112 @@
+"""
+Unit tests for structured logging
+"""
+
+import json
+import logging
+import queue
+import pytest
+from datetime import datetime, timezone
+from src.common.logs import (
+    DailyFileHandler, JsonFormatter, NonBlockingQueueHandler, RepeatFilter, configure_logging, shutdown_logging
+)
+from src.common.tracing import trace_scope
+
+
+def make_record(msg="Stage %s done", args=("news",), created=None, lineno=10, **extra):
+    record = logging.makeLogRecord({
+        "name": "src.automation.pipeline", "levelno": logging.INFO, "levelname": "INFO",
+        "msg": msg, "args": args, "pathname": "pipeline.py", "lineno": lineno, **extra
+    })
+    if created is not None:
+        record.created = created
+    return record
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJsonFormatter:
+    """Test the JSON line layout"""
+
+    def test_fields_extras_and_exception(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            import sys
+            record = make_record(exc_info=sys.exc_info(), episode_id="ep-1")
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "src.automation.pipeline"
+        assert entry["msg"] == "Stage news done"
+        assert entry["episode_id"] == "ep-1"
+        assert "ValueError: boom" in entry["exc"]
+        assert entry["ts"].endswith("+00:00")
+
+
+class TestRepeatFilter:
+    """Test rate limiting of repeated messages"""
+
+    def test_burst_then_suppressed_count_is_reported(self):
+        clock = Clock()
+        repeat = RepeatFilter(burst=2, period=60, clock=clock)
+
+        allowed = [repeat.filter(make_record()) for _ in range(5)]
+        assert allowed == [True, True, False, False, False]
+        assert repeat.filter(make_record(lineno=11)) is True  # another call site
+
+        clock.now = 61
+        record = make_record()
+        assert repeat.filter(record) is True
+        assert record.suppressed == 3
+
+
+class TestHandlers:
+    """Test daily files and the non-blocking queue"""
+
+    def test_daily_files_switch_and_expire(self, tmp_path):
+        (tmp_path / "pipeline-2025-12-01.log").write_text("old\n")
+        handler = DailyFileHandler(str(tmp_path), keep_days=14)
+        handler.setFormatter(JsonFormatter())
+
+        for day in (14, 15):
+            handler.emit(make_record(created=datetime(2026, 1, day, 12, tzinfo=timezone.utc).timestamp()))
+        handler.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["pipeline-2026-01-14.log", "pipeline-2026-01-15.log"]
+        assert json.loads((tmp_path / "pipeline-2026-01-15.log").read_text())["msg"] == "Stage news done"
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = NonBlockingQueueHandler(queue.Queue(1))
+        before = NonBlockingQueueHandler.dropped
+
+        handler.handle(make_record())
+        handler.handle(make_record(lineno=11))
+
+        assert NonBlockingQueueHandler.dropped == before + 1
+        assert handler.queue.get_nowait().msg == "Stage news done"
+
+    @pytest.mark.asyncio
+    async def test_configured_logging_writes_correlated_json(self, tmp_path):
+        """Test records logged inside a pipeline trace carry its IDs to the daily file"""
+        root = logging.getLogger()
+        level = root.level
+        configure_logging("INFO", str(tmp_path))
+        try:
+            async with trace_scope("ep-2026-01-14", sink=lambda logs: None) as trace:
+                logging.getLogger("src.automation.pipeline").info("Stage 1: Collecting news...")
+        finally:
+            shutdown_logging()
+            root.setLevel(level)
+
+        lines = [json.loads(line) for path in tmp_path.iterdir() for line in path.read_text().splitlines()]
+        entry = next(e for e in lines if e["msg"] == "Stage 1: Collecting news...")
+        assert entry["run_id"] == trace.run_id
+        assert entry["episode_id"] == "ep-2026-01-14"
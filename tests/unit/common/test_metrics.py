@@ -0,0 +1,105 @@
+"""
+Unit tests for the metrics registry
+"""
+
+import threading
+import httpx
+import pytest
+from fastapi import FastAPI
+from src.common.metrics import MetricsMiddleware, Registry
+
+
+class TestRegistry:
+    """Test metric types and the text format"""
+
+    def test_counter_and_gauge_render(self):
+        """Test labelled counters and gauges in Prometheus text format"""
+        registry = Registry()
+        calls = registry.counter("llm_calls_total", "LLM calls", ("provider",))
+        calls.labels("yagpt").inc()
+        calls.labels("yagpt").inc(2)
+        queued = registry.gauge("jobs_queued", "Queued jobs")
+        queued.set(3)
+        queued.dec()
+
+        text = registry.render()
+
+        assert "# TYPE llm_calls_total counter" in text
+        assert 'llm_calls_total{provider="yagpt"} 3' in text
+        assert "jobs_queued 2" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket boundaries are inclusive and +Inf equals the count"""
+        registry = Registry()
+        latency = registry.histogram("db_seconds", "DB latency", buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            latency.observe(value)
+
+        text = registry.render()
+
+        assert 'db_seconds_bucket{le="0.1"} 2' in text
+        assert 'db_seconds_bucket{le="1"} 3' in text
+        assert 'db_seconds_bucket{le="+Inf"} 4' in text
+        assert "db_seconds_sum 3.65" in text
+        assert "db_seconds_count 4" in text
+
+    def test_increments_from_many_threads_are_not_lost(self):
+        """Test per-thread cells add up without a lock"""
+        registry = Registry()
+        hits = registry.counter("hits_total", "Hits")
+
+        def work():
+            for _ in range(10000):
+                hits.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert hits.labels().value == 80000
+
+    def test_conflicting_registration_and_labels_are_rejected(self):
+        """Test a name keeps one type and label set"""
+        registry = Registry()
+        registry.counter("x_total", "X", ("a",))
+
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "X", ("a",))
+        with pytest.raises(ValueError):
+            registry.counter("x_total", "X", ("a",)).labels("1", "2")
+
+    def test_collectors_are_sampled_at_scrape(self):
+        """Test values kept elsewhere are exported and a broken collector is skipped"""
+        registry = Registry()
+        registry.register_collector(lambda: [("retries_total", "counter", "Retries", [({"policy": "tts"}, 4)])])
+        registry.register_collector(lambda: 1 / 0)
+
+        assert 'retries_total{policy="tts"} 4' in registry.render()
+
+
+class TestMetricsMiddleware:
+    """Test per-route request metrics"""
+
+    @pytest.mark.asyncio
+    async def test_records_route_template_method_and_status(self):
+        """Test path parameters collapse into the route template"""
+        registry = Registry()
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, registry=registry)
+
+        @app.get("/episodes/{episode_id}")
+        async def episode(episode_id: str):
+            return {"id": episode_id}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/episodes/ep-1")
+            await client.get("/episodes/ep-2")
+            await client.get("/wp-admin")
+
+        text = registry.render()
+        assert 'http_request_duration_seconds_count{route="/episodes/{episode_id}",method="GET",status="200"} 2' in text
+        assert 'http_request_duration_seconds_count{route="unmatched",method="GET",status="404"} 1' in text
+        assert "http_requests_in_flight 0" in text
@@ -0,0 +1,87 @@
+"""
+Unit tests for the sampling profiler and tracemalloc snapshots
+"""
+
+import asyncio
+import time
+import pytest
+from src.common import profiler
+from src.common.profiler import ProfilerBusyError, SamplingProfiler
+from src.storage.s3_client import LocalStorage
+
+
+def busy_loop(seconds: float):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(100))
+
+
+class TestSamplingProfiler:
+    """Test stack sampling and the collapsed output"""
+
+    def test_samples_running_code_as_collapsed_stacks(self):
+        """Test the busy function dominates the samples, rooted at its thread"""
+        sampler = SamplingProfiler(interval=0.005)
+        sampler.start()
+        busy_loop(0.2)
+        sampler.stop()
+
+        lines = sampler.collapsed().splitlines()
+        assert sampler.sample_count > 5
+        stack, count = lines[0].rsplit(" ", 1)
+        assert stack.startswith("MainThread;")
+        assert "busy_loop (" in stack
+        assert int(count) >= 1
+
+    def test_one_profile_at_a_time(self):
+        """Test a second profiler is refused while one runs"""
+        first = SamplingProfiler()
+        first.start()
+        try:
+            with pytest.raises(ProfilerBusyError):
+                SamplingProfiler().start()
+        finally:
+            first.stop()
+        SamplingProfiler().start()
+        profiler._active.stop()
+
+    @pytest.mark.asyncio
+    async def test_profile_window_uploads_to_storage(self, tmp_path):
+        """Test a window profile lands under profiles/"""
+        storage = LocalStorage(str(tmp_path))
+
+        result = await profiler.profile_window(0.05, storage, label="test", interval=0.005)
+
+        uploaded = list((tmp_path / "profiles").iterdir())
+        assert len(uploaded) == 1 and uploaded[0].name.startswith("test-")
+        assert result["samples"] > 0
+
+    def test_run_profile_request_is_consumed_once(self):
+        profiler.request_run_profile()
+
+        assert profiler.take_run_profile_request() is True
+        assert profiler.take_run_profile_request() is False
+
+
+class TestTracemalloc:
+    """Test snapshots and diffs by file and line"""
+
+    def test_diff_shows_the_growing_allocator(self):
+        """Test memory retained between snapshots is attributed to its line"""
+        try:
+            older = profiler.take_snapshot()
+            retained = [bytearray(1024) for _ in range(2000)]
+            newer = profiler.take_snapshot()
+
+            diff = profiler.diff_snapshots(older, newer, limit=5)
+
+            assert "test_profiler.py" in diff[0]["location"]
+            assert diff[0]["size_diff_bytes"] >= 2000 * 1024
+            assert profiler.top_allocations(newer, limit=3)
+            assert retained
+        finally:
+            profiler.stop_tracing()
+
+        assert profiler.list_snapshots() == []
+        with pytest.raises(KeyError):
+            profiler.top_allocations(older)
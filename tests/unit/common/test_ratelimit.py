@@ -0,0 +1,64 @@
+"""
+Unit tests for provider rate limits
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.common.ratelimit import RateLimiter
+from src.common.retry import DeadlineExceededError, deadline_scope
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter:
+    """Test the token bucket"""
+
+    def test_burst_then_paced(self):
+        """Test a full minute's worth is available at once, then callers queue up"""
+        limiter = RateLimiter("test", rate_per_minute=60, clock=Clock())
+
+        delays = [limiter.reserve() for _ in range(62)]
+
+        assert delays[:60] == [0.0] * 60
+        assert delays[60] == pytest.approx(1.0)
+        assert delays[61] == pytest.approx(2.0)
+
+    def test_refills_over_time(self):
+        """Test tokens come back at the configured rate"""
+        clock = Clock()
+        limiter = RateLimiter("test", rate_per_minute=600, clock=clock)
+        limiter.reserve(600)
+
+        clock.now = 3.0
+        assert limiter.reserve(30) == 0.0
+        assert limiter.reserve(10) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_acquire_sleeps_off_debt(self):
+        """Test acquire waits for the reserved tokens"""
+        limiter = RateLimiter("test", rate_per_minute=60, clock=Clock())
+        limiter.reserve(60)
+
+        with patch('src.common.ratelimit.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            await limiter.acquire(5)
+
+        assert mock_sleep.call_args.args[0] == pytest.approx(5.0)
+        assert limiter.waited_seconds == pytest.approx(5.0)
+
+    @pytest.mark.asyncio
+    async def test_wait_beyond_deadline_fails_fast(self):
+        """Test a wait that cannot finish in time is refused and refunded"""
+        limiter = RateLimiter("test", rate_per_minute=60, clock=Clock())
+        limiter.reserve(60)
+
+        with deadline_scope(1.0):
+            with pytest.raises(DeadlineExceededError):
+                await limiter.acquire(30)
+
+        assert limiter.reserve(1) == pytest.approx(1.0)
@@ -0,0 +1,140 @@
+"""
+Unit tests for the shared retry policy
+"""
+
+import asyncio
+import httpx
+import pytest
+import requests
+from unittest.mock import AsyncMock, patch
+from src.common.retry import (
+    DeadlineExceededError, RetryableError, RetryExhaustedError, RetryPolicy,
+    classify, deadline_scope, parse_retry_after, remaining_timeout, retry_metrics
+)
+
+
+def http_error(status: int, headers: dict = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.com")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+
+class TestClassification:
+    """Test typed retryable-error classification"""
+
+    def test_transient_errors_are_retryable(self):
+        """Test timeouts, connection errors and 5xx"""
+        assert classify(httpx.ConnectTimeout("slow"))[0]
+        assert classify(requests.exceptions.ConnectionError("reset"))[0]
+        assert classify(asyncio.TimeoutError())[0]
+        assert classify(http_error(503))[0]
+        assert classify(RetryableError("busy", retry_after=3)) == (True, 3)
+
+    def test_permanent_errors_are_not(self):
+        """Test client errors and unknown exceptions fail fast"""
+        assert not classify(http_error(404))[0]
+        assert not classify(ValueError("bad input"))[0]
+        assert not classify(Exception("503 in the text is not enough"))[0]
+
+    def test_retry_after_header(self):
+        """Test Retry-After as seconds and as HTTP date"""
+        assert classify(http_error(429, {"Retry-After": "7"})) == (True, 7.0)
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after(None) is None
+
+
+class TestRetryPolicy:
+    """Test backoff, limits and deadlines"""
+
+    @pytest.mark.asyncio
+    async def test_retries_then_succeeds(self):
+        """Test transient failures are retried with full-jitter delays"""
+        func = AsyncMock(side_effect=[http_error(503), http_error(502), "ok"])
+        policy = RetryPolicy("test-success", max_attempts=3, base_delay=1.0, max_delay=10.0)
+
+        with patch('src.common.retry.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            assert await policy.call(func) == "ok"
+
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert len(delays) == 2
+        assert 0 <= delays[0] <= 1.0
+        assert 0 <= delays[1] <= 2.0
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_raised_immediately(self):
+        """Test permanent errors are not retried"""
+        func = AsyncMock(side_effect=ValueError("bad"))
+
+        with pytest.raises(ValueError):
+            await RetryPolicy("test-permanent").call(func)
+
+        assert func.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_attempts(self):
+        """Test the attempt limit"""
+        func = AsyncMock(side_effect=RetryableError("busy"))
+        policy = RetryPolicy("test-exhausted", max_attempts=2, base_delay=0.001)
+
+        with pytest.raises(RetryExhaustedError, match="Max retries exceeded"):
+            await policy.call(func)
+
+        assert func.call_count == 2
+        assert retry_metrics()["test-exhausted"]["exhausted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_a_floor(self):
+        """Test the server-requested delay is honoured"""
+        func = AsyncMock(side_effect=[RetryableError("busy", retry_after=5), "ok"])
+        policy = RetryPolicy("test-retry-after", base_delay=0.001)
+
+        with patch('src.common.retry.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            await policy.call(func)
+
+        assert mock_sleep.call_args.args[0] == 5
+
+    @pytest.mark.asyncio
+    async def test_does_not_sleep_past_deadline(self):
+        """Test a retry that cannot finish in time is not attempted"""
+        func = AsyncMock(side_effect=RetryableError("busy", retry_after=30))
+        policy = RetryPolicy("test-deadline", max_attempts=5, deadline=1.0)
+
+        with pytest.raises(DeadlineExceededError):
+            await policy.call(func)
+
+        assert func.call_count == 1
+        assert retry_metrics()["test-deadline"]["deadline_exceeded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_attempt_bounded_by_scope_deadline(self):
+        """Test a hung call is cut off by the enclosing deadline"""
+        async def hang():
+            await asyncio.sleep(10)
+
+        policy = RetryPolicy("test-scope", max_attempts=3, base_delay=0.001)
+
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceededError):
+                await policy.call(hang)
+
+
+class TestDeadlineScope:
+    """Test deadline propagation"""
+
+    def test_inner_scope_only_tightens(self):
+        """Test nested scopes keep the earliest deadline"""
+        with deadline_scope(0.5):
+            with deadline_scope(100):
+                assert remaining_timeout(60) <= 0.5
+        assert remaining_timeout(60) == 60
+
+    @pytest.mark.asyncio
+    async def test_spawned_tasks_inherit_deadline(self):
+        """Test the deadline flows into tasks"""
+        async def child():
+            return remaining_timeout(60)
+
+        with deadline_scope(0.5):
+            task = asyncio.create_task(child())
+
+        assert await task <= 0.5
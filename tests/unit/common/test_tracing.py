@@ -0,0 +1,64 @@
+"""
+Unit tests for pipeline tracing
+"""
+
+import asyncio
+import pytest
+from src.common.tracing import Trace, span, trace_scope
+
+
+class TestTracing:
+    """Test span recording and batching"""
+
+    @pytest.mark.asyncio
+    async def test_spans_record_stage_status_and_bytes(self):
+        """Test calls inherit the enclosing stage, including on worker threads"""
+        written = []
+
+        def upload():
+            with span("storage.upload") as log:
+                log.bytes = 1024
+
+        async with trace_scope("ep-1", sink=written.extend) as trace:
+            with span("audio", kind="stage"):
+                await asyncio.to_thread(upload)
+                with pytest.raises(ValueError):
+                    with span("tts.chunk"):
+                        raise ValueError("boom")
+            with pytest.raises(asyncio.TimeoutError):
+                with span("rss", kind="stage"):
+                    await asyncio.wait_for(asyncio.sleep(1), timeout=0.01)
+
+        by_name = {log.name: log for log in written}
+        assert set(by_name) == {"audio", "storage.upload", "tts.chunk", "rss"}
+        assert all(log.run_id == trace.run_id and log.episode_id == "ep-1" for log in written)
+        assert by_name["storage.upload"].stage == "audio"
+        assert by_name["storage.upload"].bytes == 1024
+        assert by_name["tts.chunk"].status == "failed"
+        assert by_name["tts.chunk"].error_message == "boom"
+        assert by_name["audio"].kind == "stage"
+        assert by_name["rss"].status == "timed_out"
+
+    def test_span_outside_trace_is_not_recorded(self):
+        """Test instrumented code runs unchanged without a trace"""
+        with span("db.query") as log:
+            pass
+
+        assert log.run_id == ""
+
+    def test_batches_are_written_when_full(self):
+        """Test the sink receives full batches and a failing sink is contained"""
+        batches = []
+        trace = Trace("ep-1", sink=lambda logs: batches.append(len(logs)), batch_size=2)
+        for i in range(5):
+            trace.add(span("x").__enter__())
+
+        assert batches == [2, 2]
+        trace.flush()
+        assert batches == [2, 2, 1]
+
+        def broken(logs):
+            raise RuntimeError("YDB down")
+
+        failing = Trace("ep-1", sink=broken, batch_size=1)
+        failing.add(span("x").__enter__())
@@ -0,0 +1,64 @@
+"""
+Unit tests for startup warm-up
+"""
+
+import asyncio
+import threading
+import pytest
+from src.common.warmup import Warmup
+
+
+class TestWarmup:
+    """Test step status, retries and timeouts"""
+
+    @pytest.mark.asyncio
+    async def test_ready_after_all_steps_succeed(self):
+        calls = []
+        warmup = Warmup({"db": lambda: calls.append("db"), "storage": lambda: calls.append("storage")})
+
+        assert not warmup.ready
+        assert await warmup.start() is True
+        assert warmup.status == {"db": "ok", "storage": "ok"}
+        assert sorted(calls) == ["db", "storage"]
+
+    @pytest.mark.asyncio
+    async def test_failed_step_is_retried_alone(self):
+        calls = {"db": 0, "storage": 0}
+
+        def db():
+            calls["db"] += 1
+            if calls["db"] == 1:
+                raise ConnectionError("discovery failed")
+
+        def storage():
+            calls["storage"] += 1
+
+        warmup = Warmup({"db": db, "storage": storage})
+
+        assert await warmup.run() is False
+        assert warmup.status["db"] == "failed: discovery failed"
+
+        assert await warmup.run() is True
+        assert calls == {"db": 2, "storage": 1}
+
+    @pytest.mark.asyncio
+    async def test_slow_step_times_out(self):
+        release = threading.Event()
+        warmup = Warmup({"db": lambda: release.wait(5)}, timeout=0.05)
+
+        try:
+            assert await warmup.run() is False
+            assert warmup.status["db"].startswith("failed")
+        finally:
+            release.set()
+
+    @pytest.mark.asyncio
+    async def test_start_does_not_overlap_runs(self):
+        release = threading.Event()
+        warmup = Warmup({"db": release.wait})
+
+        first = warmup.start()
+        assert warmup.start() is first
+        release.set()
+        await first
+        assert warmup.ready
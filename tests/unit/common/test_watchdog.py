@@ -0,0 +1,56 @@
+"""
+Unit tests for the event loop watchdog
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.common.watchdog import LoopWatchdog
+from src.news.service import NewsService
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+class TestLoopWatchdog:
+    """Test lag measurement and blocking call site reports"""
+
+    @pytest.mark.asyncio
+    async def test_reports_the_blocking_call_site(self):
+        """Test a synchronous sleep on the loop is reported with its caller"""
+        async with LoopWatchdog(threshold=0.05, interval=0.01) as watchdog:
+            await asyncio.sleep(0.05)
+            blocking_call()
+            await asyncio.sleep(0.05)
+
+        assert len(watchdog.reports) == 1
+        report = watchdog.reports[0]
+        assert "test_watchdog.py" in report.site and "blocking_call" in report.site
+        assert report.seconds >= 0.15
+        assert any("test_reports_the_blocking_call_site" in line for line in report.stack)
+
+    @pytest.mark.asyncio
+    async def test_healthy_loop_has_no_reports(self):
+        """Test awaiting never counts as blocking"""
+        async with LoopWatchdog(threshold=0.05, interval=0.01) as watchdog:
+            await asyncio.gather(*(asyncio.sleep(0.01 * i) for i in range(20)))
+
+        assert not watchdog.reports
+
+    @pytest.mark.asyncio
+    async def test_news_parsing_runs_off_the_loop(self):
+        """Test slow HTML parsing does not block the loop (regression guard)"""
+        service = NewsService()
+
+        def slow_parse(html):
+            time.sleep(0.3)
+            return []
+
+        with patch.object(service, '_fetch_page', new=AsyncMock(return_value="<html></html>")), \
+             patch.object(service, '_parse_page', side_effect=slow_parse):
+            async with LoopWatchdog(threshold=0.1, interval=0.01) as watchdog:
+                await service.collect_latest(hours=24)
+
+        assert not watchdog.reports
@@ -0,0 +1,48 @@
+"""
+Unit tests for the episode repository
+"""
+
+from datetime import date, datetime
+from src.db.episodes import EpisodeRepository, _from_row
+from src.db.ydb_client import MemoryDB, _to_param
+from src.models.episode import AudioRendition, Episode
+
+
+class TestEpisodeRepository:
+    """Test episode persistence"""
+
+    def test_save_replaces_and_round_trips_renditions(self):
+        """Test upsert semantics and rendition metadata"""
+        repository = EpisodeRepository(db=MemoryDB())
+        episode = Episode(episode_id="ep-1", date=date(2026, 1, 14), status="script_only")
+        repository.save(episode)
+
+        episode.status = "completed"
+        episode.audio_renditions = [AudioRendition(
+            name="mobile", output_format="mp3_22050_32", bitrate_kbps=32,
+            url="https://s3/m.mp3", size_bytes=10, duration_seconds=1.5
+        )]
+        repository.save(episode)
+
+        loaded = repository.get("ep-1")
+        assert loaded.status == "completed"
+        assert loaded.audio_renditions[0].bitrate_kbps == 32
+        assert len(repository.list_recent()) == 1
+
+    def test_from_ydb_row(self):
+        """Test YDB wire values (days, microseconds, JSON text) are decoded"""
+        row = {
+            "episode_id": "ep-1",
+            "date": _to_param("Date", date(2026, 1, 14)),
+            "created_at": _to_param("Timestamp", datetime(2026, 1, 14, 6, 0)),
+            "audio_renditions": _to_param("Json", [{
+                "name": "standard", "output_format": "mp3_44100_128", "bitrate_kbps": 128,
+                "url": "u", "size_bytes": 1, "duration_seconds": 1.0
+            }]),
+            "audio_url": None,
+        }
+
+        episode = _from_row(row)
+
+        assert episode.date == date(2026, 1, 14)
+        assert episode.audio_renditions[0].name == "standard"
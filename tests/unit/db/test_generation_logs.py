@@ -0,0 +1,70 @@
+"""
+Unit tests for generation logs
+"""
+
+from datetime import datetime, timedelta, timezone
+from src.db.generation_logs import GenerationLogRepository, _from_row, percentile
+from src.db.ydb_client import MemoryDB, _to_param
+from src.models.episode import GenerationLog
+
+
+def stage_log(stage: str, duration_ms: int, minutes: int, status: str = "completed") -> GenerationLog:
+    return GenerationLog(
+        log_id=f"{stage}-{minutes}", run_id=f"run-{minutes}", episode_id="ep-1", stage=stage, name=stage,
+        kind="stage", status=status, duration_ms=duration_ms,
+        timestamp=datetime(2026, 1, 14, 7, 0, tzinfo=timezone.utc) + timedelta(minutes=minutes)
+    )
+
+
+class TestGenerationLogRepository:
+    """Test span persistence and stage percentiles"""
+
+    def test_save_many_and_list_run(self):
+        """Test a batch is written and read back per run"""
+        repository = GenerationLogRepository(db=MemoryDB())
+        repository.save_many([
+            stage_log("news", 1200, 0),
+            GenerationLog(log_id="c1", run_id="run-0", episode_id="ep-1", stage="news", name="news.fetch",
+                          duration_ms=800, bytes=51200, timestamp=datetime(2026, 1, 14, 7, 0, 1, tzinfo=timezone.utc)),
+        ])
+
+        logs = repository.list_run("run-0")
+
+        assert [log.name for log in logs] == ["news", "news.fetch"]
+        assert logs[1].bytes == 51200
+
+    def test_default_timestamp_is_utc(self):
+        """Test spans are stamped with an aware UTC time"""
+        log = GenerationLog(log_id="1", run_id="r", episode_id="ep-1", name="hls")
+
+        assert log.timestamp.tzinfo == timezone.utc
+
+    def test_stage_percentiles_over_last_runs(self):
+        """Test only completed stages of the latest runs are counted"""
+        repository = GenerationLogRepository(db=MemoryDB())
+        logs = [stage_log("script", 100_000, 0)]  # oldest run, outside the window
+        for run, ms in enumerate(range(1000, 10000, 1000), start=1):
+            logs += [stage_log("news", 500, run), stage_log("script", ms, run)]
+        logs += [stage_log("script", 999_999, 10, status="timed_out")]
+        repository.save_many(logs)
+
+        stats = repository.stage_percentiles(runs=10)
+
+        assert repository.recent_run_ids(3) == ["run-10", "run-9", "run-8"]
+        assert stats["script"] == {"runs": 9, "p50_ms": 5000, "p95_ms": 9000}
+        assert stats["news"] == {"runs": 9, "p50_ms": 500, "p95_ms": 500}
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        assert percentile([3, 1, 2, 4], 0.5) == 2
+        assert percentile(list(range(1, 101)), 0.95) == 95
+        assert percentile([7], 0.95) == 7
+
+    def test_from_ydb_row(self):
+        """Test YDB timestamps (microseconds) are decoded"""
+        at = datetime(2026, 1, 14, 7, 0, tzinfo=timezone.utc)
+        log = _from_row({"log_id": "1", "run_id": "r", "episode_id": "ep-1", "name": "hls",
+                         "duration_ms": 40, "timestamp": _to_param("Timestamp", at)})
+
+        assert log.timestamp == at
+        assert log.stage is None
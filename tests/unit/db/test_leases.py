@@ -0,0 +1,58 @@
+"""
+Unit tests for database leases
+"""
+
+from datetime import datetime, timedelta, timezone
+from src.db.leases import LeaseRepository
+from src.db.ydb_client import MemoryDB
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 14, 7, 0, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+class TestLeaseRepository:
+    """Test conditional acquire, renewal, release and takeover"""
+
+    def test_only_one_holder(self):
+        """Test a held lease cannot be acquired by another owner"""
+        leases = LeaseRepository(db=MemoryDB(), clock=Clock())
+
+        first = leases.acquire("ep-2026-01-14", "a", 30)
+        assert first.token == 1
+        assert leases.acquire("ep-2026-01-14", "b", 30) is None
+        assert leases.acquire("ep-2026-01-13", "b", 30) is not None
+        assert leases.holder("ep-2026-01-14").owner == "a"
+
+    def test_expired_lease_is_taken_over_with_new_token(self):
+        """Test a crashed holder's lease is free after its TTL and fences the old holder"""
+        clock = Clock()
+        leases = LeaseRepository(db=MemoryDB(), clock=clock)
+        stale = leases.acquire("ep-2026-01-14", "a", 30)
+
+        clock.now += timedelta(seconds=31)
+        assert leases.holder("ep-2026-01-14") is None
+        fresh = leases.acquire("ep-2026-01-14", "b", 30)
+
+        assert fresh.token == stale.token + 1
+        assert leases.renew(stale, 30) is False
+        leases.release(stale)
+        assert leases.holder("ep-2026-01-14").owner == "b"
+
+    def test_renew_and_release(self):
+        """Test heartbeats extend the lease and release frees it at once"""
+        clock = Clock()
+        leases = LeaseRepository(db=MemoryDB(), clock=clock)
+        lease = leases.acquire("ep-2026-01-14", "a", 30)
+
+        clock.now += timedelta(seconds=20)
+        assert leases.renew(lease, 30)
+        clock.now += timedelta(seconds=20)
+        assert leases.holder("ep-2026-01-14") is not None
+
+        leases.release(lease)
+        assert leases.acquire("ep-2026-01-14", "b", 30).token == 2
@@ -0,0 +1,69 @@
+"""
+Unit tests for schema migrations
+"""
+
+import re
+from src.db.migrate import apply_migrations, migration_files, split_statements
+from src.db.ydb_client import MemoryDB
+
+
+class FakeSchemaDB(MemoryDB):
+    """MemoryDB that also tracks a schema and the statements run against it"""
+
+    def __init__(self, schema=None):
+        super().__init__()
+        self.schema = schema or {}
+        self.statements = []
+
+    def describe_table(self, table):
+        return self.schema.get(table)
+
+    def execute_scheme(self, yql):
+        self.statements.append(yql)
+        created = re.match(r"CREATE TABLE (?:IF NOT EXISTS )?(\w+)", yql)
+        if created:
+            self.schema[created.group(1)] = {"columns": set(), "indexes": set()}
+
+
+def write(directory, name, text):
+    (directory / name).write_text(text, encoding="utf-8")
+
+
+class TestMigrations:
+    """Test migrations apply in order, once each"""
+
+    def test_files_in_order_after_baseline(self, tmp_path):
+        """Test the baseline comes first, then numbered files"""
+        write(tmp_path, "0002_b.yql", "")
+        write(tmp_path, "tables.yql", "")
+        write(tmp_path, "0001_a.yql", "")
+        write(tmp_path, "notes.txt", "")
+
+        assert [p.name for p in migration_files(tmp_path)] == ["tables.yql", "0001_a.yql", "0002_b.yql"]
+
+    def test_split_statements_drops_comments(self):
+        """Test statements are split on semicolons with comments removed"""
+        text = "-- header\nCREATE TABLE a (x Utf8, PRIMARY KEY (x)); -- trailing\nALTER TABLE a ADD COLUMN y Int64;\n"
+
+        assert split_statements(text) == [
+            "CREATE TABLE a (x Utf8, PRIMARY KEY (x))",
+            "ALTER TABLE a ADD COLUMN y Int64",
+        ]
+
+    def test_applies_pending_once(self, tmp_path):
+        """Test a second run applies nothing"""
+        write(tmp_path, "0001_leases.yql", "CREATE TABLE IF NOT EXISTS leases (name Utf8, PRIMARY KEY (name));")
+        db = FakeSchemaDB()
+
+        assert apply_migrations(db, tmp_path, log=lambda _: None) == ["0001_leases.yql"]
+        assert apply_migrations(db, tmp_path, log=lambda _: None) == []
+        assert "leases" in db.schema
+
+    def test_skips_changes_already_in_schema(self, tmp_path):
+        """Test existing tables and columns are not created again"""
+        write(tmp_path, "tables.yql", "CREATE TABLE episodes (episode_id Utf8, PRIMARY KEY (episode_id));")
+        write(tmp_path, "0001_hls.yql", "ALTER TABLE episodes ADD COLUMN hls_url Utf8;\nALTER TABLE episodes ADD COLUMN size Int64;")
+        db = FakeSchemaDB({"episodes": {"columns": {"episode_id", "hls_url"}, "indexes": set()}})
+
+        assert apply_migrations(db, tmp_path, log=lambda _: None) == ["tables.yql", "0001_hls.yql"]
+        assert db.statements[1:] == ["ALTER TABLE episodes ADD COLUMN size Int64"]
@@ -0,0 +1,47 @@
+"""
+Unit tests for pipeline stage checkpoints
+"""
+
+from datetime import datetime, timezone
+from src.db.pipeline_states import PipelineStateRepository, _from_row
+from src.db.ydb_client import MemoryDB, _to_param
+from src.models.episode import PipelineState
+
+
+class TestPipelineStateRepository:
+    """Test checkpoint persistence"""
+
+    def test_save_replaces_per_stage(self):
+        """Test one row per (episode, stage)"""
+        repository = PipelineStateRepository(db=MemoryDB())
+        repository.save(PipelineState(episode_id="ep-1", stage="news", status="running"))
+        repository.save(PipelineState(
+            episode_id="ep-1", stage="news", status="completed", outputs={"articles": [{"article_id": "1"}]}
+        ))
+        repository.save(PipelineState(episode_id="ep-1", stage="script", status="failed", retry_count=1))
+
+        states = repository.load("ep-1")
+
+        assert states["news"].status == "completed"
+        assert states["news"].outputs["articles"][0]["article_id"] == "1"
+        assert states["script"].retry_count == 1
+
+        repository.clear("ep-1")
+        assert repository.load("ep-1") == {}
+
+    def test_from_ydb_row(self):
+        """Test YDB wire values (microseconds, JSON text) are decoded"""
+        started = datetime(2026, 1, 14, 6, 0, tzinfo=timezone.utc)
+        row = {
+            "episode_id": "ep-1",
+            "stage": "script",
+            "status": "completed",
+            "started_at": _to_param("Timestamp", started),
+            "outputs": _to_param("Json", {"script": "Доброе утро!"}),
+            "error_message": None,
+        }
+
+        state = _from_row(row)
+
+        assert state.started_at == started
+        assert state.outputs == {"script": "Доброе утро!"}
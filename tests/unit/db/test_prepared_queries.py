@@ -0,0 +1,89 @@
+"""
+Unit tests for the YDB prepared query cache, against the in-process stand-in
+"""
+
+import sys
+import pytest
+from datetime import date
+from src.db.episodes import EpisodeRepository
+from src.db.ydb_client import PreparedQueryCache, YDBClient
+from src.models.episode import Episode
+from tests.stubs import ydb_sdk
+
+
+@pytest.fixture
+def pool():
+    return ydb_sdk.SessionPool(ydb_sdk.Latency(round_trip=0, compile=0), size=1)
+
+
+@pytest.fixture
+def client(monkeypatch, pool):
+    monkeypatch.setitem(sys.modules, "ydb", ydb_sdk)
+    monkeypatch.setattr("src.db.ydb_client.HAS_YDB", True)
+    client = YDBClient()
+    client.pool = pool
+    return client
+
+
+class TestPreparedQueryCache:
+    """Test reuse, bounds and invalidation of prepared queries"""
+
+    def test_repeated_query_shapes_prepare_once(self, client, pool):
+        """Test repository calls prepare each query shape once per session"""
+        repository = EpisodeRepository(db=client)
+        for _ in range(3):
+            repository.save(Episode(episode_id="ep-2026-01-14", date=date(2026, 1, 14)))
+            repository.get("ep-2026-01-14")
+
+        assert pool.prepares == 2  # upsert, select
+        assert client.prepared.stats()["hits"] == 4
+        assert client.prepared.stats()["hit_rate"] == pytest.approx(4 / 6, abs=1e-4)
+
+    def test_least_recently_used_is_evicted(self, client, pool):
+        client.prepared = PreparedQueryCache(max_size=2)
+        for table in ("a", "b", "a", "c", "a", "b"):
+            client.select(table, {"id": "1"})
+
+        assert pool.prepares == 4  # b is evicted by c, then prepared again
+        assert client.prepared.stats()["evictions"] == 2
+
+    def test_disabled_cache_prepares_every_call(self, client, pool):
+        client.prepared = PreparedQueryCache(max_size=0)
+        client.select("episodes", {"episode_id": "1"})
+        client.select("episodes", {"episode_id": "1"})
+
+        assert pool.prepares == 2
+
+    def test_lost_session_drops_its_queries(self, client, pool):
+        """Test a dead session's entries are dropped and the call is retried on a new one"""
+        client.select("episodes", {"episode_id": "1"})
+        pool.sessions()[0].alive = False
+
+        client.select("episodes", {"episode_id": "1"})
+
+        stats = client.prepared.stats()
+        assert stats["invalidations"] == 1
+        assert pool.prepares == 2
+        assert stats["sessions"] == 1
+
+    def test_evicted_server_plan_is_prepared_again(self, client, pool):
+        """Test NotFound from the server re-prepares on the same session"""
+        client.select("episodes", {"episode_id": "1"})
+        pool.sessions()[0].compiled.clear()
+
+        client.select("episodes", {"episode_id": "1"})
+
+        assert pool.prepares == 2
+        assert client.prepared.stats()["invalidations"] == 1
+
+    def test_schema_error_clears_cache(self, client, pool):
+        client.select("episodes", {"episode_id": "1"})
+        client.select("jobs", {"job_id": "1"})
+        pool.fail_next = ydb_sdk.SchemeError("Column not found")
+
+        with pytest.raises(ydb_sdk.SchemeError):
+            client.select("episodes", {"episode_id": "1"})
+
+        assert client.prepared.stats()["entries"] == 0
+        client.select("episodes", {"episode_id": "1"})
+        assert pool.prepares == 3
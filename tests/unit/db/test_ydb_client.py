@@ -2,6 +2,7 @@
 Unit tests for YDB Client - Comprehensive Coverage
 """
 
+import sys
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from src.db.ydb_client import YDBClient, MemoryDB, get_db
@@ -25,6 +26,50 @@ class TestYDBClientConnection:
         # When HAS_YDB is False, should return None
         # This is tested in the actual module
 
+    def test_token_is_preferred_over_metadata_service(self, monkeypatch):
+        """Test an explicit YC_TOKEN wins, since metadata credentials never fail up front"""
+        fake_ydb = MagicMock()
+        monkeypatch.setitem(sys.modules, "ydb", fake_ydb)
+        monkeypatch.setattr("src.db.ydb_client.HAS_YDB", True)
+        monkeypatch.delenv("YC_SA_KEY_FILE", raising=False)
+        monkeypatch.setenv("YC_TOKEN", "t1.iam-token")
+
+        credentials = YDBClient()._get_credentials()
+
+        assert credentials is fake_ydb.credentials.AccessTokenCredentials.return_value
+        fake_ydb.credentials.AccessTokenCredentials.assert_called_once_with("t1.iam-token")
+        fake_ydb.iam.MetadataUrlCredentials.assert_not_called()
+
+    def test_insert_many_upserts_rows_in_one_query(self, ydb_client):
+        """Test batch insert sends one AS_TABLE upsert with typed rows"""
+        with patch.object(ydb_client, 'execute') as mock_execute:
+            ydb_client.insert_many(
+                "generation_logs",
+                [{"log_id": "a", "duration_ms": 5}, {"log_id": "b", "duration_ms": None}],
+                types={"duration_ms": "Int32"}
+            )
+
+        query, params = mock_execute.call_args.args
+        assert mock_execute.call_count == 1
+        assert "List<Struct<log_id: Optional<Utf8>, duration_ms: Optional<Int32>>>" in query
+        assert "AS_TABLE($rows)" in query
+        assert params["$rows"] == [{"log_id": "a", "duration_ms": 5}, {"log_id": "b", "duration_ms": None}]
+
+    def test_select_through_index_with_in_and_order(self, ydb_client):
+        """Test list filters, ordering and index views in the generated query"""
+        with patch.object(ydb_client, 'execute') as mock_execute:
+            ydb_client.select("generation_logs", {"run_id": ["r1", "r2"]}, limit=5,
+                              order_by="timestamp DESC", index="idx_run_id")
+
+        query, params = mock_execute.call_args.args
+        assert query == "SELECT * FROM generation_logs VIEW idx_run_id WHERE run_id IN $param0 ORDER BY timestamp DESC LIMIT 5"
+        assert params == {"$param0": ["r1", "r2"]}
+
+    def test_select_rejects_invalid_order(self, ydb_client):
+        """Test ORDER BY is validated like column names"""
+        with pytest.raises(ValueError):
+            ydb_client.select("episodes", order_by="date; DROP TABLE episodes")
+
 
 class TestMemoryDB:
     """Test in-memory database fallback"""
@@ -102,6 +147,22 @@ class TestMemoryDB:
 
         assert result == []
 
+    def test_insert_many_appends_rows(self, db):
+        """Test batch insert"""
+        db.insert_many("users", [{"id": "1"}, {"id": "2"}])
+
+        assert [r["id"] for r in db.select("users")] == ["1", "2"]
+
+    def test_insert_replaces_row_with_same_primary_key(self, db):
+        """Test insert behaves like UPSERT for tables with a known key"""
+        db.insert("pipeline_states", {"episode_id": "ep", "stage": "tts", "status": "running"})
+        db.insert("pipeline_states", {"episode_id": "ep", "stage": "script", "status": "completed"})
+        db.insert("pipeline_states", {"episode_id": "ep", "stage": "tts", "status": "completed"})
+
+        rows = db.select("pipeline_states", {"episode_id": "ep", "stage": "tts"})
+        assert [r["status"] for r in rows] == ["completed"]
+        assert len(db.tables["pipeline_states"]) == 2
+
     def test_delete_from_nonexistent_table(self, db):
         """Test deleting from table that doesn't exist"""
         result = db.delete("nonexistent", where={"id": "1"})
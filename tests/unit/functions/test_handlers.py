@@ -0,0 +1,129 @@
+"""
+Unit tests for the serverless function handlers
+"""
+
+import json
+import logging
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, Mock
+from src.common.logs import shutdown_logging
+from src.db.episodes import EpisodeRepository
+from src.db.ydb_client import MemoryDB
+from src.functions import portal, timer
+from src.models.episode import AudioRendition, Episode
+
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    """Handlers configure logging on first use; undo it after each test"""
+    level = logging.getLogger().level
+    yield
+    shutdown_logging()
+    logging.getLogger().setLevel(level)
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repository = EpisodeRepository(db=MemoryDB())
+    monkeypatch.setattr("src.functions.portal.get_episode_repository", lambda: repository)
+    repository.save(Episode(
+        episode_id="ep-2026-01-14",
+        date=date(2026, 1, 14),
+        status="completed",
+        audio_url="https://s3/ep.mp3",
+        audio_renditions=[
+            AudioRendition(name="standard", output_format="mp3_44100_128", bitrate_kbps=128,
+                           url="https://s3/ep.mp3", size_bytes=4_800_000, duration_seconds=300.0),
+            AudioRendition(name="mobile", output_format="mp3_22050_32", bitrate_kbps=32,
+                           url="https://s3/ep-mobile.mp3", size_bytes=1_200_000, duration_seconds=300.0),
+        ]
+    ))
+    return repository
+
+
+def http_event(path: str, method: str = "GET", headers: dict = None, query: dict = None) -> dict:
+    return {"httpMethod": method, "path": path, "headers": headers or {}, "queryStringParameters": query or {}}
+
+
+class TestPortalFunction:
+    """Test API Gateway events against the portal handler"""
+
+    def test_list_episodes_uses_hints(self, repository):
+        """Test the list matches the API route's JSON, with lower-case hint headers"""
+        response = portal.handler(http_event("/api/episodes", headers={"ect": "2g"}))
+
+        assert response["statusCode"] == 200
+        episode = json.loads(response["body"])["episodes"][0]
+        assert episode["audio_url"] == "https://s3/ep-mobile.mp3"
+        assert episode["date"] == "2026-01-14"
+        assert "Save-Data" in response["headers"]["Vary"]
+
+    def test_audio_redirect(self, repository):
+        """Test ?quality= selects the rendition to redirect to"""
+        response = portal.handler(http_event("/api/episodes/ep-2026-01-14/audio", query={"quality": "mobile"}))
+
+        assert response["statusCode"] == 307
+        assert response["headers"]["Location"] == "https://s3/ep-mobile.mp3"
+
+    def test_missing_episode_and_unknown_path(self, repository):
+        """Test 404 for unknown episodes and routes, 405 for writes"""
+        assert portal.handler(http_event("/api/episodes/ep-missing/audio"))["statusCode"] == 404
+        assert portal.handler(http_event("/api/nothing"))["statusCode"] == 404
+        assert portal.handler(http_event("/api/episodes", method="POST"))["statusCode"] == 405
+
+    def test_errors_become_500(self, monkeypatch):
+        """Test a failing read returns a 500 response instead of raising"""
+        monkeypatch.setattr("src.functions.portal.get_episode_repository", Mock(side_effect=RuntimeError("ydb down")))
+
+        response = portal.handler(http_event("/api/episodes"))
+
+        assert response["statusCode"] == 500
+        assert "ydb down" not in response["body"]
+
+
+class TestTimerFunction:
+    """Test the timer-triggered pipeline handler"""
+
+    @pytest.fixture
+    def pipeline(self, monkeypatch):
+        pipeline = Mock()
+        pipeline.generate_episode = AsyncMock(return_value=Episode(
+            episode_id="ep-2026-01-14", date=date(2026, 1, 14), status="completed", audio_url="https://s3/ep.mp3"
+        ))
+        monkeypatch.setattr("src.functions.timer.get_pipeline", lambda: pipeline)
+        return pipeline
+
+    def test_trigger_payload_sets_date(self, pipeline):
+        """Test the timer message payload is passed to the pipeline"""
+        event = {"messages": [{
+            "event_metadata": {"event_type": "yandex.cloud.events.serverless.triggers.TimerMessage"},
+            "details": {"trigger_id": "a1s", "payload": '{"target_date": "2026-01-14", "resume": false}'}
+        }]}
+
+        response = timer.handler(event)
+
+        pipeline.generate_episode.assert_awaited_once_with(date(2026, 1, 14), resume=False)
+        assert json.loads(response["body"])["episode_id"] == "ep-2026-01-14"
+
+    def test_empty_event_generates_today(self, pipeline):
+        """Test a bare timer tick generates today's episode, resuming checkpoints"""
+        timer.handler({"messages": [{"details": {"trigger_id": "a1s"}}]})
+        timer.handler({})
+
+        assert pipeline.generate_episode.await_args_list[0].args == (None,)
+        assert pipeline.generate_episode.await_args_list[1].kwargs == {"resume": True}
+
+    def test_failure_is_raised_for_retry(self, pipeline):
+        """Test pipeline errors propagate so the trigger retries"""
+        pipeline.generate_episode.side_effect = RuntimeError("tts quota")
+
+        with pytest.raises(RuntimeError):
+            timer.handler({})
+
+    def test_pipeline_is_reused_between_invocations(self, monkeypatch):
+        """Test warm invocations share one pipeline instance"""
+        monkeypatch.setattr("src.functions.timer._pipeline", None)
+        monkeypatch.setattr("src.functions.timer.EpisodePipeline", Mock(side_effect=lambda: object()))
+
+        assert timer.get_pipeline() is timer.get_pipeline()
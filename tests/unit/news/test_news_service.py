@@ -3,6 +3,7 @@ Unit tests for News Service
 RED phase: Writing tests first
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timedelta
@@ -31,6 +32,7 @@ class TestNewsService:
         with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
             mock_response.text = mock_html
+            mock_response.content = mock_html.encode()
             mock_response.raise_for_status = Mock()
 
             mock_client.return_value.__aenter__.return_value.get = AsyncMock(
@@ -63,6 +65,7 @@ class TestNewsService:
         with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
             mock_response.text = mock_html
+            mock_response.content = mock_html.encode()
             mock_response.raise_for_status = Mock()
 
             mock_client.return_value.__aenter__.return_value.get = AsyncMock(
@@ -99,6 +102,7 @@ class TestNewsService:
         with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
             mock_response.text = mock_html
+            mock_response.content = mock_html.encode()
             mock_response.raise_for_status = Mock()
 
             mock_client.return_value.__aenter__.return_value.get = AsyncMock(
@@ -142,6 +146,7 @@ class TestNewsService:
         with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
             mock_response.text = mock_html
+            mock_response.content = mock_html.encode()
             mock_response.raise_for_status = Mock()
 
             mock_client.return_value.__aenter__.return_value.get = AsyncMock(
@@ -189,3 +194,30 @@ class TestNewsService:
         articles = service._parse_page(html)
 
         assert articles == []
+
+    @pytest.mark.asyncio
+    async def test_collect_past_window_walks_pages_once(self, service):
+        """Test a past date pages back to its window and pages are shared between dates"""
+        def page(*published):
+            return "".join(f"""
+            <article class="post">
+                <h2 class="post__title"><a href="/a-{p}">Article {p}</a></h2>
+                <div class="post__content"><p>Description</p></div>
+                <time datetime="{p}+00:00">Day</time>
+            </article>""" for p in published)
+
+        pages = {
+            1: page("2026-01-15T12:00:00", "2026-01-14T20:00:00"),
+            2: page("2026-01-14T10:00:00", "2026-01-13T09:00:00"),
+            3: page("2026-01-12T09:00:00"),
+        }
+        service._fetch_page = AsyncMock(side_effect=lambda n: pages[n])
+
+        day_14, day_15 = await asyncio.gather(
+            service.collect_latest(hours=24, until=datetime(2026, 1, 14, 7, 0)),
+            service.collect_latest(hours=24, until=datetime(2026, 1, 15, 7, 0)),
+        )
+
+        assert [a.title for a in day_14] == ["Article 2026-01-13T09:00:00"]
+        assert [a.title for a in day_15] == ["Article 2026-01-14T20:00:00", "Article 2026-01-14T10:00:00"]
+        assert sorted(call.args[0] for call in service._fetch_page.await_args_list) == [1, 2, 3]
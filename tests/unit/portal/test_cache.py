@@ -0,0 +1,74 @@
+"""
+Unit tests for the portal episode cache
+"""
+
+from datetime import date
+from unittest.mock import Mock
+from src.db.episodes import EpisodeRepository
+from src.db.ydb_client import MemoryDB
+from src.models.episode import Episode
+from src.portal.cache import EpisodeCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_repository(*days: int) -> EpisodeRepository:
+    repository = EpisodeRepository(db=MemoryDB())
+    for day in days:
+        repository.save(Episode(
+            episode_id=f"ep-2026-01-{day:02d}", date=date(2026, 1, day), status="completed",
+            audio_url=f"https://s3/ep-{day}.mp3"
+        ))
+    return repository
+
+
+class TestEpisodeCache:
+    """Test snapshot reloads, invalidation and the rendered feed"""
+
+    def test_snapshot_is_reused_until_ttl(self):
+        repository = make_repository(13)
+        repository.list_recent = Mock(wraps=repository.list_recent)
+        clock = Clock()
+        cache = EpisodeCache(repository, ttl=60, clock=clock)
+
+        cache.episodes()
+        cache.latest()
+        assert repository.list_recent.call_count == 1
+
+        clock.now = 61
+        cache.episodes()
+        assert repository.list_recent.call_count == 2
+
+    def test_invalidate_picks_up_new_episode(self):
+        repository = make_repository(13)
+        cache = EpisodeCache(repository)
+        assert cache.latest().episode_id == "ep-2026-01-13"
+
+        repository.save(Episode(episode_id="ep-2026-01-14", date=date(2026, 1, 14), audio_url="https://s3/ep-14.mp3"))
+        assert cache.latest().episode_id == "ep-2026-01-13"
+
+        cache.invalidate()
+        assert cache.latest().episode_id == "ep-2026-01-14"
+
+    def test_latest_skips_episodes_without_audio(self):
+        repository = make_repository(13)
+        repository.save(Episode(episode_id="ep-2026-01-14", date=date(2026, 1, 14), status="failed"))
+
+        assert EpisodeCache(repository).latest().episode_id == "ep-2026-01-13"
+
+    def test_feed_is_rendered_once_per_snapshot(self):
+        clock = Clock()
+        cache = EpisodeCache(make_repository(13, 14), ttl=60, clock=clock)
+
+        feed = cache.feed()
+        assert "ep-2026-01-14" in feed and "ep-2026-01-13" in feed
+        assert cache.feed() is feed
+
+        clock.now = 61
+        assert cache.feed() is not feed
@@ -0,0 +1,94 @@
+"""
+Unit tests for portal routes
+"""
+
+import pytest
+from datetime import date
+from fastapi.testclient import TestClient
+from src.db.episodes import EpisodeRepository
+from src.db.ydb_client import MemoryDB
+from src.portal.cache import EpisodeCache
+from src.main import app
+from src.models.episode import AudioRendition, Episode
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repository = EpisodeRepository(db=MemoryDB())
+    monkeypatch.setattr("src.portal.routes.get_episode_repository", lambda: repository)
+    cache = EpisodeCache(repository)
+    monkeypatch.setattr("src.portal.routes.get_episode_cache", lambda: cache)
+    repository.save(Episode(
+        episode_id="ep-2026-01-14",
+        date=date(2026, 1, 14),
+        status="completed",
+        audio_url="https://s3/ep.mp3",
+        audio_renditions=[
+            AudioRendition(name="standard", output_format="mp3_44100_128", bitrate_kbps=128,
+                           url="https://s3/ep.mp3", size_bytes=4_800_000, duration_seconds=300.0),
+            AudioRendition(name="mobile", output_format="mp3_22050_32", bitrate_kbps=32,
+                           url="https://s3/ep-mobile.mp3", size_bytes=1_200_000, duration_seconds=300.0),
+        ]
+    ))
+    return repository
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestEpisodeAudio:
+    """Test rendition selection by client hints"""
+
+    def test_save_data_gets_mobile_rendition(self, client, repository):
+        """Test Save-Data redirects to the low-bitrate file"""
+        response = client.get("/api/episodes/ep-2026-01-14/audio", headers={"Save-Data": "on"}, follow_redirects=False)
+
+        assert response.status_code == 307
+        assert response.headers["location"] == "https://s3/ep-mobile.mp3"
+        assert "Save-Data" in response.headers["vary"]
+
+    def test_default_gets_full_quality(self, client, repository):
+        """Test no hints serve the primary rendition"""
+        response = client.get("/api/episodes/ep-2026-01-14/audio", follow_redirects=False)
+
+        assert response.headers["location"] == "https://s3/ep.mp3"
+
+    def test_unknown_episode(self, client, repository):
+        """Test 404 for missing episodes"""
+        assert client.get("/api/episodes/ep-missing/audio", follow_redirects=False).status_code == 404
+
+    def test_list_uses_hints(self, client, repository):
+        """Test the episode list carries the negotiated URL and all renditions"""
+        data = client.get("/api/episodes", headers={"ECT": "2g"}).json()
+
+        assert data["episodes"][0]["audio_url"] == "https://s3/ep-mobile.mp3"
+        assert data["episodes"][0]["audio_file_size_bytes"] == 1_200_000
+        assert len(data["episodes"][0]["renditions"]) == 2
+
+
+class TestCachedReads:
+    """Test the latest episode and feed routes"""
+
+    def test_latest_episode(self, client, repository):
+        """Test the newest episode is served with the negotiated audio URL"""
+        data = client.get("/api/episodes/latest", headers={"Save-Data": "on"}).json()
+
+        assert data["episode_id"] == "ep-2026-01-14"
+        assert data["audio_url"] == "https://s3/ep-mobile.mp3"
+
+    def test_latest_episode_missing(self, client, monkeypatch):
+        """Test 404 before the first episode"""
+        monkeypatch.setattr("src.portal.routes.get_episode_cache", lambda: EpisodeCache(EpisodeRepository(db=MemoryDB())))
+
+        assert client.get("/api/episodes/latest").status_code == 404
+
+    def test_rss_feed(self, client, repository):
+        """Test the feed is served as RSS with the published cache policy"""
+        response = client.get("/api/rss.xml")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/rss+xml")
+        assert response.headers["cache-control"] == "public, max-age=300"
+        assert "ep-2026-01-14" in response.text
@@ -0,0 +1,37 @@
+"""
+Unit tests for the RSS feed
+"""
+
+from datetime import date
+from xml.etree import ElementTree as ET
+from src.models.episode import Episode
+from src.portal.rss import ITUNES_NS, build_feed
+
+
+class TestBuildFeed:
+    """Test RSS 2.0 feed generation"""
+
+    def test_items_have_enclosure_and_itunes_tags(self):
+        """Test required podcast fields are present"""
+        episodes = [
+            Episode(
+                episode_id="ep-2026-01-14", date=date(2026, 1, 14), status="completed",
+                script_text="Доброе утро! " + "новости " * 200, audio_url="https://s3/ep.mp3",
+                audio_duration_seconds=3725, audio_file_size_bytes=4_800_000
+            ),
+            Episode(episode_id="ep-2026-01-13", date=date(2026, 1, 13), status="script_only", script_text="Script"),
+        ]
+
+        root = ET.fromstring(build_feed(episodes, "https://podcast.example"))
+
+        assert root.tag == "rss" and root.get("version") == "2.0"
+        items = root.findall("channel/item")
+        assert len(items) == 1
+        enclosure = items[0].find("enclosure")
+        assert enclosure.get("url") == "https://s3/ep.mp3"
+        assert enclosure.get("length") == "4800000"
+        assert enclosure.get("type") == "audio/mpeg"
+        assert items[0].find(f"{{{ITUNES_NS}}}duration").text == "01:02:05"
+        assert items[0].find("pubDate").text == "Wed, 14 Jan 2026 06:00:00 +0000"
+        assert len(items[0].find("description").text) <= 401
+        assert root.find(f"channel/{{{ITUNES_NS}}}category").get("text") == "Technology"
@@ -0,0 +1,164 @@
+"""
+Unit tests for Prompt Token Budget
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from datetime import date
+from src.script.budget import PromptBudget, estimate_tokens, compress_text
+from src.script.generator import ScriptGenerator, SYSTEM_PROMPT
+from src.models.episode import Article
+
+
+class TestTokenEstimation:
+    """Test local token estimation"""
+
+    def test_empty_text_has_no_tokens(self):
+        """Test that empty text costs nothing"""
+        assert estimate_tokens("") == 0
+
+    def test_estimate_grows_with_length(self):
+        """Test that longer text estimates more tokens"""
+        assert estimate_tokens("слово " * 100) > estimate_tokens("слово " * 10)
+
+    def test_cyrillic_costs_more_on_claude(self):
+        """Test per-provider ratios for Russian text"""
+        text = "Искусственный интеллект меняет мир " * 20
+
+        assert estimate_tokens(text, "claude") > estimate_tokens(text, "yagpt")
+
+    def test_compress_text_drops_urls_and_whitespace(self):
+        """Test description compression"""
+        text = "Read   more\n\nat https://example.com/article  now"
+
+        assert compress_text(text) == "Read more at now"
+
+
+class TestPromptBudget:
+    """Test per-article budget allocation"""
+
+    def test_short_articles_are_untouched(self):
+        """Test that articles within budget are kept verbatim"""
+        budget = PromptBudget("yagpt", max_input_tokens=3000, max_output_tokens=2000)
+        articles = [("Title 1", "Short description."), ("Title 2", "Another one.")]
+
+        assert budget.fit_articles(articles, overhead_tokens=100) == articles
+
+    def test_long_descriptions_are_truncated_to_budget(self):
+        """Test that the fitted articles fit the available budget"""
+        budget = PromptBudget("yagpt", max_input_tokens=400, max_output_tokens=2000)
+        long_desc = " ".join(f"Предложение номер {i} о новостях ИИ." for i in range(200))
+        articles = [(f"Новость {i}", long_desc) for i in range(5)]
+
+        fitted = budget.fit_articles(articles, overhead_tokens=100)
+        total = sum(budget.estimate(t) + budget.estimate(d) for t, d in fitted)
+
+        assert total <= 300
+        assert all(title.startswith("Новость") for title, _ in fitted)
+
+    def test_short_articles_donate_budget_to_long_ones(self):
+        """Test max-min fair allocation"""
+        budget = PromptBudget("yagpt", max_input_tokens=300, max_output_tokens=100)
+        long_desc = "Очень длинное описание. " * 100
+        articles = [("A", "Коротко."), ("B", long_desc)]
+
+        fitted = budget.fit_articles(articles, overhead_tokens=0)
+
+        assert fitted[0] == ("A", "Коротко.")
+        assert budget.estimate(fitted[1][1]) > 200
+
+    def test_many_articles_stay_within_budget(self):
+        """Test the lowest-priority articles are dropped when shares would overrun"""
+        budget = PromptBudget("yagpt", max_input_tokens=400, max_output_tokens=2000)
+        long_desc = "Очень длинное описание новости. " * 20
+        articles = [(f"Новость {i}", long_desc) for i in range(100)]
+
+        fitted = budget.fit_articles(articles, overhead_tokens=100)
+        total = sum(budget.estimate(t) + budget.estimate(d) for t, d in fitted)
+
+        assert total <= 300
+        assert len(fitted) == 300 // PromptBudget.MIN_ARTICLE_TOKENS
+        assert [title for title, _ in fitted] == [f"Новость {i}" for i in range(len(fitted))]
+
+    def test_truncate_prefers_sentence_boundary(self):
+        """Test truncation keeps whole sentences"""
+        budget = PromptBudget("yagpt", max_input_tokens=1000, max_output_tokens=100)
+        text = "Первое предложение. Второе предложение. Третье предложение."
+
+        truncated = budget.truncate(text, budget.estimate("Первое предложение. Второе"))
+
+        assert truncated == "Первое предложение."
+
+    def test_truncate_falls_back_to_words(self):
+        """Test truncation of a single oversized sentence"""
+        budget = PromptBudget("yagpt", max_input_tokens=1000, max_output_tokens=100)
+        text = " ".join(["слово"] * 100)
+
+        truncated = budget.truncate(text, 20)
+
+        assert truncated.endswith("…")
+        assert budget.estimate(truncated) <= 20
+
+    def test_input_budget_respects_context_window(self):
+        """Test input budget is capped by context window minus output"""
+        budget = PromptBudget("yagpt", max_input_tokens=100000, max_output_tokens=2000)
+
+        assert budget.max_input_tokens == 6000
+
+
+class TestGeneratorBudget:
+    """Test budget integration in ScriptGenerator"""
+
+    @pytest.fixture
+    def generator(self):
+        generator = ScriptGenerator()
+        generator.max_input_tokens = 800
+        return generator
+
+    @pytest.fixture
+    def long_articles(self):
+        return [
+            Article(
+                article_id=str(i),
+                title=f"Новость {i}",
+                description="Подробный пересказ статьи. " * 300,
+                url=f"https://example.com/{i}",
+                published_at=date(2026, 1, 14),
+                source="techcrunch"
+            )
+            for i in range(7)
+        ]
+
+    def test_prompt_fits_input_budget(self, generator, long_articles):
+        """Test that the built prompt stays within the input budget"""
+        prompt = generator._build_prompt(long_articles, date(2026, 1, 14), provider="claude")
+
+        budget = generator._budget("claude")
+        assert budget.estimate(SYSTEM_PROMPT) + budget.estimate(prompt) <= 800
+        assert all(f"Новость {i}" in prompt for i in range(7))
+
+    @pytest.mark.asyncio
+    async def test_yagpt_usage_is_recorded(self, generator, long_articles):
+        """Test projected vs actual tokens are recorded per call"""
+        generator.yagpt_api_key = "test-key"
+        response = Mock()
+        response.raise_for_status = Mock()
+        response.content = b"{}"
+        response.json.return_value = {
+            "result": {
+                "alternatives": [{"message": {"text": "Доброе утро!"}}],
+                "usage": {"inputTextTokens": "640", "completionTokens": "900"}
+            }
+        }
+
+        with patch('src.script.generator.requests.post', return_value=response) as mock_post:
+            await generator._call_yagpt(long_articles, date(2026, 1, 14))
+
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["completionOptions"]["maxTokens"] == generator.max_output_tokens
+
+        usage = generator.usage_history[-1]
+        assert usage.provider == "yagpt"
+        assert usage.actual_input_tokens == 640
+        assert usage.actual_output_tokens == 900
+        assert 0 < usage.projected_input_tokens <= 800
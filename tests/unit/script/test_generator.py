@@ -4,6 +4,7 @@ RED phase: Writing tests first
 """
 
 import pytest
+import requests
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import date
 from src.script.generator import ScriptGenerator
@@ -193,7 +194,7 @@ class TestCircuitBreaker:
         with patch.object(generator, '_call_yagpt') as mock_yagpt:
             # First call times out, second succeeds
             mock_yagpt.side_effect = [
-                Exception("Timeout"),
+                requests.exceptions.Timeout("Timeout"),
                 "Доброе утро! Script here."
             ]
 
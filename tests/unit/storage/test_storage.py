@@ -5,8 +5,8 @@ Unit tests for Storage Client - LocalStorage
 import pytest
 import os
 from pathlib import Path
-from unittest.mock import patch
-from src.storage.s3_client import LocalStorage, get_storage
+from unittest.mock import MagicMock, patch
+from src.storage.s3_client import LocalStorage, S3Client, S3StreamWriter, get_storage
 
 
 class TestLocalStorage:
@@ -184,6 +184,75 @@ class TestLocalStorage:
         assert "presigned_test.txt" in url
 
 
+class TestStreamWriters:
+    """Test streaming writers"""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return LocalStorage(base_path=str(tmp_path))
+
+    def test_local_writer_writes_chunks(self, storage):
+        """Test chunked write lands in the final object"""
+        writer = storage.open_writer("audio/ep.mp3")
+        writer.write(b"abc")
+        writer.write(b"def")
+
+        assert not storage.exists("audio/ep.mp3")
+        writer.close()
+
+        assert storage.download_bytes("audio/ep.mp3") == b"abcdef"
+        assert writer.bytes_written == 6
+
+    def test_local_writer_abort_leaves_nothing(self, storage):
+        """Test aborted writes leave no partial files"""
+        writer = storage.open_writer("audio/ep.mp3")
+        writer.write(b"partial")
+        writer.abort()
+
+        assert storage.list_objects("audio") == []
+
+    @pytest.fixture
+    def s3(self):
+        s3 = S3Client(bucket="podcast")
+        s3._client = MagicMock()
+        s3._client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+        s3._client.upload_part.side_effect = lambda **kw: {"ETag": f"etag-{kw['PartNumber']}"}
+        return s3
+
+    def test_s3_writer_small_object_uses_single_put(self, s3):
+        """Test objects below one part skip multipart upload"""
+        writer = s3.open_writer("audio/ep.mp3", "audio/mpeg")
+        writer.write(b"x" * 1000)
+        url = writer.close()
+
+        s3._client.put_object.assert_called_once()
+        s3._client.create_multipart_upload.assert_not_called()
+        assert url.endswith("/podcast/audio/ep.mp3")
+
+    def test_s3_writer_uploads_parts_with_bounded_buffer(self, s3):
+        """Test full parts are flushed as data arrives"""
+        part = S3StreamWriter.PART_SIZE
+        writer = s3.open_writer("audio/ep.mp3", "audio/mpeg")
+        for _ in range(5):
+            writer.write(b"x" * (part // 2 + 1))
+            assert len(writer._buffer) < part
+        writer.close()
+
+        parts = s3._client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+        assert [p["PartNumber"] for p in parts] == [1, 2, 3]
+        assert sum(len(c.kwargs["Body"]) for c in s3._client.upload_part.call_args_list) == 5 * (part // 2 + 1)
+
+    def test_s3_writer_abort(self, s3):
+        """Test abort cancels the multipart upload"""
+        writer = s3.open_writer("audio/ep.mp3")
+        writer.write(b"x" * S3StreamWriter.PART_SIZE)
+        writer.abort()
+
+        s3._client.abort_multipart_upload.assert_called_once_with(
+            Bucket="podcast", Key="audio/ep.mp3", UploadId="up-1"
+        )
+
+
 class TestGetStorage:
     """Test get_storage factory"""
 
@@ -0,0 +1,141 @@
+"""
+Unit tests for the LLM provider stand-in server
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+from datetime import date
+from fastapi.testclient import TestClient
+from tests.stubs.llm_server import (
+    CLAUDE_PATH, YAGPT_PATH, LatencyProfile, StubConfig, create_app, render_script
+)
+from src.script.generator import ScriptGenerator
+from src.models.episode import Article
+
+
+def yagpt_payload(stream: bool = False) -> dict:
+    return {
+        "modelUri": "gpt://folder/yandexgpt-lite/latest",
+        "completionOptions": {"stream": stream, "temperature": 0.7, "maxTokens": 2000},
+        "messages": [
+            {"role": "system", "text": "Ты - ведущий AI подкаста."},
+            {"role": "user", "text": "Скрипт на дату 14 January 2026.\n\n1. GPT-5 вышел\nОписание"}
+        ]
+    }
+
+
+def claude_payload(stream: bool = False) -> dict:
+    return {
+        "model": "claude-3-5-sonnet-20241022",
+        "max_tokens": 2000,
+        "system": "Ты - ведущий AI подкаста.",
+        "messages": [{"role": "user", "content": "1. Gemini 2.0\nОписание"}],
+        "stream": stream
+    }
+
+
+class TestStubServer:
+    """Test provider API imitation"""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(create_app(StubConfig(seed=1)))
+
+    def test_render_script_mentions_articles(self):
+        """Test templated Russian script"""
+        script = render_script("на дату 14 January 2026.\n1. GPT-5 вышел\n2. Gemini 2.0", 600)
+
+        assert script.startswith("Доброе утро!")
+        assert "GPT-5 вышел" in script and "Gemini 2.0" in script
+        assert len(script.split()) >= 600
+
+    def test_yagpt_completion(self, client):
+        """Test YaGPT non-streaming response shape"""
+        response = client.post(YAGPT_PATH, json=yagpt_payload())
+
+        assert response.status_code == 200
+        result = response.json()["result"]
+        assert "GPT-5 вышел" in result["alternatives"][0]["message"]["text"]
+        assert int(result["usage"]["inputTextTokens"]) > 0
+
+    def test_yagpt_streaming_is_cumulative(self, client):
+        """Test YaGPT NDJSON streaming"""
+        response = client.post(YAGPT_PATH, json=yagpt_payload(stream=True))
+
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        texts = [line["result"]["alternatives"][0]["message"]["text"] for line in lines]
+        assert len(lines) > 2
+        assert all(texts[i + 1].startswith(texts[i]) for i in range(len(texts) - 1))
+        assert lines[-1]["result"]["alternatives"][0]["status"] == "ALTERNATIVE_STATUS_FINAL"
+
+    def test_claude_messages(self, client):
+        """Test Anthropic non-streaming response shape"""
+        response = client.post(CLAUDE_PATH, json=claude_payload())
+
+        body = response.json()
+        assert body["type"] == "message"
+        assert "Gemini 2.0" in body["content"][0]["text"]
+        assert body["usage"]["output_tokens"] > 0
+
+    def test_claude_streaming_events(self, client):
+        """Test Anthropic SSE streaming reassembles to full text"""
+        response = client.post(CLAUDE_PATH, json=claude_payload(stream=True))
+
+        events = [block for block in response.text.split("\n\n") if block]
+        names = [block.split("\n")[0].removeprefix("event: ") for block in events]
+        deltas = [
+            json.loads(block.split("\n")[1].removeprefix("data: "))["delta"]["text"]
+            for block in events if block.startswith("event: content_block_delta")
+        ]
+        assert names[0] == "message_start" and names[-1] == "message_stop"
+        assert "Gemini 2.0" in "".join(deltas)
+
+    def test_error_injection(self):
+        """Test 429 with Retry-After and 503 injection"""
+        client_429 = TestClient(create_app(StubConfig(error_429_rate=1.0, retry_after_seconds=7)))
+        client_503 = TestClient(create_app(StubConfig(error_503_rate=1.0)))
+
+        limited = client_429.post(YAGPT_PATH, json=yagpt_payload())
+        unavailable = client_503.post(CLAUDE_PATH, json=claude_payload())
+
+        assert limited.status_code == 429
+        assert limited.headers["Retry-After"] == "7"
+        assert unavailable.status_code == 503
+
+    def test_latency_profile_parsing(self):
+        """Test latency distribution specs"""
+        assert LatencyProfile.parse("fixed:1.5").mean == 1.5
+        assert LatencyProfile.parse("uniform:0.5:2").spread == 2.0
+        with pytest.raises(ValueError):
+            LatencyProfile.parse("pareto:1")
+
+
+class TestGeneratorAgainstStub:
+    """Test ScriptGenerator parses stand-in responses"""
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_stub_script(self):
+        """Test end-to-end generation against the stand-in"""
+        client = TestClient(create_app(StubConfig(seed=1)))
+        generator = ScriptGenerator()
+        generator.yagpt_api_key = "stub"
+        articles = [
+            Article(
+                article_id="1",
+                title="OpenAI releases GPT-5",
+                description="New model",
+                url="https://example.com/1",
+                published_at=date(2026, 1, 14),
+                source="techcrunch"
+            )
+        ]
+
+        def post(url, json=None, headers=None, timeout=None):
+            return client.post(YAGPT_PATH, json=json, headers=headers)
+
+        with patch('src.script.generator.requests.post', side_effect=post):
+            script = await generator.generate(articles, date(2026, 1, 14))
+
+        assert "OpenAI releases GPT-5" in script
+        assert generator.usage_history[-1].actual_input_tokens > 0
@@ -0,0 +1,95 @@
+"""
+Import-time budget tests
+Cold start cost measured with python -X importtime in a fresh interpreter
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# SDKs that must only be imported on first use
+HEAVY_MODULES = {"boto3", "botocore", "ydb", "grpc", "bs4"}
+
+# Own-module import time (self time of src.*, microseconds) and whole app import;
+# both generous so only real regressions fail. Override for slow CI machines.
+SRC_BUDGET_US = int(os.getenv("IMPORT_BUDGET_SRC_MS", "400")) * 1000
+TOTAL_BUDGET_US = int(os.getenv("IMPORT_BUDGET_TOTAL_MS", "3000")) * 1000
+
+SECRETS = (
+    "YOUTRACK_URL", "YOUTRACK_TOKEN", "GITHUB_TOKEN", "GITHUB_REPO", "YC_TOKEN", "YC_CLOUD_ID", "YC_FOLDER_ID",
+    "YC_REGISTRY_ID", "YC_SERVICE_ACCOUNT_ID", "YDB_ENDPOINT", "YDB_DATABASE", "AWS_ACCESS_KEY_ID",
+    "AWS_SECRET_ACCESS_KEY", "S3_BUCKET", "ELEVENLABS_API_KEY",
+)
+
+
+def parse_importtime(output: str) -> Dict[str, Tuple[int, int]]:
+    """Module → (self, cumulative) microseconds from -X importtime output"""
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def import_times(statement: str, env: dict = None) -> Dict[str, Tuple[int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, env=env if env is not None else dict(os.environ), capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return parse_importtime(result.stderr)
+
+
+class TestImportTime:
+    """Test cold start import cost of the web app and the pipeline"""
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   src.common\n"
+            "import time:      5011 |      30787 | src.common.config\n"
+        )
+        assert parse_importtime(output) == {"src.common": (120, 120), "src.common.config": (5011, 30787)}
+
+    def test_app_import_skips_heavy_sdks(self):
+        """Test boto3, ydb and bs4 are not imported to serve a health check"""
+        times = import_times("import src.main")
+
+        assert "src.main" in times
+        assert not {name for name in times if name.split(".")[0] in HEAVY_MODULES}
+
+    def test_app_import_within_budget(self):
+        """Test importing the app stays within the cold-start budget (best of 3 runs)"""
+        runs = [import_times("import src.main") for _ in range(3)]
+        own = min(sum(s for name, (s, _) in times.items() if name.split(".")[0] == "src") for times in runs)
+        total = min(times["src.main"][1] for times in runs)
+
+        assert own <= SRC_BUDGET_US, f"src.* modules took {own / 1000:.0f}ms to import"
+        assert total <= TOTAL_BUDGET_US, f"src.main took {total / 1000:.0f}ms to import"
+
+    def test_portal_function_imports_only_its_path(self):
+        """Test the portal function needs neither FastAPI, the pipeline nor the SDKs"""
+        env = {k: v for k, v in os.environ.items() if k not in SECRETS}
+
+        times = import_times("import src.functions.portal", env)
+
+        top_level = {name.split(".")[0] for name in times}
+        assert not top_level & (HEAVY_MODULES | {"fastapi", "starlette", "httpx", "requests"})
+        assert not {name for name in times if name.startswith(("src.automation", "src.audio.tts", "src.news"))}
+
+    def test_pipeline_modules_import_without_settings(self):
+        """Test settings are resolved on first use, not when modules are imported"""
+        env = {k: v for k, v in os.environ.items() if k not in SECRETS}
+
+        times = import_times(
+            "import src.news.service, src.script.generator, src.audio.tts, src.automation.pipeline", env
+        )
+
+        assert "src.automation.pipeline" in times
+        assert not {name for name in times if name.split(".")[0] in HEAVY_MODULES}
@@ -48,6 +48,39 @@ class TestMainApp:
         routes = [route.path for route in app.routes]
         assert any("/api/automation" in path for path in routes)
 
+    def test_metrics_endpoint_exposes_request_latency(self, client):
+        """Test /metrics serves Prometheus text including earlier requests"""
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_request_duration_seconds_count{route="/health",method="GET",status="200"}' in response.text
+
+    def test_readiness_follows_warmup(self, monkeypatch):
+        """Test /ready reports 503 while warming and 200 once the steps succeeded"""
+        import threading
+        from src.common import warmup
+
+        release = threading.Event()
+        monkeypatch.setattr(warmup, "default_steps", lambda: {"db": release.wait, "portal_cache": lambda: None})
+
+        with TestClient(app) as client:
+            response = client.get("/ready")
+            assert response.status_code == 503
+            assert response.json()["steps"]["db"] == "running"
+            assert client.get("/health").status_code == 200
+
+            release.set()
+            for _ in range(100):
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    break
+                threading.Event().wait(0.01)
+
+        assert response.json() == {"status": "ready", "steps": {"db": "ok", "portal_cache": "ok"}}
+
     def test_app_metadata(self):
         """Test app metadata"""
         assert app.title == "AI Morning Podcast Portal"